@@ -1,8 +1,76 @@
 
 __version__ = '0.1.3'
 
-from .api import *
-from .endpoint import *
-from .resource import *
-from .mixins import *
-from .handlers import *
+import importlib
+import sys
+
+
+#: The submodule each name exported by the arrested package is defined in.  Submodules
+#: are imported the first time one of their names is accessed so that importing
+#: arrested, or a module that only needs part of it, stays cheap.
+_exports = {
+    'ArrestedAPI': 'api',
+    'Endpoint': 'endpoint',
+    'EndpointType': 'endpoint',
+    'Resource': 'resource',
+    'GetListMixin': 'mixins',
+    'CreateMixin': 'mixins',
+    'GetObjectMixin': 'mixins',
+    'PutObjectMixin': 'mixins',
+    'PatchObjectMixin': 'mixins',
+    'DeleteObjectMixin': 'mixins',
+    'ObjectMixin': 'mixins',
+    'BulkCreateMixin': 'mixins',
+    'BulkPatchMixin': 'mixins',
+    'BulkDeleteMixin': 'mixins',
+    'Handler': 'handlers',
+    'ResponseHandler': 'handlers',
+    'RequestHandler': 'handlers',
+    'JSONRequestMixin': 'handlers',
+    'JSONResponseMixin': 'handlers',
+    'HookList': 'hooks',
+    'invalidate_hook_chains': 'hooks',
+    'CachedResponse': 'cache',
+    'ResponseCache': 'cache',
+    'LRUResponseCache': 'cache',
+    'RedisResponseCache': 'cache',
+    'JSONBackend': 'json_backends',
+    'StdlibJSONBackend': 'json_backends',
+    'OrjsonBackend': 'json_backends',
+    'UjsonBackend': 'json_backends',
+    'RapidJSONBackend': 'json_backends',
+    'register_json_backend': 'json_backends',
+    'get_json_backend': 'json_backends',
+    'Instrumentation': 'instrumentation',
+    'RequestTimings': 'instrumentation',
+    'MetricsSink': 'instrumentation',
+    'InMemorySink': 'instrumentation',
+    'StatsDSink': 'instrumentation',
+    'PrometheusSink': 'instrumentation',
+    'timed': 'instrumentation',
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    """Import the submodule defining ``name`` on first access.
+    """
+    try:
+        module = _exports[name]
+    except KeyError:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module level __getattr__ requires Python 3.7, so import everything up front.
+    for _name in __all__:
+        __getattr__(_name)
@@ -0,0 +1,344 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import inspect
+import threading
+
+from flask import request
+
+from .endpoint import Endpoint
+from .exceptions import ArrestedException
+from .instrumentation import timed
+from .mixins import (
+    GetListMixin, CreateMixin, ObjectMixin, GetObjectMixin,
+    PutObjectMixin, PatchObjectMixin, DeleteObjectMixin, _missing
+)
+
+
+__all__ = [
+    'AsyncEndpoint', 'AsyncGetListMixin', 'AsyncCreateMixin', 'AsyncObjectMixin',
+    'AsyncGetObjectMixin', 'AsyncPutObjectMixin', 'AsyncPatchObjectMixin',
+    'AsyncDeleteObjectMixin', 'close_event_loop', 'get_event_loop', 'maybe_await',
+    'run_async'
+]
+
+
+async def maybe_await(value):
+    """Await ``value`` if it is awaitable, otherwise return it unchanged.  Allows
+    hooks and mixin methods to be implemented with either ``def`` or ``async def``.
+    """
+    if inspect.isawaitable(value):
+        return await value
+
+    return value
+
+
+_local = threading.local()
+
+
+class _ThreadLoop(object):
+    """Owns the event loop of a single thread.  The loop is closed when the thread
+    exits and its thread local data is discarded.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+
+    def close(self):
+        loop = self.loop
+        if loop.is_closed() or loop.is_running():
+            return
+
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    def __del__(self):
+        self.close()
+
+
+def get_event_loop():
+    """Return the event loop used to run requests in the current thread, creating it
+    the first time it is requested.  Reusing the loop allows resources bound to a
+    loop, such as pooled database connections, to be shared between requests.  The
+    loop is closed when the thread exits.
+
+    :rtype: :class:`asyncio.AbstractEventLoop`
+    """
+    owner = getattr(_local, 'owner', None)
+    if owner is None or owner.loop.is_closed():
+        owner = _local.owner = _ThreadLoop()
+
+    return owner.loop
+
+
+def close_event_loop():
+    """Close the event loop returned by :func:`get_event_loop` for the current thread
+    without waiting for the thread to exit, for example from a worker's shutdown hook.
+    """
+    owner = getattr(_local, 'owner', None)
+    if owner is not None:
+        _local.owner = None
+        owner.close()
+
+
+def run_async(coro):
+    """Run ``coro`` to completion on the current thread's event loop and return its
+    result.  When an event loop is already running in the current thread, for example
+    when called from a coroutine, the coroutine is run on a new event loop in a
+    separate thread instead.
+
+    :param coro: A coroutine
+    :returns: The result of the coroutine
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return get_event_loop().run_until_complete(coro)
+
+    # The request context is held in context variables, so the coroutine is run in a
+    # copy of the current context.
+    context = contextvars.copy_context()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(context.run, asyncio.run, coro).result()
+
+
+class AsyncEndpoint(Endpoint):
+    """An :class:`arrested.Endpoint` that supports ``async def`` request handlers,
+    hooks and mixin methods.  Requests are run on an event loop owned by the thread
+    handling them so the I/O performed while handling a request can be overlapped,
+    for example by fetching from several backends with :func:`asyncio.gather`.
+
+    Synchronous hooks, handlers and mixins continue to work with an AsyncEndpoint.
+
+    Usage::
+
+        from arrested.aio import AsyncEndpoint, AsyncGetListMixin
+
+        class DashboardEndpoint(AsyncEndpoint, AsyncGetListMixin):
+
+            name = 'dashboard'
+
+            async def get_objects(self):
+
+                return await asyncio.gather(fetch_stats(), fetch_alerts())
+    """
+
+    def run_async(self, coro):
+        """Run the coroutine handling the request to completion.  Override this method
+        to run requests on an existing event loop.
+
+        :param coro: The coroutine returned by :meth:`dispatch_request_async`
+        :returns: Response object
+        """
+        return run_async(coro)
+
+    def dispatch_request(self, *args, **kwargs):
+        """Dispatch the incoming HTTP request by running
+        :meth:`AsyncEndpoint.dispatch_request_async` to completion.
+        """
+        return self.run_async(self.dispatch_request_async(*args, **kwargs))
+
+    async def dispatch_request_async(self, *args, **kwargs):
+        """Dispatch the incoming HTTP request to the appropriate handler, awaiting any
+        hooks or handlers implemented as coroutines.
+        """
+        error = self._prepare_dispatch(args, kwargs)
+        if error is not None:
+            return error
+
+        with self._recording_timings():
+            with timed(self, 'before_hooks'):
+                await self.process_before_request_hooks_async()
+
+            meth = getattr(self, self.meth, None)
+            if meth is None and self.meth == 'head':
+                meth = getattr(self, 'get', None)
+            assert meth is not None, 'Unimplemented method %r' % request.method
+
+            with timed(self, 'dispatch'):
+                resp = await maybe_await(meth(**kwargs))
+                resp = self.make_response(resp)
+
+            with timed(self, 'after_hooks'):
+                resp = await self.process_after_request_hooks_async(resp)
+
+        return self._finish_timings(resp)
+
+    async def process_before_request_hooks_async(self):
+        """Process the before request hooks in the order described by
+        :meth:`Endpoint.process_before_request_hooks`, awaiting any async hooks.
+        """
+        for hook in self.get_request_hook_chain()[0]:
+            await maybe_await(hook(self))
+
+    async def process_after_request_hooks_async(self, resp):
+        """Process the after request hooks in the order described by
+        :meth:`Endpoint.process_after_request_hooks`, awaiting any async hooks.
+        """
+        for hook in self.get_request_hook_chain()[1]:
+            resp = await maybe_await(hook(self, resp))
+
+        return resp
+
+    async def get(self, *args, **kwargs):
+        """Handle Incoming GET requests and dispatch to handle_get_request method.
+        """
+        return await maybe_await(self.handle_get_request())
+
+    async def post(self, *args, **kwargs):
+        """Handle Incoming POST requests and dispatch to handle_post_request method.
+        """
+        return await maybe_await(self.handle_post_request())
+
+    async def put(self, *args, **kwargs):
+        """Handle Incoming PUT requests and dispatch to handle_put_request method.
+        """
+        return await maybe_await(self.handle_put_request())
+
+    async def patch(self, *args, **kwargs):
+        """Handle Incoming PATCH requests and dispatch to handle_patch_request method.
+        """
+        return await maybe_await(self.handle_patch_request())
+
+    async def delete(self, *args, **kwargs):
+        """Handle Incoming DELETE requests and dispatch to handle_delete_request method.
+        """
+        return await maybe_await(self.handle_delete_request())
+
+
+class AsyncGetListMixin(GetListMixin):
+    """GetListMixin supporting an ``async def`` :meth:`GetListMixin.get_objects`.
+    """
+
+    async def handle_get_request(self):
+        """Handle incoming GET request to an Endpoint and return an array of results by
+        awaiting :meth:`GetListMixin.get_objects`.
+        """
+        early = self.get_early_response()
+        if early is not None:
+            return early
+
+        with timed(self, 'get_objects'):
+            self.objects = await maybe_await(self.get_objects())
+
+        return self.objects_response()
+
+
+class AsyncCreateMixin(CreateMixin):
+    """CreateMixin supporting an ``async def`` :meth:`CreateMixin.save_object`.
+    """
+
+    async def handle_post_request(self):
+        """Handle incoming POST request to an Endpoint, marshal the request data via the
+        specified RequestHandler and await :meth:`CreateMixin.save_object`.
+        """
+        self.request = self.get_request_handler()
+        self.obj = self.request.process().data
+
+        await maybe_await(self.save_object(self.obj))
+        self.invalidate_response_cache()
+        return self.create_response()
+
+
+class AsyncObjectMixin(ObjectMixin):
+    """ObjectMixin supporting an ``async def`` :meth:`ObjectMixin.get_object`.  The
+    object must be loaded with :meth:`AsyncObjectMixin.load_object` before
+    :attr:`ObjectMixin.obj` is accessed.
+    """
+
+    async def load_object(self):
+        """Await :meth:`ObjectMixin.get_object` and cache the result for the rest of the
+        request, enforcing :attr:`ObjectMixin.allow_none`.
+
+        :raises: :class:`werkzeug.exceptions.NotFound`
+        :returns: The result of :meth:`ObjectMixin.get_object`
+        """
+        obj = getattr(self, '_obj', _missing)
+        if obj is _missing:
+            with timed(self, 'get_object'):
+                obj = self._obj = await maybe_await(self.get_object())
+
+            self.object_lookups += 1
+            if obj is None and not self.allow_none:
+                self.return_error(404)
+
+        return obj
+
+    @property
+    def obj(self):
+        """Returns the object loaded by :meth:`AsyncObjectMixin.load_object`.
+
+        :raises: :class:`arrested.exceptions.ArrestedException` if the object has not
+            been loaded and :meth:`ObjectMixin.get_object` is a coroutine function.
+        """
+        obj = getattr(self, '_obj', _missing)
+        if obj is _missing:
+            if inspect.iscoroutinefunction(self.get_object):
+                raise ArrestedException(
+                    '%s.obj accessed before load_object was awaited.' %
+                    self.__class__.__name__
+                )
+            return ObjectMixin.obj.fget(self)
+
+        return obj
+
+    @obj.setter
+    def obj(self, value):
+        self._obj = value
+
+
+class AsyncGetObjectMixin(GetObjectMixin, AsyncObjectMixin):
+    """GetObjectMixin supporting an ``async def`` :meth:`ObjectMixin.get_object`.
+    """
+
+    async def handle_get_request(self):
+        """Handle incoming GET request to an Endpoint and return a single object.  The
+        object is loaded before conditional requests and the response cache are
+        checked.
+        """
+        await self.load_object()
+        return GetObjectMixin.handle_get_request(self)
+
+
+class AsyncPutObjectMixin(PutObjectMixin, AsyncObjectMixin):
+    """PutObjectMixin supporting ``async def`` implementations of
+    :meth:`ObjectMixin.get_object` and :meth:`PutObjectMixin.update_object`.
+    """
+
+    async def handle_put_request(self):
+        obj = await self.load_object()
+        self.request = self.get_request_handler()
+        self.request.process()
+
+        await maybe_await(self.update_object(obj))
+        self.invalidate_response_cache()
+        return self.put_request_response()
+
+
+class AsyncPatchObjectMixin(PatchObjectMixin, AsyncObjectMixin):
+    """PatchObjectMixin supporting ``async def`` implementations of
+    :meth:`ObjectMixin.get_object` and :meth:`PatchObjectMixin.patch_object`.
+    """
+
+    async def handle_patch_request(self):
+        obj = await self.load_object()
+        self.request = self.get_request_handler()
+        self.request.process()
+
+        await maybe_await(self.patch_object(obj))
+        self.invalidate_response_cache()
+        return self.patch_request_response()
+
+
+class AsyncDeleteObjectMixin(DeleteObjectMixin, AsyncObjectMixin):
+    """DeleteObjectMixin supporting ``async def`` implementations of
+    :meth:`ObjectMixin.get_object` and :meth:`DeleteObjectMixin.delete_object`.
+    """
+
+    async def handle_delete_request(self):
+        obj = await self.load_object()
+        await maybe_await(self.delete_object(obj))
+        self.invalidate_response_cache()
+        return self.delete_request_response()
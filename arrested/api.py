@@ -1,5 +1,10 @@
 
 
+import gc
+
+from .exceptions import ArrestedException
+from .hooks import HookListProperty
+
 __all__ = ['ArrestedAPI']
 
 
@@ -8,8 +13,12 @@ class ArrestedAPI(object):
     It acts like ``Flasks``  Blueprint object with a few minor differences.
     """
 
+    before_all_hooks = HookListProperty('before_all_hooks')
+    after_all_hooks = HookListProperty('after_all_hooks')
+
     def __init__(self, app=None, url_prefix='', before_all_hooks=None,
-                 after_all_hooks=None):
+                 after_all_hooks=None, json_backend=None, instrumentation=None,
+                 auto_warmup=True):
         """Constructor to create a new ArrestedAPI object.
 
         :param app: Flask app object.
@@ -19,6 +28,12 @@ class ArrestedAPI(object):
             every request made to any resource registered on this Api.
         :param after_all_hooks: A list containing funcs which will be called after
             every request made to any resource registered on this Api.
+        :param json_backend: The name of the JSON backend used to encode and decode
+            JSON for every resource registered on this Api, ie ``'orjson'``.
+        :param instrumentation: An :class:`arrested.instrumentation.Instrumentation`
+            timing the requests handled by every resource registered on this Api.
+        :param auto_warmup: Run :meth:`ArrestedAPI.warmup` when the Api is initialised
+            and warm up each resource registered on this Api afterwards.
 
         Usage::
 
@@ -27,10 +42,16 @@ class ArrestedAPI(object):
 
         """
 
-        self.before_all_hooks = before_all_hooks or []
-        self.after_all_hooks = after_all_hooks or []
+        self.before_all_hooks = before_all_hooks
+        self.after_all_hooks = after_all_hooks
         self.url_prefix = url_prefix
+        self.json_backend = json_backend
+        self.instrumentation = instrumentation
+        self.app = None
+        self.auto_warmup = auto_warmup
         self.deferred = []
+        self.resources = []
+        self.warmed_up = False
         if app is not None:
             self.init_app(app)
 
@@ -51,6 +72,57 @@ class ArrestedAPI(object):
         if self.deferred:
             self.register_all(self.deferred)
 
+        if self.auto_warmup:
+            self.warmup()
+
+    def warmup(self, freeze_gc=False):
+        """Resolve and prime everything the registered resources need to handle
+        requests ahead of the first request.  The hook chains, JSON backends, handler
+        classes and serializers of every :class:`.Endpoint` are prepared by
+        :meth:`arrested.Endpoint.warmup` and the Flask app's url map is compiled.
+
+        Pre-forking servers such as gunicorn load the app in a master process and fork
+        a worker process per CPU.  Warming up before the fork means the work is done
+        once and the resulting state is shared by every worker.  Passing
+        ``freeze_gc=True`` additionally calls :func:`gc.freeze` (Python 3.7+) so the
+        garbage collector doesn't write to the shared objects, which would copy the
+        memory pages holding them into each worker.  Objects created after the freeze
+        aren't frozen, so only pass it once every resource has been registered.
+
+        This is called by :meth:`ArrestedAPI.init_app` unless ``auto_warmup`` is False,
+        without freezing the garbage collector.
+
+        :param freeze_gc: Freeze the objects tracked by the garbage collector.
+        :raises: :class:`arrested.exceptions.ArrestedException` when the Api hasn't
+            been initialised with a Flask app.
+
+        Usage::
+
+            def create_app():
+
+                app = Flask(__name__)
+                api_v1 = ArrestedAPI(app, url_prefix='/v1')
+                api_v1.register_resource(characters_resource)
+                api_v1.warmup(freeze_gc=True)
+                return app
+
+            # gunicorn --preload 'app:create_app()'
+        """
+        if self.app is None:
+            raise ArrestedException(
+                'ArrestedAPI.warmup requires a Flask app, call init_app first.'
+            )
+
+        for resource in self.resources:
+            resource.warmup()
+
+        self.app.url_map.update()
+        self.warmed_up = True
+
+        if freeze_gc and hasattr(gc, 'freeze'):
+            gc.collect()
+            gc.freeze()
+
     def register_resource(self, resource, defer=False):
         """Register a :class:`.Resource` blueprint object against the Flask app object.
 
@@ -88,6 +160,9 @@ class ArrestedAPI(object):
         else:
             resource.init_api(self)
             self.app.register_blueprint(resource, url_prefix=self.url_prefix)
+            self.resources.append(resource)
+            if self.auto_warmup and self.warmed_up:
+                resource.warmup()
 
     def register_all(self, resources):
         """Register each resource from an iterable.
@@ -0,0 +1,149 @@
+import base64
+import json
+import threading
+import time
+
+from collections import OrderedDict, namedtuple
+
+
+__all__ = ['CachedResponse', 'ResponseCache', 'LRUResponseCache', 'RedisResponseCache']
+
+
+#: A response stored by a :class:`ResponseCache`
+CachedResponse = namedtuple('CachedResponse', ['status', 'headers', 'body'])
+
+
+class ResponseCache(object):
+    """Base class for the backends used to cache GET responses.  Concrete backends
+    store :class:`CachedResponse` objects against a key for a number of seconds and
+    maintain a version number for each cache namespace.
+
+    Invalidating a namespace increments its version.  The version forms part of every
+    key stored in that namespace so stale responses are never read again and simply
+    expire.
+    """
+
+    def get(self, key):
+        """Return the :class:`CachedResponse` stored against ``key`` or None.
+        """
+        raise NotImplementedError()
+
+    def set(self, key, response, ttl):
+        """Store the :class:`CachedResponse` against ``key`` for ``ttl`` seconds.
+        """
+        raise NotImplementedError()
+
+    def get_version(self, namespace):
+        """Return the current version of ``namespace``.
+
+        :rtype: int
+        """
+        raise NotImplementedError()
+
+    def invalidate(self, namespace):
+        """Invalidate every response cached in ``namespace``.
+        """
+        raise NotImplementedError()
+
+
+class LRUResponseCache(ResponseCache):
+    """A thread safe, in process response cache.  The least recently used responses
+    are evicted once ``max_size`` responses are stored.
+
+    Usage::
+
+        cache = LRUResponseCache(max_size=500)
+
+        class CharactersEndpoint(Endpoint, GetListMixin):
+
+            response_cache = cache
+            response_cache_ttl = 30
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._responses = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is None:
+                return None
+
+            expires, response = entry
+            if expires < time.time():
+                del self._responses[key]
+                return None
+
+            self._responses[key] = self._responses.pop(key)
+            return response
+
+    def set(self, key, response, ttl):
+        with self._lock:
+            self._responses.pop(key, None)
+            while len(self._responses) >= self.max_size:
+                self._responses.popitem(last=False)
+
+            self._responses[key] = (time.time() + ttl, response)
+
+    def get_version(self, namespace):
+        return self._versions.get(namespace, 0)
+
+    def invalidate(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self):
+        """Remove every cached response.
+        """
+        with self._lock:
+            self._responses.clear()
+
+
+class RedisResponseCache(ResponseCache):
+    """A response cache stored in Redis, shared between processes.  Any client
+    implementing the ``get``, ``set`` and ``incr`` methods of redis-py's
+    :class:`redis.StrictRedis` can be used.
+
+    Usage::
+
+        cache = RedisResponseCache(redis.StrictRedis(host='localhost'))
+    """
+
+    def __init__(self, client, prefix='arrested'):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, *parts):
+        return ':'.join((self.prefix, ) + parts)
+
+    def get(self, key):
+        value = self.client.get(self._key('response', key))
+        if value is None:
+            return None
+
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+
+        data = json.loads(value)
+        return CachedResponse(
+            status=data['status'],
+            headers=[tuple(header) for header in data['headers']],
+            body=base64.b64decode(data['body'])
+        )
+
+    def set(self, key, response, ttl):
+        value = json.dumps({
+            'status': response.status,
+            'headers': response.headers,
+            'body': base64.b64encode(response.body).decode('ascii'),
+        })
+        self.client.set(self._key('response', key), value, ex=ttl)
+
+    def get_version(self, namespace):
+        return int(self.client.get(self._key('version', namespace)) or 0)
+
+    def invalidate(self, namespace):
+        self.client.incr(self._key('version', namespace))
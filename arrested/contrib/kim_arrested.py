@@ -1,5 +1,4 @@
 from flask import request
-from kim.exception import MappingInvalid
 
 from ..handlers import Handler, RequestHandler, ResponseHandler
 from ..endpoint import Endpoint
@@ -8,6 +7,24 @@ from ..endpoint import Endpoint
 __all__ = ['KimHandler', 'KimRequestHandler', 'KimResponseHandler', 'KimEndpoint']
 
 
+def _is_compilable(mapper_class):
+    """Return a boolean indicating if the fields serialized by ``mapper_class`` can be
+    resolved without an object.
+    """
+    from kim.mapper import Mapper, PolymorphicMapper
+
+    if not isinstance(mapper_class, type) or issubclass(mapper_class, PolymorphicMapper):
+        return False
+
+    for name in ('serialize', '_get_fields', '_get_role'):
+        method = getattr(mapper_class, name)
+        if getattr(method, '__func__', method) is not \
+                getattr(getattr(Mapper, name), '__func__', getattr(Mapper, name)):
+            return False
+
+    return True
+
+
 class KimHandler(Handler):
     """Base handler providing Request/Response handling for the Kim serialization and
     marshaling framework.
@@ -78,22 +95,119 @@ class KimResponseHandler(KimHandler, ResponseHandler):
                 )
     """
 
+    #: Compiled serializers keyed by (mapper_class, role, raw).
+    _serializers = {}
+
+    @classmethod
+    def get_serializer(cls, mapper_class, role='__default__', raw=False):
+        """Return the fields ``mapper_class`` serializes for ``role`` as a flat tuple
+        of field serialize functions.  The fields are resolved once and reused for
+        every object serialized by any handler using the same mapper, role and raw
+        options.
+
+        None is returned when the mapper can not be compiled, for example a
+        PolymorphicMapper whose fields depend on the object being serialized, a
+        Mapper overriding serialize or a role passed as a Role instance.  Objects are
+        then serialized through the standard Kim interface.  This result is cached
+        too, so mappers that can't be compiled are only inspected once.
+
+        :param mapper_class: a Kim Mapper class
+        :param role: the name of the role used to serialize objects
+        :param raw: Pass the raw option to Kim when serializing.
+        :returns: tuple of field serialize functions or None
+        """
+        key = (mapper_class, role, raw)
+        try:
+            return cls._serializers[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return None
+
+        serializer = None
+        if _is_compilable(mapper_class):
+            try:
+                mapper_role = mapper_class.roles[role]
+            except (KeyError, TypeError):
+                pass
+            else:
+                serializer = tuple(
+                    field.serialize for name, field in mapper_class.fields.items()
+                    if name in mapper_role
+                )
+
+        cls._serializers[key] = serializer
+        return serializer
+
+    @classmethod
+    def warmup(cls, endpoint):
+        """Compile the serializer for the ``mapper_class`` and ``serialize_role`` of
+        ``endpoint``.
+
+        .. seealso::
+            :meth:`KimResponseHandler.get_serializer`
+        """
+        mapper_class = getattr(endpoint, 'mapper_class', None)
+        if mapper_class is not None:
+            cls.get_serializer(
+                mapper_class, getattr(endpoint, 'serialize_role', '__default__')
+            )
+
+    def serialize_iter(self, objs):
+        """Serialize each object in ``objs`` with the handler's mapper_class.  When the
+        mapper can be compiled a single mapper instance is created and reused for
+        every object.
+
+        :param objs: An iterable of objects to be serialized.
+        :returns: An iterator over the serialized objects.
+        """
+        mapper, raw, role = self.mapper, self.raw, self.role
+        mapper_kwargs = self.mapper_kwargs
+        serializer = self.get_serializer(mapper, role, raw)
+
+        instance = None
+        for obj in objs:
+            if serializer is None or obj is None:
+                yield mapper(obj=obj, raw=raw, **mapper_kwargs).serialize(role=role)
+                continue
+
+            if instance is None:
+                instance = mapper(obj=obj, raw=raw, **mapper_kwargs)
+
+            instance.obj = obj
+            output = {}
+            session = instance.get_mapper_session(
+                instance.transform_data(obj) if raw else obj, output
+            )
+            for serialize in serializer:
+                serialize(session)
+
+            yield output
+
     def handle(self, data, **kwargs):
         """Run serialization for the specified mapper_class.
 
-        Supports both .serialize and .many().serialize Kim interfaces.
+        Supports serializing a single object or, when many is set, a list of objects.
 
         :param data: Objects to be serialized.
         :returns: Serialized data according to mapper configuration
         """
         if self.many:
-            return self.mapper.many(raw=self.raw, **self.mapper_kwargs).serialize(
-                data, role=self.role
-            )
+            return list(self.serialize_iter(data))
         else:
-            return self.mapper(obj=data, raw=self.raw, **self.mapper_kwargs).serialize(
-                role=self.role
-            )
+            return next(self.serialize_iter([data]))
+
+    def handle_iter(self, data, **kwargs):
+        """Lazily run serialization for each object in ``data`` using the specified
+        mapper_class.  Used when streaming list responses.
+
+        :param data: An iterable of objects to be serialized.
+        :returns: An iterator over the serialized objects.
+        """
+        if data is None:
+            return None
+
+        return self.serialize_iter(data)
 
 
 class KimRequestHandler(KimHandler, RequestHandler):
@@ -136,6 +250,12 @@ class KimRequestHandler(KimHandler, RequestHandler):
         }
         self.endpoint.return_error(self.error_status, payload=payload)
 
+    @classmethod
+    def warmup(cls, endpoint):
+        """Import the parts of Kim used when marshaling.
+        """
+        import kim.exception  # noqa
+
     def handle(self, data, **kwargs):
         """Run marshalling for the specified mapper_class.
 
@@ -146,6 +266,8 @@ class KimRequestHandler(KimHandler, RequestHandler):
         :returns: Marshaled object according to mapper configuration
         :raises: :class:`werkzeug.exceptions.UnprocessableEntity`
         """
+        from kim.exception import MappingInvalid
+
         try:
             if self.many:
                 return self.mapper.many(raw=self.raw, **self.mapper_kwargs).marshal(
@@ -200,7 +322,7 @@ class KimEndpoint(Endpoint):
         # setting for many by default, pull it from the request handler params config to
         # ensure Marshaling and Serializing are run the same way.
         if self._is_marshal_request():
-            req_params = self.get_request_handler_params()
+            req_params = self.request_handler_params
             params['many'] = req_params.get('many', self.many)
         else:
             params['many'] = self.many
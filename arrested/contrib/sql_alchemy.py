@@ -1,16 +1,330 @@
-from flask import current_app as app
+import base64
+import datetime
+import decimal
+import json
+import threading
+import time
+import uuid
+
+from flask import after_this_request, current_app as app, g, request
+from werkzeug.http import generate_etag
 
 from arrested.exceptions import ArrestedException
 
 from ..mixins import (
     GetListMixin, CreateMixin, GetObjectMixin,
     PutObjectMixin, PatchObjectMixin,
-    DeleteObjectMixin
+    DeleteObjectMixin, BulkCreateMixin,
+    BulkPatchMixin, BulkDeleteMixin
 )
 
 
+class CountCache(object):
+    """A thread safe, in process cache of query counts used by the ``'cached'``
+    :attr:`DBListMixin.count_strategy`.  Counts expire after a configurable number of
+    seconds and the oldest entries are evicted once ``max_size`` entries are stored.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached count for ``key`` or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                return None
+
+            expires, count = entry
+            if expires < time.time():
+                del self._counts[key]
+                return None
+
+            return count
+
+    def set(self, key, count, ttl):
+        """Store ``count`` against ``key`` for ``ttl`` seconds.
+        """
+        with self._lock:
+            self._counts.pop(key, None)
+            while len(self._counts) >= self.max_size:
+                del self._counts[next(iter(self._counts))]
+
+            self._counts[key] = (time.time() + ttl, count)
+
+    def clear(self):
+        """Remove every cached count.
+        """
+        with self._lock:
+            self._counts.clear()
+
+
+#: The CountCache shared by every DBListMixin using the ``'cached'`` count strategy
+count_cache = CountCache()
+
+
+try:
+    _timezone = datetime.timezone
+except AttributeError:  # pragma: no cover
+    class _timezone(datetime.tzinfo):
+        """A fixed utc offset for Python versions without :class:`datetime.timezone`.
+        """
+
+        def __init__(self, offset):
+            self.offset = offset
+
+        def utcoffset(self, dt):
+            return self.offset
+
+        def dst(self, dt):
+            return datetime.timedelta(0)
+
+        def tzname(self, dt):
+            return None
+
+
+def _parse_isoformat(value, fmt):
+    """Parse a datetime encoded with ``isoformat`` using ``fmt`` for the part before
+    the optional fractional seconds and ``+HH:MM`` utc offset.  Avoids
+    ``fromisoformat`` which isn't available before Python 3.7.
+    """
+    tzinfo = None
+    if len(value) > 6 and value[-6] in '+-' and value[-3] == ':':
+        offset = datetime.timedelta(hours=int(value[-5:-3]), minutes=int(value[-2:]))
+        tzinfo = _timezone(-offset if value[-6] == '-' else offset)
+        value = value[:-6]
+
+    if '.' in value:
+        fmt += '.%f'
+
+    return datetime.datetime.strptime(value, fmt).replace(tzinfo=tzinfo)
+
+
+def _parse_datetime(value):
+
+    return _parse_isoformat(value, '%Y-%m-%dT%H:%M:%S')
+
+
+def _parse_date(value):
+
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _parse_time(value):
+
+    return _parse_isoformat(value, '%H:%M:%S').timetz()
+
+
+#: Keyset values that aren't JSON types are stored in cursors as a string tagged with
+#: their type.  ``(tag, type, encode, decode)`` tuples, subclasses before their bases.
+CURSOR_TYPES = [
+    ('datetime', datetime.datetime, lambda v: v.isoformat(), _parse_datetime),
+    ('date', datetime.date, lambda v: v.isoformat(), _parse_date),
+    ('time', datetime.time, lambda v: v.isoformat(), _parse_time),
+    ('decimal', decimal.Decimal, str, decimal.Decimal),
+    ('uuid', uuid.UUID, str, uuid.UUID),
+]
+
+
+#: Loader functions from sqlalchemy.orm used by each eager loading strategy
+EAGER_LOAD_STRATEGIES = {
+    'selectin': 'selectinload',
+    'joined': 'joinedload',
+    'subquery': 'subqueryload',
+    'immediate': 'immediateload',
+}
+
+_eager_load_paths = {}
+
+
+def _query_model(query):
+    """Return the model class of the first entity selected by ``query`` or None.
+    """
+    try:
+        return query.column_descriptions[0]['entity']
+    except (AttributeError, IndexError, KeyError):
+        return None
+
+
+def _relationship_paths(mapper_class, role, model, prefix=(), seen=()):
+    """Return the paths of the relationships of ``model`` serialized by the Nested
+    fields of a Kim ``mapper_class`` in ``role``, including the relationships
+    serialized by each Nested mapper.
+    """
+    from sqlalchemy import inspect
+
+    mapper_role = getattr(mapper_class, 'roles', {}).get(role)
+    if mapper_role is None or (mapper_class, role) in seen:
+        return []
+
+    relationships = inspect(model).relationships
+    seen = seen + ((mapper_class, role), )
+    paths = []
+    for name, field in getattr(mapper_class, 'fields', {}).items():
+        if name not in mapper_role:
+            continue
+
+        # Collections wrap the field used for each item.
+        nested = getattr(field.opts, 'field', field)
+        source = field.opts.source
+        if not hasattr(nested, 'get_mapper') or source not in relationships:
+            continue
+
+        path = prefix + (source, )
+        paths.append(path)
+        paths.extend(_relationship_paths(
+            nested.get_mapper(as_class=True), nested.opts.role,
+            relationships[source].mapper.class_, path, seen
+        ))
+
+    return paths
+
+
+_projected_columns = {}
+
+
+def _projected_column_names(mapper_class, role, model):
+    """Return the names of the columns of ``model`` needed to serialize a Kim
+    ``mapper_class`` in ``role``, or None when a field serializes something other than
+    a column or relationship and the columns can not be determined.
+    """
+    from sqlalchemy import inspect
+
+    mapper_role = getattr(mapper_class, 'roles', {}).get(role)
+    if mapper_role is None:
+        return None
+
+    sa_mapper = inspect(model)
+    names = [sa_mapper.get_property_by_column(column).key
+             for column in sa_mapper.primary_key]
+    for name, field in getattr(mapper_class, 'fields', {}).items():
+        if name not in mapper_role:
+            continue
+
+        source = field.opts.source
+        if source in sa_mapper.column_attrs:
+            candidates = [source]
+        elif source in sa_mapper.relationships:
+            # Loading a relationship requires its local foreign key columns.
+            candidates = [
+                sa_mapper.get_property_by_column(column).key
+                for column in sa_mapper.relationships[source].local_columns
+            ]
+        else:
+            return None
+
+        names.extend(c for c in candidates if c not in names)
+
+    return names
+
+
+def _auto_eager_load(mapper_class, role, model):
+    """Return the cached dotted relationship paths serialized by ``mapper_class`` in
+    ``role`` for ``model``.
+    """
+    key = (mapper_class, role, model)
+    try:
+        return _eager_load_paths[key]
+    except KeyError:
+        paths = _eager_load_paths[key] = [
+            '.'.join(path) for path in _relationship_paths(mapper_class, role, model)
+        ]
+        return paths
+
+
+def _auto_columns(mapper_class, role, model):
+    """Return the cached names of the columns of ``model`` serialized by
+    ``mapper_class`` in ``role``.
+    """
+    key = (mapper_class, role, model)
+    try:
+        return _projected_columns[key]
+    except KeyError:
+        names = _projected_columns[key] = _projected_column_names(
+            mapper_class, role, model
+        )
+        return names
+
+
+def _pending_commit_callbacks(session):
+    """Return the callbacks run once the commit of ``session`` deferred by
+    :func:`_commit_after_request` succeeds, or None when no commit is pending.
+    """
+    for pending_session, callbacks in g.get('_arrested_pending_sessions', []):
+        if pending_session is session:
+            return callbacks
+
+    return None
+
+
+def _commit_after_request(endpoint, session):
+    """Commit ``session`` once the response for the current request has been generated,
+    or roll it back if the response is an error.  Each session is committed once per
+    request however many changes were flushed.  When the commit fails the response is
+    replaced by the one returned by :meth:`DBMixin.get_commit_error_response`,
+    otherwise the callbacks registered with :meth:`DBMixin.after_commit` are run.
+    """
+    if _pending_commit_callbacks(session) is not None:
+        return
+
+    pending = g.setdefault('_arrested_pending_sessions', [])
+    entry = (session, [])
+    pending.append(entry)
+
+    @after_this_request
+    def commit_session(response):
+        from sqlalchemy.exc import SQLAlchemyError
+
+        pending.remove(entry)
+        if response.status_code >= 400:
+            session.rollback()
+            return response
+
+        try:
+            session.commit()
+        except SQLAlchemyError as exc:
+            session.rollback()
+            return endpoint.get_commit_error_response(exc)
+
+        for callback in entry[1]:
+            callback()
+
+        return response
+
+
 class DBMixin(object):
 
+    #: Relationships loaded alongside the objects returned by
+    #: :meth:`DBMixin.get_query`.  A list of dotted relationship paths loaded using
+    #: :attr:`DBMixin.eager_load_strategy`, ``(path, strategy)`` tuples or SQLAlchemy
+    #: loader options such as ``joinedload(Character.planet).load_only(Planet.name)``.
+    #: Set to ``'auto'`` to load every relationship serialized by the Endpoint's
+    #: ``mapper_class`` and ``serialize_role``.
+    eager_load = None
+
+    #: The strategy used for relationship paths in :attr:`DBMixin.eager_load`.  One of
+    #: ``'selectin'``, ``'joined'``, ``'subquery'`` or ``'immediate'``.
+    eager_load_strategy = 'selectin'
+
+    #: How changes made by the mixins are committed.  One of:
+    #:
+    #: * ``'commit'`` - commit the session after every change.
+    #: * ``'flush'`` - flush each change and commit the session once the response
+    #:   has been generated, or roll it back if the response is an error.  Every
+    #:   change made while handling the request is committed in one transaction.  If
+    #:   the commit fails the response is replaced by an error response.
+    #: * ``'no_refresh'`` - commit after every change without expiring the objects in
+    #:   the session, so serializing them does not reload them from the database.
+    commit_policy = 'commit'
+
+    #: Limit the columns loaded for the objects returned by :meth:`DBMixin.get_query`
+    #: to a list of column names.  Set to ``'auto'`` to load only the columns
+    #: serialized by the Endpoint's ``mapper_class`` and ``serialize_role``.
+    columns = None
+
     def get_query(self):
         """Return an SQLAlchemy Query object.  Users using this mixin should  override
         this method.
@@ -49,6 +363,254 @@ class DBMixin(object):
         """
         return app.extensions['sqlalchemy'].db.session
 
+    def get_model_id_field(self):
+        """Return the column of :attr:`model` named by :attr:`model_id_param`.
+
+        :raises: :class:`arrested.exceptions.ArrestedException`
+        :returns: SQLAlchemy column
+        """
+        name = self.__class__.__name__
+        model = getattr(self, 'model', None)
+        if model is None:
+            raise ArrestedException('%s requires a model to be set.' % name)
+
+        idfield = getattr(model, getattr(self, 'model_id_param', 'id'), None)
+        if not idfield:
+            raise ArrestedException('%s could not find a valid Model.id.' % name)
+
+        return idfield
+
+    def coerce_id(self, obj_id):
+        """Convert ``obj_id`` to the Python type of the column returned by
+        :meth:`DBMixin.get_model_id_field` so ids sent as strings match the ids loaded
+        from the database.
+
+        :param obj_id: An id sent in the request
+        :raises: ValueError when ``obj_id`` can not be converted
+        :returns: The converted id
+        """
+        try:
+            python_type = self.get_model_id_field().type.python_type
+        except (AttributeError, NotImplementedError):
+            return obj_id
+
+        if isinstance(obj_id, bool) and python_type is not bool:
+            raise ValueError('Invalid id')
+
+        if isinstance(obj_id, python_type):
+            return obj_id
+
+        return python_type(obj_id)
+
+    def get_eager_load(self, query):
+        """Return the eager loading declarations for ``query``, deriving them from the
+        Endpoint's Kim mapper when :attr:`DBMixin.eager_load` is ``'auto'``.
+
+        :param query: SQLAlchemy Query
+        :returns: list of eager loading declarations
+        :rtype: list
+        """
+        if self.eager_load != 'auto':
+            return self.eager_load or []
+
+        mapper_class = getattr(self, 'mapper_class', None)
+        model = _query_model(query) or getattr(self, 'model', None)
+        if mapper_class is None or model is None:
+            return []
+
+        return _auto_eager_load(
+            mapper_class, getattr(self, 'serialize_role', '__default__'), model
+        )
+
+    def get_loader_option(self, model, path, strategy=None):
+        """Build the SQLAlchemy loader option that eager loads the dotted relationship
+        ``path`` of ``model``.
+
+        :param model: The model class the path starts from
+        :param path: A dotted relationship path such as ``'planet.moons'``
+        :param strategy: The eager loading strategy, defaults to
+            :attr:`DBMixin.eager_load_strategy`
+        :raises: :class:`arrested.exceptions.ArrestedException`
+        :returns: SQLAlchemy loader option
+        """
+        from sqlalchemy import orm
+
+        strategy = strategy or self.eager_load_strategy
+        try:
+            loader = EAGER_LOAD_STRATEGIES[strategy]
+        except KeyError:
+            raise ArrestedException('Unknown eager_load strategy: %s' % strategy)
+
+        option = None
+        for name in path.split('.'):
+            attr = getattr(model, name, None)
+            if attr is None or not hasattr(attr.property, 'mapper'):
+                raise ArrestedException(
+                    '%s has no relationship %s' % (model.__name__, name)
+                )
+
+            option = getattr(orm if option is None else option, loader)(attr)
+            model = attr.property.mapper.class_
+
+        return option
+
+    def get_columns(self, query):
+        """Return the names of the columns loaded for ``query``, deriving them from
+        the Endpoint's Kim mapper when :attr:`DBMixin.columns` is ``'auto'``.
+
+        :param query: SQLAlchemy Query
+        :returns: list of column names or None to load every column
+        :rtype: list
+        """
+        if self.columns != 'auto':
+            return self.columns
+
+        mapper_class = getattr(self, 'mapper_class', None)
+        model = _query_model(query) or getattr(self, 'model', None)
+        if mapper_class is None or model is None:
+            return None
+
+        return _auto_columns(
+            mapper_class, getattr(self, 'serialize_role', '__default__'), model
+        )
+
+    @classmethod
+    def warmup(cls, resource=None):
+        """Derive the ``'auto'`` :attr:`DBMixin.eager_load` paths and
+        :attr:`DBMixin.columns` for the Endpoint's ``model`` ahead of the first request.
+
+        .. seealso::
+            :meth:`arrested.Endpoint.warmup`
+        """
+        mapper_class = getattr(cls, 'mapper_class', None)
+        model = getattr(cls, 'model', None)
+        if mapper_class is not None and model is not None:
+            role = getattr(cls, 'serialize_role', '__default__')
+            if cls.eager_load == 'auto':
+                _auto_eager_load(mapper_class, role, model)
+            if cls.columns == 'auto':
+                _auto_columns(mapper_class, role, model)
+
+        warmup = getattr(super(DBMixin, cls), 'warmup', None)
+        if warmup is not None:
+            warmup(resource)
+
+    def _get_column_attrs(self, query):
+
+        names = self.get_columns(query)
+        if not names:
+            return None
+
+        model = _query_model(query) or getattr(self, 'model', None)
+        attrs = []
+        for name in names:
+            attr = getattr(model, name, None)
+            if attr is None:
+                raise ArrestedException('%s has no column %s' % (model.__name__, name))
+            attrs.append(attr)
+
+        return attrs
+
+    def apply_load_only(self, query):
+        """Limit the columns loaded by ``query`` to those returned by
+        :meth:`DBMixin.get_columns`.  Other columns are loaded when accessed.
+
+        :param query: SQLAlchemy Query
+        :returns: SQLAlchemy Query
+        """
+        attrs = self._get_column_attrs(query)
+        if not attrs:
+            return query
+
+        from sqlalchemy.orm import load_only
+
+        return query.options(load_only(*attrs))
+
+    def apply_eager_load(self, query):
+        """Apply the loader options declared by :attr:`DBMixin.eager_load` to
+        ``query``.
+
+        :param query: SQLAlchemy Query
+        :returns: SQLAlchemy Query
+        """
+        declarations = self.get_eager_load(query)
+        if not declarations:
+            return query
+
+        model = _query_model(query) or getattr(self, 'model', None)
+        options = []
+        for declaration in declarations:
+            if isinstance(declaration, tuple):
+                options.append(self.get_loader_option(model, *declaration))
+            elif isinstance(declaration, str):
+                options.append(self.get_loader_option(model, declaration))
+            else:
+                options.append(declaration)
+
+        return query.options(*options)
+
+    def commit(self, session):
+        """Commit the changes made to ``session`` according to
+        :attr:`DBMixin.commit_policy`.
+
+        :param session: SQLAlchemy session
+        :raises: :class:`arrested.exceptions.ArrestedException`
+        """
+        policy = self.commit_policy
+        if policy == 'commit':
+            session.commit()
+        elif policy == 'flush':
+            session.flush()
+            _commit_after_request(self, session)
+        elif policy == 'no_refresh':
+            # A scoped_session proxies a Session stored in its registry.
+            target = session.registry() if hasattr(session, 'registry') else session
+            expire_on_commit = target.expire_on_commit
+            target.expire_on_commit = False
+            try:
+                target.commit()
+            finally:
+                target.expire_on_commit = expire_on_commit
+        else:
+            raise ArrestedException('Unknown commit_policy: %s' % policy)
+
+    def after_commit(self, callback):
+        """Call ``callback`` once the changes made while handling the request have
+        been committed.  Used by :meth:`arrested.mixins.HTTPMixin.invalidate_response_cache`
+        so concurrent requests can't cache data that hasn't been committed yet.  With
+        the ``'flush'`` :attr:`DBMixin.commit_policy` the callback is deferred until the
+        session is committed and isn't called if the changes are rolled back.
+
+        :param callback: A function called without arguments.
+        """
+        callbacks = None
+        if self.commit_policy == 'flush':
+            callbacks = _pending_commit_callbacks(self.get_db_session())
+
+        if callbacks is None:
+            callback()
+        else:
+            callbacks.append(callback)
+
+    def get_commit_error_response(self, exc):
+        """Return the response sent instead of the generated response when committing
+        the changes made by a request using the ``'flush'``
+        :attr:`DBMixin.commit_policy` fails.  Integrity errors, such as unique
+        constraint violations, return a 409 Conflict and any other error a 500.
+
+        :param exc: The SQLAlchemyError raised by the commit.
+        :returns: Response object
+        """
+        from sqlalchemy.exc import IntegrityError
+
+        if isinstance(exc, IntegrityError):
+            status, message = 409, 'The changes conflict with existing data.'
+        else:
+            status, message = 500, 'The changes could not be saved.'
+
+        payload = self.get_json_backend().dumps({'message': message})
+        return self.make_response(payload, status=status)
+
     def save(self, obj):
         """Add ``obj`` to the SQLAlchemy session and commit the changes back to
         the database.
@@ -58,7 +620,7 @@ class DBMixin(object):
         """
         session = self.get_db_session()
         session.add(obj)
-        session.commit()
+        self.commit(session)
 
         return obj
 
@@ -91,17 +653,116 @@ class DBListMixin(GetListMixin, DBMixin):
 
         characters_resource.add_endpoint(CharactersEndpoint)
 
+    **Streaming results**
+
+    When :attr:`GetListMixin.stream` is enabled rows are fetched from the database
+    in batches of :attr:`DBListMixin.yield_per` using a server side cursor where the
+    database driver supports one.  Each batch is serialized and discarded as the
+    response is written so the full result set is never held in memory.
+
+    .. code-block:: python
+
+        class CharacterExportEndpoint(KimEndpoint, DBListMixin):
+
+            url = '/export'
+            stream = True
+            yield_per = 1000
+
+    **Pagination**
+
+    Setting :attr:`DBListMixin.paginate` to ``'offset'`` or ``'keyset'`` limits each
+    response to a single page of results.  Clients control the page using the
+    ``limit`` and ``offset`` or ``cursor`` query string arguments and the details
+    needed to fetch the next page are returned in the ``meta`` of the response.
+
+    .. code-block:: python
+
+        class CharactersEndpoint(KimEndpoint, DBListMixin):
+
+            paginate = 'keyset'
+            keyset_column = Character.id
+            page_size = 50
+
+    Keyset pagination seeks directly to the next page using an indexed, unique
+    column so the cost of fetching a page does not grow with its position in the
+    result set.  Results are ordered by the keyset column.
+
+    The total number of results can be included in the pagination details by
+    setting :attr:`DBListMixin.count_strategy`.  Counting requires an additional
+    query so a cached or estimated count can be used for large tables.
+
     """
 
+    #: The number of rows fetched from the database at a time when streaming.
+    #: Defaults to :attr:`GetListMixin.stream_chunk_size`.
+    yield_per = None
+
+    #: The pagination strategy applied to the query.  One of None, ``'offset'`` or
+    #: ``'keyset'``.
+    paginate = None
+
+    #: The number of results returned when the client does not request a limit
+    page_size = 20
+
+    #: The maximum number of results a client may request in a single page
+    max_page_size = 100
+
+    #: The unique, indexed column used for keyset pagination.  Either a mapped
+    #: column such as ``Character.id`` or the name of an attribute of ``model``.
+    keyset_column = 'id'
+
+    #: Order keyset pages by ascending (``'asc'``) or descending (``'desc'``) value.
+    keyset_order = 'asc'
+
+    #: The model used to resolve keyset_column when it is given by name.
+    model = None
+
+    #: Query string argument used to specify the page size
+    limit_param = 'limit'
+
+    #: Query string argument used to specify the offset of the page
+    offset_param = 'offset'
+
+    #: Query string argument used to specify the keyset cursor of the page
+    cursor_param = 'cursor'
+
+    #: How the total number of results is counted for paginated responses.  One of
+    #: None (no count), ``'exact'``, ``'cached'`` (an exact count cached per query for
+    #: count_cache_ttl seconds) or ``'estimate'`` (the query planner's estimate where
+    #: the database supports one, falling back to an exact count).
+    count_strategy = None
+
+    #: The number of seconds counts are cached for by the ``'cached'`` strategy
+    count_cache_ttl = 60
+
+    #: Return rows containing only the columns returned by :meth:`DBMixin.get_columns`
+    #: rather than ORM instances.  Relationships are not available on rows.
+    return_rows = False
+
     def get_result(self, query):
-        """Cast the query into a scalar python type.
+        """Cast the query into a scalar python type.  When streaming, an iterator over
+        the results returned by :meth:`DBListMixin.iter_result` is returned instead.
 
         :param query: SQLAlchemy Query
         :returns: A list of objects returned by the Query or an empty list
         """
+        if self.stream:
+            return self.iter_result(query)
 
         return query.all()
 
+    def iter_result(self, query):
+        """Iterate over the results of the query in batches of
+        :attr:`DBListMixin.yield_per` rows using a server side cursor.
+
+        :param query: SQLAlchemy Query
+        :returns: An iterator over the objects returned by the Query
+        """
+        batch_size = self.yield_per or self.stream_chunk_size
+        query = query.execution_options(stream_results=True).yield_per(batch_size)
+
+        return iter(query)
+
     def get_objects(self):
         """Implements the GetListMixin interface and calls :meth:`DBListMixin.get_query`.
         Using this mixin requires usage of a response handler capable of serializing
@@ -113,9 +774,294 @@ class DBListMixin(GetListMixin, DBMixin):
         .. seealso::
             :meth:`DBListMixin.get_query`
             :meth:`DBListMixin.get_result`
+            :meth:`DBListMixin.get_page`
+        """
+        query = self.get_query()
+        if self.return_rows:
+            query = self.select_columns(query)
+        else:
+            query = self.apply_eager_load(self.apply_load_only(query))
+
+        if self.paginate:
+            return self.get_page(query)
+
+        return self.get_result(query)
+
+    def _get_column_attrs(self, query):
+
+        attrs = super(DBListMixin, self)._get_column_attrs(query)
+        if attrs and self.paginate == 'keyset':
+            # The next cursor is read from the keyset column of the last result.
+            column = self.get_keyset_column()
+            if column.key not in [attr.key for attr in attrs]:
+                attrs.append(column)
+
+        return attrs
+
+    def select_columns(self, query):
+        """Select only the columns returned by :meth:`DBMixin.get_columns` so the
+        Query returns lightweight rows rather than ORM instances.  Rows provide
+        attribute access to each column and can be serialized by the same mappers.
+
+        :param query: SQLAlchemy Query
+        :returns: SQLAlchemy Query
+        """
+        attrs = self._get_column_attrs(query)
+        if not attrs:
+            return query
+
+        return query.with_entities(*attrs)
+
+    def get_list_meta(self):
+        """Include the pagination details in the response meta when the results are
+        paginated.
+
+        :returns: A dictionary of pagination details or None
+        :rtype: dict
+        """
+        return getattr(self, 'pagination', None)
+
+    def get_limit(self):
+        """Return the page size requested by the client, capped at
+        :attr:`DBListMixin.max_page_size`.
+
+        :returns: The number of results to return
+        :rtype: int
+        """
+        limit = self._get_int_arg(self.limit_param, self.page_size)
+        if limit < 1:
+            self._invalid_page()
+
+        return min(limit, self.max_page_size)
+
+    def get_offset(self):
+        """Return the offset requested by the client.
+
+        :returns: The number of results to skip
+        :rtype: int
+        """
+        offset = self._get_int_arg(self.offset_param, 0)
+        if offset < 0:
+            self._invalid_page()
+
+        return offset
+
+    def get_keyset_column(self):
+        """Return the column used for keyset pagination.
+
+        :raises: :class:`arrested.exceptions.ArrestedException`
+        :returns: SQLAlchemy column
+        """
+        # Mapped columns are descriptors, so read the attribute from the class to
+        # avoid invoking them against the Endpoint instance.
+        column = type(self).keyset_column
+        if isinstance(column, str):
+            if self.model is None:
+                raise ArrestedException(
+                    'DBListMixin requires a model to resolve keyset_column.'
+                )
+            column = getattr(self.model, column, None)
+            if column is None:
+                raise ArrestedException(
+                    'DBListMixin could not find keyset_column on Model.'
+                )
+
+        return column
+
+    def encode_cursor(self, value):
+        """Encode the keyset value of the last result in a page as an opaque cursor
+        token returned to the client.  Datetime, date, time, Decimal and UUID values
+        are tagged with their type so :meth:`DBListMixin.decode_cursor` restores them.
+
+        :param value: The keyset column value of the last result in the page.
+        :raises: :class:`arrested.exceptions.ArrestedException` when the value can't be
+            encoded.
+        :returns: A url safe cursor token
+        :rtype: str
+        """
+        data = [value]
+        for tag, type_, encode, decode in CURSOR_TYPES:
+            if isinstance(value, type_):
+                data = [encode(value), tag]
+                break
+
+        try:
+            token = base64.urlsafe_b64encode(json.dumps(data).encode('utf-8'))
+        except TypeError:
+            raise ArrestedException(
+                'Keyset values of type %s can not be encoded in a cursor.'
+                % type(value).__name__
+            )
+
+        return token.decode('ascii').rstrip('=')
+
+    def decode_cursor(self, token):
+        """Decode a cursor token created by :meth:`DBListMixin.encode_cursor`.
+
+        :param token: The cursor token provided by the client.
+        :returns: The keyset column value the page should start after.
+        """
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded).decode('utf-8'))
+            if len(data) == 1:
+                return data[0]
+
+            decoders = dict((tag, decode) for tag, _, _, decode in CURSOR_TYPES)
+            return decoders[data[1]](data[0])
+        except (ValueError, TypeError, IndexError, KeyError, ArithmeticError):
+            self._invalid_page()
+
+    def paginate_query(self, query, limit):
+        """Apply the :attr:`DBListMixin.paginate` strategy to the query.  One more
+        result than the page size is requested so the existence of a following page
+        can be detected.
+
+        :param query: SQLAlchemy Query
+        :param limit: The number of results in the page
+        :returns: A SQLAlchemy Query object
+        """
+        if self.paginate == 'offset':
+            return query.offset(self.get_offset()).limit(limit + 1)
+
+        if self.paginate != 'keyset':
+            raise ArrestedException('Unknown pagination strategy: %s' % self.paginate)
+
+        column = self.get_keyset_column()
+        descending = self.keyset_order == 'desc'
+        token = request.args.get(self.cursor_param)
+        if token:
+            value = self.decode_cursor(token)
+            query = query.filter(column < value if descending else column > value)
+
+        order = column.desc() if descending else column.asc()
+        return query.order_by(None).order_by(order).limit(limit + 1)
+
+    def get_page(self, query):
+        """Fetch a single page of results for the query and store the details needed
+        to request the next page in :attr:`DBListMixin.pagination`.
+
+        :param query: SQLAlchemy Query
+        :returns: A list of objects for the requested page
+        """
+        limit = self.get_limit()
+        results = list(self.get_result(self.paginate_query(query, limit)))
+        has_more = len(results) > limit
+        results = results[:limit]
+
+        self.pagination = {'limit': limit}
+        if self.count_strategy:
+            count, strategy = self.get_count(query)
+            self.pagination['count'] = count
+            self.pagination['count_strategy'] = strategy
+        if self.paginate == 'offset':
+            offset = self.get_offset()
+            self.pagination['offset'] = offset
+            self.pagination['next_offset'] = offset + limit if has_more else None
+        else:
+            next_cursor = None
+            if has_more:
+                key = self.get_keyset_column().key
+                next_cursor = self.encode_cursor(getattr(results[-1], key))
+            self.pagination['next_cursor'] = next_cursor
+
+        return results
+
+    def get_count(self, query):
+        """Count the total number of results for the query using
+        :attr:`DBListMixin.count_strategy`.
+
+        :param query: SQLAlchemy Query before pagination is applied
+        :returns: A tuple of the count and the strategy used to produce it
+        :rtype: tuple
         """
+        strategy = self.count_strategy
+        query = query.order_by(None)
 
-        return self.get_result(self.get_query())
+        if strategy == 'exact':
+            return self.get_exact_count(query), strategy
+
+        if strategy == 'cached':
+            key = self.get_count_cache_key(query)
+            count = count_cache.get(key)
+            if count is None:
+                count = self.get_exact_count(query)
+                count_cache.set(key, count, self.count_cache_ttl)
+            return count, strategy
+
+        if strategy == 'estimate':
+            count = self.get_estimated_count(query)
+            if count is None:
+                return self.get_exact_count(query), 'exact'
+            return count, strategy
+
+        raise ArrestedException('Unknown count strategy: %s' % strategy)
+
+    def get_exact_count(self, query):
+        """Return the exact number of results for the query.
+
+        :param query: SQLAlchemy Query
+        :rtype: int
+        """
+        return query.count()
+
+    def get_count_cache_key(self, query):
+        """Return the fingerprint of the query used to cache its count.
+
+        :param query: SQLAlchemy Query
+        :rtype: str
+        """
+        compiled = query.statement.compile()
+        params = sorted((key, repr(value)) for key, value in compiled.params.items())
+
+        return '%s|%s' % (compiled, params)
+
+    def get_estimated_count(self, query):
+        """Return the query planner's estimate of the number of results for the query.
+        Estimates are supported for PostgreSQL and MySQL.
+
+        :param query: SQLAlchemy Query
+        :returns: The estimated count or None if the database can not provide one.
+        :rtype: int
+        """
+        connection = query.session.connection()
+        dialect = connection.dialect
+        if dialect.name not in ('postgresql', 'mysql'):
+            return None
+
+        compiled = query.statement.compile(dialect=dialect)
+        if compiled.positiontup:
+            params = tuple(compiled.params[key] for key in compiled.positiontup)
+        else:
+            params = compiled.params
+
+        if dialect.name == 'postgresql':
+            plan = connection.exec_driver_sql(
+                'EXPLAIN (FORMAT JSON) %s' % compiled, params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+
+        row = connection.exec_driver_sql('EXPLAIN %s' % compiled, params).first()
+        rows = row._mapping.get('rows') if row is not None else None
+        return int(rows) if rows is not None else None
+
+    def _get_int_arg(self, name, default):
+        value = request.args.get(name)
+        if value is None:
+            return default
+
+        try:
+            return int(value)
+        except ValueError:
+            self._invalid_page()
+
+    def _invalid_page(self):
+        self.return_error(
+            400,
+            payload={'message': 'Invalid pagination parameters provided'}
+        )
 
 
 class DBCreateMixin(CreateMixin, DBMixin):
@@ -166,6 +1112,25 @@ class DBObjectMixin(GetObjectMixin,
     url_id_param = 'obj_id'
     model_id_param = 'id'
 
+    #: The name of a column incremented whenever the object changes.  When set and
+    #: :attr:`HTTPMixin.etags` is enabled the ETag is derived from this column so
+    #: conditional requests are answered without serializing the object.
+    version_column = None
+
+    #: The name of a column storing the datetime the object was last modified, such
+    #: as ``'updated_at'``, used for the Last-Modified header.
+    last_modified_column = None
+
+    #: Delete objects with a single ``DELETE ... WHERE id = :id`` statement rather than
+    #: loading the object first.  A 404 is returned when no rows were deleted.  ORM
+    #: level cascades and delete events are not run in this mode.
+    fast_delete = False
+
+    #: Apply PATCH requests sent with a ``Prefer: return=minimal`` header as a single
+    #: ``UPDATE`` statement without loading the object.  The response is a
+    #: ``204 No Content``.  ORM level update events are not run in this mode.
+    fast_patch = False
+
     def get_result(self, query):
         """Cast the query into a scalar python type.
 
@@ -184,13 +1149,7 @@ class DBObjectMixin(GetObjectMixin,
         :param query: SQLAlchemy Query
         :returns: A SQLAlchemy Query object
         """
-        if self.model is None:
-            raise ArrestedException('DBObjectMixin requires a model to be set.')
-
-        idfield = getattr(self.model, self.model_id_param, None)
-        if not idfield:
-            raise ArrestedException('DBObjectMixin could not find a valid Model.id.')
-
+        idfield = self.get_model_id_field()
         return query.filter(idfield == self.kwargs[self.url_id_param])
 
     def get_object(self):
@@ -208,9 +1167,166 @@ class DBObjectMixin(GetObjectMixin,
         """
 
         query = self.get_query()
-        query = self.filter_by_id(query)
+        if request.method in ('GET', 'HEAD'):
+            # Objects being modified are always fully loaded.
+            query = self.apply_load_only(query)
+
+        query = self.filter_by_id(self.apply_eager_load(query))
         return self.get_result(query)
 
+    def get_etag(self):
+        """Derive the ETag from :attr:`DBObjectMixin.version_column` when it is set.
+
+        :returns: An ETag value or None
+        :rtype: str
+        """
+        if self.version_column is None or self.obj is None:
+            return None
+
+        version = getattr(self.obj, self.version_column)
+        return generate_etag(str(version).encode('utf-8'))
+
+    def get_last_modified(self):
+        """Return the value of :attr:`DBObjectMixin.last_modified_column` when it is
+        set.
+
+        :returns: A datetime or None
+        :rtype: :class:`datetime.datetime`
+        """
+        if self.last_modified_column is None or self.obj is None:
+            return None
+
+        return getattr(self.obj, self.last_modified_column)
+
+    def prefers_minimal_response(self):
+        """Return a boolean indicating if the client sent a ``Prefer: return=minimal``
+        header, asking for a response without a body.
+        """
+        prefer = request.headers.get('Prefer', '')
+        return 'return=minimal' in [
+            token.strip().lower() for token in prefer.split(',')
+        ]
+
+    def get_patch_fields(self):
+        """Return the keys a fast PATCH request is allowed to send.  When the Endpoint
+        has a Kim ``mapper_class`` these are the names of the fields in its
+        ``marshal_role``, otherwise the column attributes of
+        :attr:`DBObjectMixin.model`.
+
+        :returns: set of field names
+        :rtype: set
+        """
+        mapper_class = getattr(self, 'mapper_class', None)
+        if mapper_class is not None:
+            role = getattr(self, 'marshal_role', '__default__')
+            if isinstance(role, str):
+                role = mapper_class.roles.get(role)
+
+            return set(
+                field.name for name, field in mapper_class.fields.items()
+                if role is None or name in role
+            )
+
+        from sqlalchemy import inspect
+
+        return set(attr.key for attr in inspect(self.model).column_attrs)
+
+    def get_patch_values(self, data):
+        """Return the column values set by the marshaled PATCH data as a dictionary
+        suitable for ``Query.update``.  Only column attributes of
+        :attr:`DBObjectMixin.model` are included.
+
+        :param data: The data returned by the request handler.  Either a dictionary or
+            a transient instance of :attr:`DBObjectMixin.model` holding the updated
+            attributes.
+        :returns: dictionary of column names and values
+        :rtype: dict
+        """
+        from sqlalchemy import inspect
+        from sqlalchemy.orm import ColumnProperty
+
+        if isinstance(data, dict):
+            columns = set(attr.key for attr in inspect(self.model).column_attrs)
+            return dict(
+                (key, value) for key, value in data.items() if key in columns
+            )
+
+        state = inspect(data)
+        return dict(
+            (attr.key, attr.value) for attr in state.attrs
+            if attr.history.added and
+            isinstance(state.mapper.attrs[attr.key], ColumnProperty)
+        )
+
+    def handle_fast_patch_request(self):
+        """Apply the PATCH request as a single ``UPDATE`` statement.  The request handler
+        marshals the incoming data with ``obj`` set to None so the existing object is
+        never loaded.  The rowcount of the ``UPDATE`` is used to detect a missing object
+        and requests without any values to update check the object exists instead.
+        Requests sending keys not returned by :meth:`DBObjectMixin.get_patch_fields` are
+        rejected with a 422 error.
+        """
+        self.obj = None
+        self.request = self.get_request_handler()
+        data = self.request.get_request_data()
+        if not isinstance(data, dict):
+            self.return_error(
+                422, payload={'message': 'Invalid or incomplete data provided.'}
+            )
+
+        unknown = set(data) - self.get_patch_fields()
+        if unknown:
+            self.return_error(422, payload={
+                'message': 'Invalid or incomplete data provided.',
+                'errors': dict((key, 'Unknown field.') for key in sorted(unknown))
+            })
+
+        self.request.process(data)
+
+        values = self.get_patch_values(self.request.data)
+        query = self.filter_by_id(self.get_query())
+        session = self.get_db_session()
+        if values:
+            # SQLAlchemy's MySQL dialects enable FOUND_ROWS, so the rowcount is the
+            # number of rows matched rather than changed.
+            found = query.update(values, synchronize_session=False)
+        else:
+            found = session.query(query.exists()).scalar()
+
+        if not found:
+            self.return_error(404)
+
+        self.commit(session)
+        self.invalidate_response_cache()
+        resp = self.make_response('', status=204)
+        resp.headers['Preference-Applied'] = 'return=minimal'
+        return resp
+
+    def handle_patch_request(self):
+        """Handle a PATCH request, using :meth:`handle_fast_patch_request` when
+        :attr:`DBObjectMixin.fast_patch` is enabled and the client does not need the
+        updated object returned.
+        """
+        if self.fast_patch and self.prefers_minimal_response():
+            return self.handle_fast_patch_request()
+
+        return super(DBObjectMixin, self).handle_patch_request()
+
+    def handle_delete_request(self):
+        """Handle a DELETE request.  When :attr:`DBObjectMixin.fast_delete` is enabled
+        the object is deleted with a single statement without loading it first.
+        """
+        if not self.fast_delete:
+            return super(DBObjectMixin, self).handle_delete_request()
+
+        query = self.filter_by_id(self.get_query())
+        if not query.delete(synchronize_session=False):
+            self.return_error(404)
+
+        self.commit(self.get_db_session())
+        self.invalidate_response_cache()
+        return self.delete_request_response()
+
     def update_object(self, obj):
         """Commits changes to an instance back to the database by
         calling :meth:`.DBMixin.save` on the provided object.
@@ -232,4 +1348,147 @@ class DBObjectMixin(GetObjectMixin,
         """
         session = self.get_db_session()
         session.delete(obj)
-        session.commit()
+        self.commit(session)
+
+
+class DBBulkCreateMixin(BulkCreateMixin, DBMixin):
+    """SQLAlchemy bulk create mixin that saves a list of marshaled objects using
+    ``Session.bulk_save_objects`` and a single commit.
+
+    Usage::
+
+        class CharactersImportEndpoint(KimEndpoint, DBBulkCreateMixin):
+
+            url = '/import'
+            mapper_class = CharacterMapper
+    """
+
+    #: Fetch server generated values such as primary keys for the saved objects so
+    #: they can be included in the response.  The objects are then inserted one row
+    #: at a time rather than with a single executemany ``INSERT``.
+    bulk_return_defaults = False
+
+    def save_objects(self, objs):
+        """Save the marshaled objects in a single transaction.
+
+        :param objs: A list of SQLAlchemy objects
+        :returns: The saved objects
+        """
+        if objs:
+            session = self.get_db_session()
+            session.bulk_save_objects(objs, return_defaults=self.bulk_return_defaults)
+            self.commit(session)
+
+        return objs
+
+
+class DBBulkPatchMixin(BulkPatchMixin, DBMixin):
+    """SQLAlchemy bulk update mixin that loads every object being updated with a
+    single query and commits all of the changes in a single transaction.
+
+    Usage::
+
+        class CharactersBulkEndpoint(KimEndpoint, DBBulkPatchMixin):
+
+            url = '/bulk'
+            mapper_class = CharacterMapper
+            model = Character
+
+            def get_query(self):
+                return db.session.query(Character)
+    """
+
+    model = None
+    model_id_param = 'id'
+
+    def get_objects_by_id(self, ids):
+        """Query the objects whose :attr:`model_id_param` is in ``ids``.
+
+        :param ids: A list of ids
+        :returns: A dictionary mapping each id found to its object
+        :rtype: dict
+        """
+        ids = [obj_id for obj_id in ids if obj_id is not None]
+        if not ids:
+            return {}
+
+        idfield = self.get_model_id_field()
+        query = self.apply_eager_load(self.get_query())
+        objs = query.filter(idfield.in_(ids)).all()
+
+        return dict((getattr(obj, self.model_id_param), obj) for obj in objs)
+
+    def normalize_id(self, obj_id):
+        """Convert ``obj_id`` to the type of the model's id column.
+
+        .. seealso::
+            :meth:`DBMixin.coerce_id`
+        """
+        return self.coerce_id(super(DBBulkPatchMixin, self).normalize_id(obj_id))
+
+    def discard_object(self, obj):
+        """Remove ``obj`` from the session so the changes made to it are not committed.
+        """
+        self.get_db_session().expunge(obj)
+
+    def patch_objects(self, objs):
+        """Commit the changes made to the objects.
+
+        :param objs: A list of SQLAlchemy objects
+        :returns: The updated objects
+        """
+        session = self.get_db_session()
+        session.add_all(objs)
+        self.commit(session)
+
+        return objs
+
+
+class DBBulkDeleteMixin(BulkDeleteMixin, DBMixin):
+    """SQLAlchemy bulk delete mixin that removes every object in a list of ids using
+    a single DELETE statement.  Only objects returned by :meth:`DBMixin.get_query`
+    can be deleted.
+
+    Usage::
+
+        class CharactersBulkEndpoint(KimEndpoint, DBBulkDeleteMixin):
+
+            url = '/bulk'
+            model = Character
+
+            def get_query(self):
+                return db.session.query(Character)
+    """
+
+    model = None
+    model_id_param = 'id'
+
+    def delete_objects(self, ids):
+        """Delete the objects whose :attr:`model_id_param` is in ``ids`` and commit.
+
+        :param ids: A list of ids
+        :returns: The ids of the deleted objects
+        :rtype: list
+        """
+        idfield = self.get_model_id_field()
+        found = [
+            row[0] for row in
+            self.get_query().with_entities(idfield).filter(idfield.in_(ids))
+        ]
+
+        session = self.get_db_session()
+        if found:
+            session.query(self.model).filter(idfield.in_(found)).delete(
+                synchronize_session=False
+            )
+        self.commit(session)
+
+        return found
+
+    def normalize_id(self, obj_id):
+        """Convert ``obj_id`` to the type of the model's id column.
+
+        .. seealso::
+            :meth:`DBMixin.coerce_id`
+        """
+        return self.coerce_id(super(DBBulkDeleteMixin, self).normalize_id(obj_id))
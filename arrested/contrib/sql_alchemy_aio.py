@@ -0,0 +1,285 @@
+from flask import request
+
+from arrested.exceptions import ArrestedException
+
+from ..aio import (
+    AsyncGetListMixin, AsyncCreateMixin, AsyncGetObjectMixin,
+    AsyncPutObjectMixin, AsyncPatchObjectMixin, AsyncDeleteObjectMixin, run_async
+)
+from .sql_alchemy import DBMixin
+
+
+__all__ = ['AsyncDBMixin', 'AsyncDBListMixin', 'AsyncDBObjectMixin', 'AsyncDBCreateMixin']
+
+
+class AsyncDBMixin(DBMixin):
+    """Base mixin for the async SQLAlchemy mixins.  Queries are built using SQLAlchemy's
+    :func:`sqlalchemy.select` and executed with an
+    :class:`sqlalchemy.ext.asyncio.AsyncSession`.
+
+    A new session is created from :attr:`AsyncDBMixin.session_factory` for each
+    request and closed once the request has been handled, or once the body has been
+    sent for streamed responses.  Lazy loading is not
+    available with an AsyncSession, so any relationship serialized by the response
+    handler should be declared in :attr:`DBMixin.eager_load`.
+    """
+
+    #: An :class:`sqlalchemy.ext.asyncio.async_sessionmaker` used to create the session
+    #: for each request.
+    session_factory = None
+
+    def get_query(self):
+        """Return an SQLAlchemy Select statement.  Users using this mixin should
+        override this method.
+
+        Useage::
+
+            class MyEndpoint(AsyncEndpoint, AsyncDBObjectMixin):
+
+                def get_query(self):
+                    return select(User).where(User.is_active == true())
+
+        :returns: SQLAlchemy Select object
+        :raises: NotImplementedError
+        """
+        name = self.__class__.__name__
+        raise NotImplementedError('%s must implement get_query method.' % name)
+
+    def get_db_session(self):
+        """Return the AsyncSession used for the current request, creating it with
+        :attr:`AsyncDBMixin.session_factory` the first time it is requested.
+
+        :raises: :class:`arrested.exceptions.ArrestedException`
+        :returns: :class:`sqlalchemy.ext.asyncio.AsyncSession`
+        """
+        session = getattr(self, '_db_session', None)
+        if session is None:
+            if self.session_factory is None:
+                raise ArrestedException(
+                    '%s requires a session_factory.' % self.__class__.__name__
+                )
+            session = self._db_session = self.session_factory()
+
+        return session
+
+    async def close_db_session(self):
+        """Close the session created for the current request.
+        """
+        session = self.__dict__.pop('_db_session', None)
+        if session is not None:
+            await session.close()
+
+    async def commit(self, session):
+        """Commit the changes made to ``session``.  The ``'commit'`` and
+        ``'no_refresh'`` :attr:`DBMixin.commit_policy` options are supported.
+
+        :param session: SQLAlchemy AsyncSession
+        :raises: :class:`arrested.exceptions.ArrestedException`
+        """
+        policy = self.commit_policy
+        if policy == 'commit':
+            await session.commit()
+        elif policy == 'no_refresh':
+            target = session.sync_session
+            expire_on_commit = target.expire_on_commit
+            target.expire_on_commit = False
+            try:
+                await session.commit()
+            finally:
+                target.expire_on_commit = expire_on_commit
+        else:
+            raise ArrestedException('Unsupported async commit_policy: %s' % policy)
+
+    async def save(self, obj):
+        """Add ``obj`` to the AsyncSession and commit the changes back to the database.
+        The object is refreshed when the commit expired it so it can be serialized.
+
+        :param obj: SQLAlchemy object being saved
+        :returns: The saved object
+        """
+        session = self.get_db_session()
+        session.add(obj)
+        await self.commit(session)
+        if obj in session and session.sync_session.expire_on_commit \
+                and self.commit_policy == 'commit':
+            await session.refresh(obj)
+
+        return obj
+
+    async def _handle(self, handler):
+
+        try:
+            resp = await handler()
+        except BaseException:
+            await self.close_db_session()
+            raise
+
+        if getattr(resp, 'is_streamed', False):
+            # The body of a streamed response is produced as it is sent, after the
+            # response has been returned, so the session is closed once it is sent.
+            resp.call_on_close(lambda: run_async(self.close_db_session()))
+        else:
+            await self.close_db_session()
+
+        return resp
+
+
+class AsyncDBListMixin(AsyncGetListMixin, AsyncDBMixin):
+    """Async SQLAlchemy powered list mixin that queries a database to return a list of
+    results for a given endpoint.
+
+    Usage::
+
+        from sqlalchemy import select
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        from arrested.aio import AsyncEndpoint
+        from arrested.contrib.sql_alchemy_aio import AsyncDBListMixin
+
+        Session = async_sessionmaker(create_async_engine('sqlite+aiosqlite://'))
+
+        class CharactersEndpoint(AsyncEndpoint, AsyncDBListMixin):
+
+            name = 'list'
+            session_factory = Session
+
+            def get_query(self):
+
+                return select(Character).order_by(Character.created_at.desc())
+    """
+
+    async def get_result(self, query):
+        """Execute the query and cast the result into a list of objects.
+
+        :param query: SQLAlchemy Select
+        :returns: A list of objects returned by the query
+        """
+        result = await self.get_db_session().execute(query)
+        return result.scalars().all()
+
+    async def get_objects(self):
+        """Implements the GetListMixin interface and awaits
+        :meth:`AsyncDBListMixin.get_result` with the query returned by
+        :meth:`AsyncDBMixin.get_query`.
+
+        :returns: A list of objects
+        """
+        query = self.apply_eager_load(self.apply_load_only(self.get_query()))
+        return await self.get_result(query)
+
+    async def handle_get_request(self):
+
+        return await self._handle(super(AsyncDBListMixin, self).handle_get_request)
+
+
+class AsyncDBCreateMixin(AsyncCreateMixin, AsyncDBMixin):
+    """Async SQLAlchemy create mixin that adds the marshaled object to the AsyncSession
+    and commits it.
+    """
+
+    async def save_object(self, obj):
+        """Add the marshaled object to the session and commit it.
+
+        :param obj: The SQLAlchemy instance being created
+        :returns: The saved object
+        """
+        return await self.save(obj)
+
+    async def handle_post_request(self):
+
+        return await self._handle(super(AsyncDBCreateMixin, self).handle_post_request)
+
+
+class AsyncDBObjectMixin(AsyncGetObjectMixin,
+                         AsyncPutObjectMixin,
+                         AsyncPatchObjectMixin,
+                         AsyncDeleteObjectMixin,
+                         AsyncDBMixin):
+    """Async SQLAlchemy powered object mixin that queries a database to return a single
+    object, typically by primary key, for a given endpoint.
+
+    Usage::
+
+        class CharacterObjectEndpoint(AsyncEndpoint, AsyncDBObjectMixin):
+
+            url = '/<int:obj_id>'
+            name = 'object'
+            model = Character
+            session_factory = Session
+
+            def get_query(self):
+
+                return select(Character)
+    """
+
+    model = None
+    url_id_param = 'obj_id'
+    model_id_param = 'id'
+
+    def filter_by_id(self, query):
+        """Apply the primary key filter to query to filter the results for a specific
+        instance by id.
+
+        :param query: SQLAlchemy Select
+        :returns: SQLAlchemy Select
+        """
+        idfield = self.get_model_id_field()
+        return query.where(idfield == self.kwargs[self.url_id_param])
+
+    async def get_result(self, query):
+        """Execute the query and return a single object or None.
+
+        :param query: SQLAlchemy Select
+        :returns: An object returned by the query or None
+        """
+        result = await self.get_db_session().execute(query)
+        return result.scalars().one_or_none()
+
+    async def get_object(self):
+        """Implements the ObjectMixin interface, awaiting
+        :meth:`AsyncDBObjectMixin.get_result` with the query returned by
+        :meth:`AsyncDBMixin.get_query` filtered by :meth:`filter_by_id`.
+
+        :returns: An object or None
+        """
+        query = self.get_query()
+        if request.method in ('GET', 'HEAD'):
+            query = self.apply_load_only(query)
+
+        query = self.filter_by_id(self.apply_eager_load(query))
+        return await self.get_result(query)
+
+    async def update_object(self, obj):
+        """Commits changes to an instance back to the database.
+        """
+        return await self.save(obj)
+
+    async def patch_object(self, obj):
+        """Commits changes to an instance back to the database.
+        """
+        return await self.save(obj)
+
+    async def delete_object(self, obj):
+        """Deletes an object and commits the changes to the database.
+
+        :param obj: The SQLAlchemy instance being deleted
+        """
+        session = self.get_db_session()
+        await session.delete(obj)
+        await self.commit(session)
+
+    async def handle_get_request(self):
+
+        return await self._handle(super(AsyncDBObjectMixin, self).handle_get_request)
+
+    async def handle_put_request(self):
+
+        return await self._handle(super(AsyncDBObjectMixin, self).handle_put_request)
+
+    async def handle_patch_request(self):
+
+        return await self._handle(super(AsyncDBObjectMixin, self).handle_patch_request)
+
+    async def handle_delete_request(self):
+
+        return await self._handle(super(AsyncDBObjectMixin, self).handle_delete_request)
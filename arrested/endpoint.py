@@ -1,15 +1,90 @@
-import json
-from werkzeug.wrappers import Response
+from contextlib import contextmanager
 
-from itertools import chain
+from werkzeug.wrappers import Response
 
 from flask import Response, abort, request, current_app
 from flask.views import MethodView
 
 from .handlers import ResponseHandler, RequestHandler
+from .hooks import HookList, get_hooks_generation, invalidate_hook_chains
+from .instrumentation import timed
+from .json_backends import get_json_backend
+
+
+__all__ = ['Endpoint', 'EndpointType']
+
+
+def _allowed_methods(methods):
+    return frozenset(meth.lower() for meth in methods or [])
+
+
+def _inherit(value, resource, name):
+    """Return ``value`` or, when it is None, the attribute ``name`` of ``resource`` or
+    the :class:`arrested.ArrestedAPI` it is registered on.
+    """
+    if value is None and resource is not None:
+        value = getattr(resource, name, None)
+        if value is None:
+            value = getattr(getattr(resource, 'api', None), name, None)
+
+    return value
+
+
+def _build_hook_chain(source, resource, meth):
+
+    api = getattr(resource, 'api', None)
+    before = []
+    after = []
+
+    if api is not None:
+        before.extend(api.before_all_hooks)
+    if resource is not None:
+        before.extend(resource.before_all_hooks)
+
+    before.extend(source.before_all_hooks)
+    before.extend(getattr(source, 'before_{method}_hooks'.format(method=meth), []))
 
+    after.extend(getattr(source, 'after_{method}_hooks'.format(method=meth), []))
+    after.extend(source.after_all_hooks)
 
-class Endpoint(MethodView):
+    if resource is not None:
+        after.extend(resource.after_all_hooks)
+    if api is not None:
+        after.extend(api.after_all_hooks)
+
+    return tuple(before), tuple(after)
+
+
+class EndpointType(type(MethodView)):
+    """Metaclass for :class:`Endpoint` that stores every ``*_hooks`` attribute as a
+    :class:`arrested.hooks.HookList` and invalidates compiled hook chains whenever a
+    hook attribute is re-assigned on an Endpoint class.  The set of methods permitted
+    by :attr:`Endpoint.methods` is also precomputed for each Endpoint class.
+    """
+
+    def __init__(cls, name, bases, attrs):
+        super(EndpointType, cls).__init__(name, bases, attrs)
+        for key, value in attrs.items():
+            if key.endswith('_hooks') and isinstance(value, list) \
+                    and not isinstance(value, HookList):
+                type.__setattr__(cls, key, HookList(value))
+
+        type.__setattr__(
+            cls, '_allowed_methods', _allowed_methods(getattr(cls, 'methods', None))
+        )
+
+    def __setattr__(cls, key, value):
+        if key.endswith('_hooks') and isinstance(value, list):
+            value = HookList(value)
+            invalidate_hook_chains()
+
+        super(EndpointType, cls).__setattr__(key, value)
+
+        if key == 'methods':
+            type.__setattr__(cls, '_allowed_methods', _allowed_methods(value))
+
+
+class Endpoint(EndpointType('EndpointBase', (MethodView, ), {})):
     """The Endpoint class represents the HTTP methods that can be called against an
     Endpoint inside of a particular resource.
     """
@@ -66,32 +141,155 @@ class Endpoint(MethodView):
     #: A list of functions called after all requests are dispatched
     after_all_hooks = []
 
-    def process_before_request_hooks(self):
-        """Process the list of before_{method}_hooks and the before_all_hooks. The hooks
-        will be processed in the following order
+    #: The :class:`arrested.Resource` this Endpoint was registered against
+    resource = None
+
+    #: The name of the :class:`arrested.json_backends.JSONBackend` used to encode and
+    #: decode JSON for this endpoint.  Defaults to the backend configured on the
+    #: :class:`arrested.Resource` or :class:`arrested.ArrestedAPI`.
+    json_backend = None
+
+    #: An :class:`arrested.instrumentation.Instrumentation` recording the time spent in
+    #: each phase of handling requests.  Defaults to the instrumentation configured on
+    #: the :class:`arrested.Resource` or :class:`arrested.ArrestedAPI`.
+    instrumentation = None
+
+    #: The :class:`arrested.instrumentation.RequestTimings` of the current request or
+    #: None when the Endpoint isn't instrumented.
+    timings = None
+
+    #: Handler params cached for the current request.  See
+    #: :meth:`Endpoint.reset_handler_params`.
+    _handler_params = None
+
+    def __init__(self, resource=None):
+        """Create a new Endpoint instance.  Endpoints are instantiated by Flask for
+        each request they handle.
+
+        :param resource: The :class:`arrested.Resource` this Endpoint was registered
+            against.  :meth:`arrested.Resource.add_endpoint` binds the Resource to the
+            view function so it does not need to be looked up for each request.
+            Subclasses overriding ``__init__`` without accepting ``resource`` still
+            work, the Resource is then looked up when the request is dispatched.
+        """
+        if resource is not None:
+            self.resource = resource
+
+    @classmethod
+    def build_hook_chain(cls, resource, meth):
+        """Build the before and after hook chains for requests of type ``meth``
+        dispatched to this Endpoint via ``resource``.  The before hooks are ordered
 
         1 - any before_all_hooks defined on the :class:`arrested.ArrestedAPI` object
         2 - any before_all_hooks defined on the :class:`arrested.Resource` object
         3 - any before_all_hooks defined on the :class:`arrested.Endpoint` object
         4 - any before_{method}_hooks defined on the :class:`arrested.Endpoint` object
+
+        and the after hooks are ordered
+
+        1 - any after_{method}_hooks defined on the :class:`arrested.Endpoint` object
+        2 - any after_all_hooks defined on the :class:`arrested.Endpoint` object
+        3 - any after_all_hooks defined on the :class:`arrested.Resource` object
+        4 - any after_all_hooks defined on the :class:`arrested.ArrestedAPI` object
+
+        :param resource: The :class:`arrested.Resource` handling the request or None.
+        :param meth: The lower cased HTTP method.
+        :returns: A tuple containing the before hooks and the after hooks.
+        :rtype: tuple
         """
+        return _build_hook_chain(cls, resource, meth)
 
-        hooks = []
+    @classmethod
+    def get_hook_chain(cls, resource, meth):
+        """Return the compiled hook chain for requests of type ``meth`` dispatched to
+        this Endpoint via ``resource``, building it on first use.  Compiled chains are
+        discarded whenever any hooks are changed.
+
+        :param resource: The :class:`arrested.Resource` handling the request or None.
+        :param meth: The lower cased HTTP method.
+        :returns: A tuple containing the before hooks and the after hooks.
+        :rtype: tuple
+
+        .. seealso::
+            :meth:`Endpoint.build_hook_chain`
+        """
+        generation = get_hooks_generation()
+        compiled = cls.__dict__.get('_hook_chains')
+        if compiled is None or compiled[0] != generation:
+            compiled = (generation, {})
+            cls._hook_chains = compiled
+
+        chains = compiled[1]
+        key = (resource, meth)
+        try:
+            return chains[key]
+        except KeyError:
+            chain = chains[key] = cls.build_hook_chain(resource, meth)
+            return chain
 
-        if self.resource:
-            hooks.extend(self.resource.api.before_all_hooks)
-            hooks.extend(self.resource.before_all_hooks)
+    @classmethod
+    def compile_hooks(cls, resource=None):
+        """Compile the hook chains for each of the :attr:`Endpoint.methods` ahead of
+        time so that dispatching a request does not need to build them.  This is called
+        automatically when an Endpoint is registered against a :class:`.Resource`.
 
-        hooks.extend(self.before_all_hooks)
-        hooks.extend(
-            getattr(
-                self,
-                'before_{method}_hooks'.format(method=self.meth),
-                []
-            )
-        )
+        :param resource: The :class:`arrested.Resource` this Endpoint is registered on.
+        """
+        for meth in cls.methods:
+            cls.get_hook_chain(resource, meth.lower())
+
+    def get_request_hook_chain(self):
+        """Return the hook chain for the request being dispatched.  The chain compiled
+        for the Endpoint class is used unless hooks have been assigned to this instance,
+        for example ``self.before_get_hooks = [...]`` in ``__init__``, in which case the
+        chain is built for this instance on every request so the assigned hooks are
+        honoured.
+
+        :returns: A tuple containing the before hooks and the after hooks.
+        :rtype: tuple
+        """
+        for key in self.__dict__:
+            if key.endswith('_hooks'):
+                return _build_hook_chain(self, self.resource, self.meth)
+
+        return self.get_hook_chain(self.resource, self.meth)
+
+    @classmethod
+    def warmup(cls, resource=None):
+        """Resolve and prime the class level state this Endpoint needs to handle
+        requests so that the work isn't repeated by the first request served by each
+        worker process.  The hook chains are compiled, the JSON backend is loaded and
+        :meth:`arrested.handlers.Handler.warmup` is called for the response and request
+        handler classes that define it.  Mixins defining a ``warmup`` classmethod are warmed up too.
+        The Endpoint is not instantiated.
+
+        Called for every registered Endpoint by :meth:`arrested.Resource.warmup`.
+
+        :param resource: The :class:`arrested.Resource` this Endpoint is registered on.
+        """
+        cls.compile_hooks(resource)
+        get_json_backend(_inherit(cls.json_backend, resource, 'json_backend'))
+
+        for handler in (cls.response_handler, cls.request_handler):
+            warmup = getattr(handler, 'warmup', None)
+            if warmup is not None:
+                warmup(cls)
+
+        warmup = getattr(super(Endpoint, cls), 'warmup', None)
+        if warmup is not None:
+            warmup(resource)
+
+    def process_before_request_hooks(self):
+        """Process the list of before_{method}_hooks and the before_all_hooks. The hooks
+        will be processed in the following order
 
-        for hook in chain(hooks):
+        1 - any before_all_hooks defined on the :class:`arrested.ArrestedAPI` object
+        2 - any before_all_hooks defined on the :class:`arrested.Resource` object
+        3 - any before_all_hooks defined on the :class:`arrested.Endpoint` object
+        4 - any before_{method}_hooks defined on the :class:`arrested.Endpoint` object
+        """
+
+        for hook in self.get_request_hook_chain()[0]:
             hook(self)
 
     def process_after_request_hooks(self, resp):
@@ -104,36 +302,39 @@ class Endpoint(MethodView):
         4 - any after_all_hooks defined on the :class:`arrested.ArrestedAPI` object
         """
 
-        hooks = []
-        meth_hooks = getattr(
-            self,
-            'after_{method}_hooks'.format(method=self.meth),
-            []
-        )
-
-        hooks.extend(meth_hooks)
-        hooks.extend(self.after_all_hooks)
-
-        if self.resource:
-            hooks.extend(self.resource.after_all_hooks)
-            hooks.extend(self.resource.api.after_all_hooks)
-
-        for hook in chain(hooks):
+        for hook in self.get_request_hook_chain()[1]:
             resp = hook(self, resp)
 
         return resp
 
-    def dispatch_request(self, *args, **kwargs):
-        """Dispatch the incoming HTTP request to the appropriate handler.
-        """
+    def _prepare_dispatch(self, args, kwargs):
+
         self.args = args
         self.kwargs = kwargs
         self.meth = request.method.lower()
-        self.resource = current_app.blueprints.get(request.blueprint, None)
+        self.reset_handler_params()
+        if self.resource is None:
+            self.resource = current_app.blueprints.get(request.blueprint, None)
 
-        if not any([self.meth in self.methods, self.meth.upper() in self.methods]):
+        if self.meth not in self._allowed_methods:
             return self.return_error(405)
 
+        instrumentation = self.get_instrumentation()
+        if instrumentation is not None:
+            self.timings = instrumentation.start(
+                request.endpoint or self.get_name(), self.meth
+            )
+
+    def dispatch_request(self, *args, **kwargs):
+        """Dispatch the incoming HTTP request to the appropriate handler.
+        """
+        error = self._prepare_dispatch(args, kwargs)
+        if error is not None:
+            return error
+
+        if self.timings is not None:
+            return self._dispatch_instrumented(args, kwargs)
+
         self.process_before_request_hooks()
 
         resp = super(Endpoint, self).dispatch_request(*args, **kwargs)
@@ -143,6 +344,62 @@ class Endpoint(MethodView):
 
         return resp
 
+    def _dispatch_instrumented(self, args, kwargs):
+
+        with self._recording_timings():
+            with timed(self, 'before_hooks'):
+                self.process_before_request_hooks()
+
+            with timed(self, 'dispatch'):
+                resp = super(Endpoint, self).dispatch_request(*args, **kwargs)
+                resp = self.make_response(resp)
+
+            with timed(self, 'after_hooks'):
+                resp = self.process_after_request_hooks(resp)
+
+        return self._finish_timings(resp)
+
+    @contextmanager
+    def _recording_timings(self):
+        """Record the timings of an instrumented request that raises an exception
+        before re-raising it.
+        """
+        try:
+            yield
+        except Exception:
+            self._finish_timings()
+            raise
+
+    def _finish_timings(self, resp=None):
+        """Record the timings of an instrumented request and return ``resp``.
+        """
+        if self.timings is not None:
+            return self.timings.finish(resp)
+
+        return resp
+
+    def get_instrumentation(self):
+        """Return the :class:`arrested.instrumentation.Instrumentation` used by this
+        Endpoint.  The first ``instrumentation`` defined on the Endpoint, its
+        :class:`.Resource` or the :class:`.ArrestedAPI` is used.
+
+        :returns: An Instrumentation instance or None when requests aren't timed.
+        :rtype: :class:`arrested.instrumentation.Instrumentation`
+        """
+        return _inherit(self.instrumentation, self.resource, 'instrumentation')
+
+    def get_json_backend(self):
+        """Return the :class:`arrested.json_backends.JSONBackend` used by this Endpoint.
+        The first ``json_backend`` defined on the Endpoint, its :class:`.Resource` or
+        the :class:`.ArrestedAPI` is used, falling back to the standard library json
+        module.
+
+        :returns: A JSON backend instance.
+        :rtype: :class:`arrested.json_backends.JSONBackend`
+        """
+        backend = _inherit(self.json_backend, self.resource, 'json_backend')
+        return get_json_backend(backend)
+
     @classmethod
     def get_name(cls):
         """Returns the user provided name or the lower() class name for use when
@@ -195,7 +452,7 @@ class Endpoint(MethodView):
             'Please define a response_handler ' \
             ' for Endpoint: %s' % self.__class__.__name__
 
-        return self.response_handler(self, **self.get_response_handler_params())
+        return self.response_handler(self, **self.response_handler_params)
 
     def get_request_handler_params(self, **params):
         """Return a dictionary of options that are passed to the
@@ -216,7 +473,46 @@ class Endpoint(MethodView):
             'Please define a request_handler ' \
             ' for Endpoint: %s' % self.__class__.__name__
 
-        return self.request_handler(self, **self.get_request_handler_params())
+        return self.request_handler(self, **self.request_handler_params)
+
+    def reset_handler_params(self):
+        """Clear the handler params cached for the current request.  Called at the start
+        of every request and whenever state read by :meth:`get_request_handler_params`
+        or :meth:`get_response_handler_params`, such as ``obj``, changes mid request.
+        """
+        self._handler_params = {}
+
+    def _get_handler_params(self, key, getter):
+
+        cache = self._handler_params
+        if cache is None:
+            cache = self._handler_params = {}
+
+        try:
+            return cache[key]
+        except KeyError:
+            params = cache[key] = getter()
+            return params
+
+    @property
+    def request_handler_params(self):
+        """The options returned by :meth:`get_request_handler_params`.  They are
+        computed once per request and shared by everything that needs them, such as the
+        :class:`RequestHandler` and the :class:`ResponseHandler` params of marshal
+        requests.  Treat the returned dictionary as read only.
+
+        :rtype: dict
+        """
+        return self._get_handler_params('request', self.get_request_handler_params)
+
+    @property
+    def response_handler_params(self):
+        """The options returned by :meth:`get_response_handler_params`, computed once
+        per request.  Treat the returned dictionary as read only.
+
+        :rtype: dict
+        """
+        return self._get_handler_params('response', self.get_response_handler_params)
 
     def return_error(self, status, payload=None):
         """Error handler called by request handlers when an error occurs and the request
@@ -236,7 +532,7 @@ class Endpoint(MethodView):
         """
         resp = None
         if payload is not None:
-            payload = json.dumps(payload)
+            payload = self.get_json_backend().dumps(payload)
             resp = self.make_response(payload, status=status)
 
         if status in [405]:
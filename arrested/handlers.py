@@ -1,7 +1,7 @@
-import json
-
 from flask import request
-from werkzeug.exceptions import BadRequest
+
+from .instrumentation import timed
+from .json_backends import get_json_backend
 
 
 __all__ = [
@@ -12,13 +12,19 @@ __all__ = [
 
 class Handler(object):
 
-    def __init__(self, endpoint, payload_key='payload', **params):
+    #: The name of the phase :meth:`Handler.process` is timed as when the Endpoint is
+    #: instrumented.
+    timing_phase = 'handler'
+
+    def __init__(self, endpoint, payload_key='payload', meta_key='meta', **params):
 
         self.endpoint = endpoint
         self.params = params
         self.data = None
+        self.meta = None
         self._errors = None
         self.payload_key = payload_key
+        self.meta_key = meta_key
 
     def handle(self, data, **kwargs):
         """Invoke the handler to process the provided data.  Concrete classes
@@ -69,14 +75,91 @@ class Handler(object):
         .. seealso:
             :meth:`Handler.process`
         """
-        self.data = self.handle(data, **kwargs)
+        with timed(self.endpoint, self.timing_phase):
+            self.data = self.handle(data, **kwargs)
+
         return self
 
+    def handle_iter(self, data, **kwargs):
+        """Lazily invoke the handler for each item in ``data``.  Used when streaming
+        list responses so that items are only processed as the response is written.
+        Concrete classes whose :meth:`Handler.handle` method processes a whole
+        collection at once should override this method to process a single item at
+        a time.
+
+        :param data: An iterable of items to be processed by the Handler.
+        :returns: An iterator over the processed items or None if data is None.
+        :rtype: iterator
+        """
+        if data is None:
+            return None
+
+        return (self.handle(item, **kwargs) for item in data)
+
+    def process_iter(self, data=None, **kwargs):
+        """Process the provided iterable lazily by invoking
+        :meth:`Handler.handle_iter`.  Items are not processed until
+        :attr:`Handler.data` is consumed.
+
+        :params data: An iterable of items being processed.
+        :returns: self
+        :rtype: :class:`Handler`
+
+        .. seealso:
+            :meth:`Handler.process`
+        """
+        self.data = self.handle_iter(data, **kwargs)
+        return self
+
+    @classmethod
+    def warmup(cls, endpoint):
+        """Prime anything this Handler needs before it handles its first request, such
+        as importing libraries or compiling serializers.  Called by
+        :meth:`arrested.Endpoint.warmup` for the Endpoint's handler classes.
+
+        :param endpoint: The :class:`arrested.Endpoint` class using this Handler.
+        """
+        pass
+
+
+class JSONMixin(object):
+    """Provides access to the JSON backend configured for the handler's Endpoint.
+    """
+
+    def get_json_backend(self):
+        """Return the :class:`arrested.json_backends.JSONBackend` configured for the
+        Endpoint using this handler.
 
-class JSONResponseMixin(object):
+        :returns: A JSON backend instance.
+        :rtype: :class:`arrested.json_backends.JSONBackend`
+        """
+        endpoint = getattr(self, 'endpoint', None)
+        if endpoint is not None and hasattr(endpoint, 'get_json_backend'):
+            return endpoint.get_json_backend()
+
+        return get_json_backend()
+
+
+class JSONResponseMixin(JSONMixin):
     """Provides handling for serializing the response data as a JSON string.
     """
 
+    def get_response_envelope(self):
+        """Return the document serialized as the response body.  The response data
+        is stored under the payload_key and, when set, any response metadata such as
+        pagination details is stored under the meta_key.
+
+        :returns: The response document
+        :rtype: dict
+        """
+        envelope = {self.payload_key: self.data}
+
+        meta = getattr(self, 'meta', None)
+        if meta is not None:
+            envelope[self.meta_key] = meta
+
+        return envelope
+
     def get_response_data(self):
         """serialzie the response data and payload_key as a JSON string.
 
@@ -84,24 +167,71 @@ class JSONResponseMixin(object):
         :rtype: bytes
         """
 
-        return json.dumps({self.payload_key: self.data})
+        with timed(getattr(self, 'endpoint', None), 'json_encode'):
+            return self.get_json_backend().dumps(self.get_response_envelope())
+
+    def get_streaming_response_data(self, chunk_size=100):
+        """Serialize the response data and payload_key as a JSON document written in
+        chunks.  :attr:`Handler.data` is consumed lazily so only ``chunk_size`` items
+        are held in memory at a time.
+
+        :param chunk_size: The number of items encoded into each chunk.
+        :returns: A generator yielding the JSON document in chunks
+        :rtype: generator
+        """
+        dumps = self.get_json_backend().dumps
+
+        if self.data is None:
+            yield dumps(self.get_response_envelope())
+            return
+
+        yield b'{' + dumps(self.payload_key) + b': ['
+
+        chunk = []
+        separator = b''
+        for item in self.data:
+            chunk.append(separator)
+            chunk.append(dumps(item))
+            separator = b', '
+            if len(chunk) >= chunk_size * 2:
+                yield b''.join(chunk)
+                chunk = []
+
+        chunk.append(b']')
+
+        meta = getattr(self, 'meta', None)
+        if meta is not None:
+            chunk.extend([b', ', dumps(self.meta_key), b': ', dumps(meta)])
 
+        chunk.append(b'}')
+        yield b''.join(chunk)
 
-class JSONRequestMixin(object):
+
+class JSONRequestMixin(JSONMixin):
     """Provides handling for fetching JSON data from the FLask request object.
     """
 
     def get_request_data(self):
-        """Pull JSON from the Flask request object.
+        """Pull JSON from the Flask request object.  Requests without a body are
+        treated as empty and bodies that aren't sent with a JSON content type or can't
+        be decoded are rejected with a 400 error.
 
         :returns: Deserialized JSON data.
         :rtype: mixed
-        :raises: :class:`flask.exceptions.JSONBadRequest`
+        :raises: :class:`werkzeug.exceptions.BadRequest`
         """
 
+        data = request.get_data(cache=True)
+        if not data:
+            return {}
+
         try:
-            return request.json or {}
-        except BadRequest:
+            if not request.is_json:
+                raise ValueError('Request data is not JSON')
+
+            with timed(getattr(self, 'endpoint', None), 'json_decode'):
+                return self.get_json_backend().loads(data) or {}
+        except ValueError:
             return self.endpoint.return_error(
                 400,
                 payload={'message': 'Invalid JSON data provided'}
@@ -113,6 +243,8 @@ class RequestHandler(Handler, JSONRequestMixin):
     object and return it.
     """
 
+    timing_phase = 'request_handler'
+
     def process(self, data=None):
         """Fetch incoming data from the Flask request object when no data is supplied
         to the process method.  By default, the RequestHandler expects the
@@ -126,4 +258,5 @@ class ResponseHandler(Handler, JSONResponseMixin):
     """Basic default ResponseHanlder that expects the data passed to it to be JSON
     serializable without any modifications.
     """
-    pass
+
+    timing_phase = 'response_handler'
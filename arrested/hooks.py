@@ -0,0 +1,78 @@
+__all__ = ['HookList', 'invalidate_hook_chains']
+
+
+_generation = [0]
+
+
+def get_hooks_generation():
+    """Return the current generation of the hook registry.  The generation is
+    incremented every time a hook list used by Arrested is mutated or replaced.
+
+    :returns: the current hook generation
+    :rtype: int
+    """
+    return _generation[0]
+
+
+def invalidate_hook_chains():
+    """Invalidate every hook chain compiled by :meth:`arrested.Endpoint.compile_hooks`.
+    Chains will be rebuilt the next time they are requested.
+
+    Mutating a :class:`HookList` or re-assigning any of the hook attributes on an
+    :class:`arrested.ArrestedAPI`, :class:`arrested.Resource` or
+    :class:`arrested.Endpoint` calls this function automatically.
+    """
+    _generation[0] += 1
+
+
+def _invalidating(name):
+
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        invalidate_hook_chains()
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class HookList(list):
+    """A list of middleware functions.  Any change made to a HookList invalidates the
+    compiled hook chains of every :class:`arrested.Endpoint` so that the change is
+    picked up by the next request.
+    """
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort',
+              'reverse', '__setitem__', '__delitem__', '__setslice__',
+              '__delslice__', '__iadd__', '__imul__'):
+    if hasattr(list, _name):
+        setattr(HookList, _name, _invalidating(_name))
+
+
+class HookListProperty(object):
+    """Descriptor used by :class:`arrested.ArrestedAPI` and :class:`arrested.Resource`
+    to store hook lists.  Assigned values are converted to a :class:`HookList` and
+    re-assigning the hooks invalidates any compiled hook chains.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, owner):
+        if obj is None:
+            return self
+
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+    def __set__(self, obj, value):
+        replacing = self.name in obj.__dict__
+        obj.__dict__[self.name] = HookList(value or [])
+        if replacing:
+            invalidate_hook_chains()
@@ -0,0 +1,366 @@
+import bisect
+import socket
+import threading
+import time
+
+from collections import OrderedDict
+
+from flask import Response
+
+
+__all__ = [
+    'Instrumentation', 'RequestTimings', 'MetricsSink', 'InMemorySink',
+    'StatsDSink', 'PrometheusSink', 'timed'
+]
+
+
+try:
+    clock = time.perf_counter_ns
+except AttributeError:  # pragma: no cover
+    def clock():
+        return int(time.time() * 1e9)
+
+
+#: The upper bounds, in seconds, of the histogram buckets used by
+#: :class:`InMemorySink` and :class:`PrometheusSink`.
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class _NullTimer(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_null_timer = _NullTimer()
+
+
+class PhaseTimer(object):
+    """Context manager adding the time spent inside the ``with`` block to a phase of a
+    :class:`RequestTimings`.
+    """
+
+    __slots__ = ('timings', 'phase', 'started')
+
+    def __init__(self, timings, phase):
+        self.timings = timings
+        self.phase = phase
+        self.started = None
+
+    def __enter__(self):
+        self.started = clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.phase, clock() - self.started)
+        return False
+
+
+def timed(obj, phase):
+    """Return a context manager timing ``phase`` of the request being handled by
+    ``obj``, an :class:`arrested.Endpoint`.  Nothing is recorded when the Endpoint
+    isn't instrumented.
+
+    Usage::
+
+        def get_objects(self):
+
+            with timed(self, 'search'):
+                return search(request.args['q'])
+
+    :param obj: The Endpoint handling the request
+    :param phase: The name of the phase being timed
+    """
+    timings = getattr(obj, 'timings', None)
+    if timings is None:
+        return _null_timer
+
+    return timings.phase(phase)
+
+
+class RequestTimings(object):
+    """The time spent in each phase of handling a single request.  Durations are
+    measured in nanoseconds using a monotonic clock.  Phases timed more than once
+    during a request, such as the response handler of a bulk request, accumulate.
+    """
+
+    def __init__(self, instrumentation, endpoint, method):
+        self.instrumentation = instrumentation
+        self.endpoint = endpoint
+        self.method = method
+        self.phases = OrderedDict()
+        self.started = clock()
+
+    def phase(self, name):
+        """Return a context manager timing the phase called ``name``.
+
+        :rtype: :class:`PhaseTimer`
+        """
+        return PhaseTimer(self, name)
+
+    def add(self, phase, duration):
+        """Add ``duration`` nanoseconds to ``phase``.
+        """
+        self.phases[phase] = self.phases.get(phase, 0) + duration
+
+    def get_server_timing(self):
+        """Return the value of the ``Server-Timing`` header describing these timings.
+
+        :rtype: str
+        """
+        return ', '.join(
+            '%s;dur=%.3f' % (phase, duration / 1e6)
+            for phase, duration in self.phases.items()
+        )
+
+    def finish(self, response=None):
+        """Record the ``total`` phase and pass the timings to the sinks of the
+        :class:`Instrumentation` that started them.
+
+        :param response: The response returned for the request or None when the request
+            raised an exception.
+        :returns: The response
+        """
+        self.add('total', clock() - self.started)
+        return self.instrumentation.record(self, response)
+
+
+class Instrumentation(object):
+    """Records how long each phase of handling a request takes and passes the timings
+    to one or more :class:`MetricsSink` objects.  Set ``instrumentation`` on an
+    :class:`arrested.ArrestedAPI`, :class:`arrested.Resource` or
+    :class:`arrested.Endpoint` to enable it.
+
+    The phases timed by Arrested are ``before_hooks``, ``dispatch``, ``get_objects``,
+    ``get_object``, ``request_handler``, ``response_handler``, ``json_decode``,
+    ``json_encode``, ``after_hooks`` and ``total``.  Phases are nested, for example
+    ``get_objects`` is part of ``dispatch``.  Additional phases can be timed with
+    :func:`timed`.
+
+    Usage::
+
+        metrics = PrometheusSink()
+        api_v1 = ArrestedAPI(
+            app, instrumentation=Instrumentation([metrics], server_timing=True)
+        )
+        app.add_url_rule('/metrics', view_func=metrics.view)
+
+    :param sinks: A list of :class:`MetricsSink` objects the timings are recorded to.
+    :param server_timing: Add a ``Server-Timing`` header describing the timings to
+        each response.
+    """
+
+    def __init__(self, sinks=None, server_timing=False):
+        self.sinks = list(sinks or [])
+        self.server_timing = server_timing
+
+    def start(self, endpoint, method):
+        """Start timing a request.
+
+        :param endpoint: The name of the endpoint handling the request
+        :param method: The lower cased HTTP method
+        :rtype: :class:`RequestTimings`
+        """
+        return RequestTimings(self, endpoint, method)
+
+    def record(self, timings, response=None):
+        """Pass ``timings`` to each sink and add the ``Server-Timing`` header to
+        ``response`` when enabled.
+
+        :returns: The response
+        """
+        for sink in self.sinks:
+            sink.record(timings)
+
+        if response is not None and self.server_timing:
+            response.headers.add('Server-Timing', timings.get_server_timing())
+
+        return response
+
+
+class MetricsSink(object):
+    """Base class for the destinations :class:`RequestTimings` are recorded to.
+    """
+
+    def record(self, timings):
+        """Record the phases of a :class:`RequestTimings`.
+        """
+        raise NotImplementedError()
+
+
+class Histogram(object):
+    """A histogram of durations, in seconds, with fixed bucket bounds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q):
+        """Return the upper bound of the bucket containing the ``q`` percentile, or
+        infinity when it falls beyond the largest bucket.
+
+        :param q: A percentile between 0 and 100
+        """
+        if not self.count:
+            return None
+
+        target = self.count * q / 100.0
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+
+        return float('inf')
+
+
+class InMemorySink(MetricsSink):
+    """A thread safe sink keeping a :class:`Histogram` of the durations of each phase
+    per endpoint and method in process.
+
+    Usage::
+
+        sink = InMemorySink()
+        ...
+        sink.get_histogram('characters.list', 'get', 'total').percentile(99)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.histograms = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, timings):
+        with self._lock:
+            for phase, duration in timings.phases.items():
+                key = (timings.endpoint, timings.method, phase)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(self.buckets)
+
+                histogram.observe(duration / 1e9)
+
+    def get_histogram(self, endpoint, method, phase):
+        """Return the :class:`Histogram` for ``phase`` of ``method`` requests to
+        ``endpoint`` or None.
+        """
+        return self.histograms.get((endpoint, method, phase))
+
+    def snapshot(self):
+        """Return a summary of every histogram keyed by ``(endpoint, method, phase)``.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(
+                (key, {
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'p50': histogram.percentile(50),
+                    'p99': histogram.percentile(99),
+                })
+                for key, histogram in self.histograms.items()
+            )
+
+    def clear(self):
+        """Remove every recorded histogram.
+        """
+        with self._lock:
+            self.histograms.clear()
+
+
+class PrometheusSink(InMemorySink):
+    """An :class:`InMemorySink` that can be scraped by Prometheus.  The histograms are
+    exposed in the Prometheus text format by :meth:`PrometheusSink.view`.
+
+    Usage::
+
+        metrics = PrometheusSink()
+        app.add_url_rule('/metrics', view_func=metrics.view)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, name='arrested_request_phase_seconds'):
+        super(PrometheusSink, self).__init__(buckets=buckets)
+        self.name = name
+
+    def render(self):
+        """Render the histograms in the Prometheus text exposition format.
+
+        :rtype: str
+        """
+        name = self.name
+        lines = [
+            '# HELP %s Time spent in each phase of handling a request.' % name,
+            '# TYPE %s histogram' % name,
+        ]
+
+        with self._lock:
+            for (endpoint, method, phase), histogram in self.histograms.items():
+                labels = 'endpoint="%s",method="%s",phase="%s"' % (
+                    endpoint, method, phase
+                )
+                seen = 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    seen += count
+                    lines.append('%s_bucket{%s,le="%r"} %d' % (name, labels, bound, seen))
+
+                lines.append(
+                    '%s_bucket{%s,le="+Inf"} %d' % (name, labels, histogram.count)
+                )
+                lines.append('%s_sum{%s} %r' % (name, labels, histogram.sum))
+                lines.append('%s_count{%s} %d' % (name, labels, histogram.count))
+
+        return '\n'.join(lines) + '\n'
+
+    def view(self):
+        """A Flask view function returning :meth:`PrometheusSink.render`.
+        """
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+class StatsDSink(MetricsSink):
+    """Sends the duration of each phase to a StatsD server as a timer over UDP.  Metrics
+    are named ``{prefix}.{endpoint}.{method}.{phase}`` and the phases of each request
+    are sent in a single packet.  Errors sending metrics are ignored.
+
+    Usage::
+
+        sink = StatsDSink('statsd.local', 8125, prefix='starwars')
+    """
+
+    def __init__(self, host='localhost', port=8125, prefix='arrested'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def format(self, timings):
+        """Return the StatsD packet describing ``timings``.
+
+        :rtype: bytes
+        """
+        prefix = '%s.%s.%s' % (self.prefix, timings.endpoint, timings.method)
+        return '\n'.join(
+            '%s.%s:%.3f|ms' % (prefix, phase, duration / 1e6)
+            for phase, duration in timings.phases.items()
+        ).encode('utf-8')
+
+    def record(self, timings):
+        try:
+            self.socket.sendto(self.format(timings), self.address)
+        except (socket.error, OSError):
+            pass
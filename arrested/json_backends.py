@@ -0,0 +1,168 @@
+import json
+
+from .exceptions import ArrestedException
+
+
+__all__ = [
+    'JSONBackend', 'StdlibJSONBackend', 'OrjsonBackend', 'UjsonBackend',
+    'RapidJSONBackend', 'register_json_backend', 'get_json_backend'
+]
+
+
+class JSONBackend(object):
+    """Base class for the JSON libraries used by Arrested to encode responses and
+    decode requests.  Concrete backends should implement :meth:`JSONBackend.dumps`
+    and :meth:`JSONBackend.loads`.
+
+    Constructing a backend should raise ImportError when the library it wraps is
+    not installed.
+    """
+
+    #: The name used to select this backend via the ``json_backend`` option.
+    name = None
+
+    def dumps(self, data):
+        """Serialize ``data`` as JSON.
+
+        :param data: JSON serializable python object.
+        :returns: UTF-8 encoded JSON document.
+        :rtype: bytes
+        """
+        raise NotImplementedError()
+
+    def loads(self, data):
+        """Deserialize a JSON document.
+
+        :param data: A JSON document as bytes or a string.
+        :returns: Deserialized JSON data.
+        :rtype: mixed
+        :raises: ValueError when ``data`` is not a valid JSON document.
+        """
+        raise NotImplementedError()
+
+
+class StdlibJSONBackend(JSONBackend):
+    """JSON backend using the json module from the standard library.  This backend is
+    always available and is used when no other backend is configured.
+    """
+
+    name = 'json'
+
+    def dumps(self, data):
+        return json.dumps(data).encode('utf-8')
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+
+        return json.loads(data)
+
+
+class OrjsonBackend(JSONBackend):
+    """JSON backend using `orjson <https://github.com/ijl/orjson>`_.  orjson encodes
+    directly to bytes and produces compact output.
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class UjsonBackend(JSONBackend):
+    """JSON backend using `ujson <https://github.com/ultrajson/ultrajson>`_.
+    """
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._dumps = ujson.dumps
+        self.loads = ujson.loads
+
+    def dumps(self, data):
+        return self._dumps(data).encode('utf-8')
+
+
+class RapidJSONBackend(JSONBackend):
+    """JSON backend using `python-rapidjson <https://github.com/python-rapidjson>`_.
+    """
+
+    name = 'rapidjson'
+
+    def __init__(self):
+        import rapidjson
+        self._dumps = rapidjson.dumps
+        self.loads = rapidjson.loads
+
+    def dumps(self, data):
+        return self._dumps(data).encode('utf-8')
+
+
+#: Backends tried in order when the ``auto`` backend is requested.
+AUTO_BACKENDS = ['orjson', 'ujson', 'rapidjson']
+
+_registry = {}
+_instances = {}
+
+
+def register_json_backend(backend_class):
+    """Register a :class:`JSONBackend` class so it can be selected by name.
+
+    :param backend_class: A :class:`JSONBackend` subclass with a unique ``name``.
+    :returns: backend_class, allowing this function to be used as a class decorator.
+    """
+    _registry[backend_class.name] = backend_class
+    _instances.pop(backend_class.name, None)
+    return backend_class
+
+
+for _backend in (StdlibJSONBackend, OrjsonBackend, UjsonBackend, RapidJSONBackend):
+    register_json_backend(_backend)
+
+
+def _load_backend(name):
+
+    if name == 'auto':
+        for candidate in AUTO_BACKENDS:
+            backend = _load_backend(candidate)
+            if backend.name == candidate:
+                return backend
+
+        return _load_backend(StdlibJSONBackend.name)
+
+    try:
+        backend_class = _registry[name]
+    except KeyError:
+        raise ArrestedException('Unknown json_backend: %s' % name)
+
+    try:
+        return backend_class()
+    except ImportError:
+        return _load_backend(StdlibJSONBackend.name)
+
+
+def get_json_backend(backend=None):
+    """Return a :class:`JSONBackend` instance.  Backends are instantiated once and
+    reused for every request.
+
+    When the library for the requested backend is not installed the standard library
+    backend is returned instead.  Passing ``'auto'`` selects the fastest installed
+    backend from :data:`AUTO_BACKENDS`.
+
+    :param backend: The name of a registered backend, a :class:`JSONBackend`
+        instance or None for the standard library backend.
+    :returns: A :class:`JSONBackend` instance.
+    :raises: :class:`arrested.ArrestedException` if the backend name is unknown.
+    """
+    if isinstance(backend, JSONBackend):
+        return backend
+
+    name = backend or StdlibJSONBackend.name
+    try:
+        return _instances[name]
+    except KeyError:
+        instance = _instances[name] = _load_backend(name)
+        return instance
@@ -1,31 +1,290 @@
+import hashlib
+import json
+
+from flask import Response, request, stream_with_context
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import generate_etag, is_resource_modified
+
+from .cache import CachedResponse
+from .handlers import ResponseHandler
+from .instrumentation import timed
+
 
 __all__ = [
     'GetListMixin', 'CreateMixin', 'GetObjectMixin', 'PutObjectMixin',
-    'PatchObjectMixin', 'DeleteObjectMixin', 'ObjectMixin'
+    'PatchObjectMixin', 'DeleteObjectMixin', 'ObjectMixin',
+    'BulkCreateMixin', 'BulkPatchMixin', 'BulkDeleteMixin'
 ]
 
 
+_missing = object()
+
+
 class HTTPMixin(object):
     """
     """
 
+    #: Add an ETag to successful GET responses and reply to conditional requests
+    #: using If-None-Match or If-Modified-Since with 304 Not Modified.
+    etags = False
+
+    #: Mark generated ETags as weak validators
+    weak_etags = False
+
+    #: A :class:`arrested.cache.ResponseCache` used to cache successful GET responses.
+    #: Responses are not cached when this is None.
+    response_cache = None
+
+    #: The number of seconds GET responses are cached for
+    response_cache_ttl = 60
+
+    #: Request headers, such as ``Authorization``, whose values vary the response
+    response_cache_vary = []
+
+    #: Request headers carrying credentials.  Responses to requests sending any of
+    #: these headers are only cached when the header is listed in
+    #: :attr:`HTTPMixin.response_cache_vary`.
+    response_cache_credential_headers = ('Authorization', 'Cookie')
+
+    #: Cache responses to requests carrying credentials even when the credentials
+    #: don't vary the response.  Only enable this for Endpoints returning the same
+    #: response to every client.
+    response_cache_credentialed = False
+
+    #: The namespace invalidated when objects are created, updated or deleted.  By
+    #: default every Endpoint registered on the same :class:`arrested.Resource`
+    #: shares a namespace.
+    response_cache_namespace = None
+
+    #: Response headers that are never stored in the response cache
+    response_cache_exclude_headers = ('Content-Length', 'Set-Cookie')
+
+    def get_etag(self):
+        """Return a cheap identifier for the current version of the requested data,
+        such as a version number, or None.  When available, conditional requests are
+        answered before any data is serialized.  Otherwise the ETag is generated by
+        hashing the serialized response body.
+
+        :returns: An ETag value or None
+        :rtype: str
+        """
+        return None
+
+    def get_last_modified(self):
+        """Return the datetime the requested data was last modified, or None.  Used to
+        set the Last-Modified header and answer If-Modified-Since requests.
+
+        :returns: A datetime or None
+        :rtype: :class:`datetime.datetime`
+        """
+        return None
+
+    def _is_conditional(self, status=200):
+        return self.etags and status == 200 and request.method == 'GET'
+
+    def not_modified_response(self):
+        """Return a 304 Not Modified response when the request's preconditions match
+        the values returned by :meth:`HTTPMixin.get_etag` and
+        :meth:`HTTPMixin.get_last_modified`.  Called before any data is serialized.
+
+        :returns: A 304 response or None if the data has to be sent to the client.
+        """
+        if not self._is_conditional():
+            return None
+
+        self._etag = self.get_etag()
+        self._last_modified = self.get_last_modified()
+        if self._etag is None and self._last_modified is None:
+            return None
+
+        if is_resource_modified(request.environ, etag=self._etag,
+                                last_modified=self._last_modified):
+            return None
+
+        response = self.make_response('', status=304)
+        self._set_validators(response, self._etag, self._last_modified)
+        return response
+
+    def _set_validators(self, response, etag, last_modified):
+        if etag is not None:
+            response.set_etag(etag, weak=self.weak_etags)
+        if last_modified is not None:
+            response.last_modified = last_modified
+
+    def get_response_cache_namespace(self):
+        """Return the namespace responses from this Endpoint are cached in.
+
+        :rtype: str
+        """
+        if self.response_cache_namespace is not None:
+            return self.response_cache_namespace
+
+        resource = getattr(self, 'resource', None)
+        if resource is not None:
+            return resource.name
+
+        return self.get_name()
+
+    def get_response_cache_key(self):
+        """Return the key the response to the current request is cached against.  The
+        key is built from the endpoint name, the url kwargs, the query string
+        arguments and the values of the :attr:`HTTPMixin.response_cache_vary`
+        request headers.
+
+        :rtype: str
+        """
+        parts = [
+            request.endpoint or self.get_name(),
+            sorted((key, str(value)) for key, value in getattr(self, 'kwargs', {}).items()),
+            sorted(request.args.items(multi=True)),
+            [request.headers.get(header) for header in self.response_cache_vary],
+        ]
+        digest = hashlib.sha1(json.dumps(parts).encode('utf-8')).hexdigest()
+        namespace = self.get_response_cache_namespace()
+        version = self.response_cache.get_version(namespace)
+
+        return '%s:%s:%s' % (namespace, version, digest)
+
+    def is_response_cacheable(self):
+        """Return True when the response to the current request may be cached.  Only
+        GET requests are cached and requests sending one of the
+        :attr:`HTTPMixin.response_cache_credential_headers` are skipped unless that
+        header is listed in :attr:`HTTPMixin.response_cache_vary` or
+        :attr:`HTTPMixin.response_cache_credentialed` is set.
+
+        :rtype: bool
+        """
+        if self.response_cache is None or request.method != 'GET':
+            return False
+
+        if self.response_cache_credentialed:
+            return True
+
+        vary = set(header.lower() for header in self.response_cache_vary)
+        return not any(
+            header in request.headers
+            for header in self.response_cache_credential_headers
+            if header.lower() not in vary
+        )
+
+    def get_early_response(self):
+        """Return a response that can be sent without fetching or serializing any
+        data.  Either a 304 Not Modified response from
+        :meth:`HTTPMixin.not_modified_response` or a response stored in the
+        :attr:`HTTPMixin.response_cache`.
+
+        :returns: A response object or None
+        """
+        not_modified = self.not_modified_response()
+        if not_modified is not None:
+            return not_modified
+
+        return self.get_cached_response()
+
+    def get_cached_response(self):
+        """Return the cached response for the current GET request or None.
+
+        :returns: A response object or None
+        """
+        if not self.is_response_cacheable():
+            return None
+
+        self._response_cache_key = self.get_response_cache_key()
+        cached = self.response_cache.get(self._response_cache_key)
+        if cached is None:
+            return None
+
+        response = Response(
+            response=cached.body, status=cached.status, headers=cached.headers
+        )
+        if self.etags:
+            response = response.make_conditional(request)
+
+        return response
+
+    def cache_response(self, response):
+        """Store a successful GET response in the :attr:`HTTPMixin.response_cache`.
+        Streamed responses are not cached.
+
+        :param response: The response object being returned.
+        :returns: The response object
+        """
+        key = getattr(self, '_response_cache_key', None)
+        if key is None or response.status_code != 200 or response.is_streamed:
+            return response
+
+        headers = [
+            (name, value) for name, value in response.headers.items()
+            if name not in self.response_cache_exclude_headers
+        ]
+        self.response_cache.set(
+            key,
+            CachedResponse(response.status_code, headers, response.get_data()),
+            self.response_cache_ttl
+        )
+
+        return response
+
+    def invalidate_response_cache(self):
+        """Invalidate every response cached in this Endpoint's namespace.  Called after
+        objects are created, updated or deleted.  Mixins defining an ``after_commit``
+        method, such as :class:`arrested.contrib.sql_alchemy.DBMixin`, delay the
+        invalidation until the changes have been committed.
+        """
+        if self.response_cache is None:
+            return
+
+        cache, namespace = self.response_cache, self.get_response_cache_namespace()
+        after_commit = getattr(self, 'after_commit', None)
+        if after_commit is not None:
+            after_commit(lambda: cache.invalidate(namespace))
+        else:
+            cache.invalidate(namespace)
+
     def _response(self, body, status):
         """
         """
 
-        return (self.make_response(body, status=status))
+        response = self.make_response(body, status=status)
+        if not self._is_conditional(status):
+            return response
+
+        etag = getattr(self, '_etag', None)
+        if etag is None and not response.is_streamed:
+            etag = generate_etag(response.get_data())
+
+        self._set_validators(response, etag, getattr(self, '_last_modified', None))
+        return response.make_conditional(request)
 
 
 class GetListMixin(HTTPMixin):
     """Base ListMixin class that defines the expected API for all ListMixins
     """
 
+    #: Stream the response body rather than serializing every object up front.
+    #: When enabled, :meth:`GetListMixin.get_objects` may return any iterable and
+    #: objects are processed by the response handler as the response is written.
+    stream = False
+
+    #: The number of objects encoded into each chunk of a streamed response
+    stream_chunk_size = 100
+
     def get_objects(self):
         """
         """
 
         raise NotImplementedError()
 
+    def get_list_meta(self):
+        """Return a dictionary of metadata, such as pagination details, included in
+        the list response alongside the serialized objects.  Called after
+        :meth:`GetListMixin.get_objects`.
+
+        :returns: A dictionary of metadata or None to omit it from the response.
+        :rtype: dict
+        """
+        return None
+
     def list_response(self, status=200):
         """Pull the processed data from the response_handler and return a response.
 
@@ -35,6 +294,13 @@ class GetListMixin(HTTPMixin):
             :meth:`Endpoint.make_response`
             :meth:`Endpoint.handle_get_request`
         """
+        if self.stream:
+            data = stream_with_context(
+                self.response.get_streaming_response_data(
+                    chunk_size=self.stream_chunk_size
+                )
+            )
+            return self._response(data, status=status)
 
         return self._response(self.response.get_response_data(), status=status)
 
@@ -42,16 +308,40 @@ class GetListMixin(HTTPMixin):
         """Handle incoming GET request to an Endpoint and return an
         array of results by calling :meth:`.GetListMixin.get_objects`.
 
+        When :attr:`GetListMixin.stream` is enabled the objects are processed lazily
+        by the response handler and the response body is streamed to the client.
+        Note that any error raised while the body is streamed can no longer change
+        the status of the response.
+
         .. seealso::
             :meth:`GetListMixin.get_objects`
             :meth:`Endpoint.get`
         """
-        self.objects = self.get_objects()
+        early = self.get_early_response()
+        if early is not None:
+            return early
+
+        with timed(self, 'get_objects'):
+            self.objects = self.get_objects()
+
+        return self.objects_response()
+
+    def objects_response(self):
+        """Process :attr:`GetListMixin.objects` and the metadata returned by
+        :meth:`GetListMixin.get_list_meta` with the response handler and return the
+        list response, storing it in the response cache.
+
+        :returns: Response object
+        """
         self.response = self.get_response_handler()
+        self.response.meta = self.get_list_meta()
 
-        self.response.process(self.objects)
+        if self.stream:
+            self.response.process_iter(self.objects)
+        else:
+            self.response.process(self.objects)
 
-        return self.list_response()
+        return self.cache_response(self.list_response())
 
 
 class CreateMixin(HTTPMixin):
@@ -89,6 +379,7 @@ class CreateMixin(HTTPMixin):
         self.obj = self.request.process().data
 
         self.save_object(self.obj)
+        self.invalidate_response_cache()
         return self.create_response()
 
 
@@ -98,6 +389,10 @@ class ObjectMixin(object):
 
     allow_none = False
 
+    #: The number of times :meth:`ObjectMixin.get_object` has been called to populate
+    #: :attr:`ObjectMixin.obj`.
+    object_lookups = 0
+
     def get_object(self):
         """Called by :meth:`GetObjectMixin.handle_get_request`.  Concrete classes should
         implement this method and return object typically by id.
@@ -124,15 +419,22 @@ class ObjectMixin(object):
         property called _obj.  This property ensures the logic around allow_none
         is enforced across Endpoints using the Object interface.
 
+        The object is looked up once and cached on the Endpoint for the rest of the
+        request, even when it is None or otherwise falsy.
+
         :raises: :class:`werkzeug.exceptions.BadRequest`
         :returns: The result of :meth:ObjectMixin.get_object`
         """
-        if not getattr(self, '_obj', None):
-            self._obj = self.get_object()
-            if self._obj is None and not self.allow_none:
+        obj = getattr(self, '_obj', _missing)
+        if obj is _missing:
+            with timed(self, 'get_object'):
+                obj = self._obj = self.get_object()
+
+            self.object_lookups += 1
+            if obj is None and not self.allow_none:
                 self.return_error(404)
 
-        return self._obj
+        return obj
 
     @obj.setter
     def obj(self, value):
@@ -140,6 +442,12 @@ class ObjectMixin(object):
         """
         self._obj = value
 
+    def reset_object(self):
+        """Clear the cached object so :meth:`ObjectMixin.get_object` is called again
+        the next time :attr:`ObjectMixin.obj` is accessed.
+        """
+        self._obj = _missing
+
 
 class GetObjectMixin(HTTPMixin, ObjectMixin):
     """Base GetObjectMixins class that defines the expected API for all GetObjectMixins
@@ -153,7 +461,11 @@ class GetObjectMixin(HTTPMixin, ObjectMixin):
             :meth:`GetListMixin.get_objects`
             :meth:`Endpoint.get`
         """
-        return self.object_response()
+        early = self.get_early_response()
+        if early is not None:
+            return early
+
+        return self.cache_response(self.object_response())
 
 
 class PutObjectMixin(HTTPMixin, ObjectMixin):
@@ -180,6 +492,7 @@ class PutObjectMixin(HTTPMixin, ObjectMixin):
         self.request.process()
 
         self.update_object(obj)
+        self.invalidate_response_cache()
         return self.put_request_response()
 
     def update_object(self, obj):
@@ -215,6 +528,7 @@ class PatchObjectMixin(HTTPMixin, ObjectMixin):
         self.request.process()
 
         self.patch_object(obj)
+        self.invalidate_response_cache()
         return self.patch_request_response()
 
     def patch_object(self, obj):
@@ -243,6 +557,7 @@ class DeleteObjectMixin(HTTPMixin, ObjectMixin):
         """
         """
         self.delete_object(self.obj)
+        self.invalidate_response_cache()
         return self.delete_request_response()
 
     def delete_object(self, obj):
@@ -251,3 +566,283 @@ class DeleteObjectMixin(HTTPMixin, ObjectMixin):
         :param obj: The marhsaled object being deleted.
         """
         return obj
+
+
+class BulkMixin(HTTPMixin):
+    """Base class for mixins that create, update or delete many objects in a single
+    request.  Bulk requests accept a JSON array and respond with the status of each
+    item, in the order the items were sent::
+
+        {"payload": [{"status": 200, "id": 1, "data": {...}}, {"status": 404, "id": 2}]}
+
+    The response status is 207 Multi-Status when any item was not successful.
+    """
+
+    #: The key identifying each object in the request data and the response
+    bulk_id_key = 'id'
+
+    def get_bulk_data(self, objects=True):
+        """Return the list of items sent in the request body.
+
+        :param objects: Require every item to be a JSON object.  When False every item
+            must be an id.
+        :raises: :class:`werkzeug.exceptions.UnprocessableEntity` when the request body
+            is not a JSON array of objects, or of ids when ``objects`` is False
+        :returns: A list of items
+        :rtype: list
+        """
+        data = self.request.get_request_data()
+        if objects:
+            message = 'Bulk requests require a list of objects'
+            valid = isinstance(data, list) and all(
+                isinstance(item, dict) for item in data
+            )
+        else:
+            message = 'Bulk requests require a list of ids'
+            valid = isinstance(data, list) and not any(
+                isinstance(item, (dict, list)) for item in data
+            )
+
+        if not valid:
+            self.return_error(422, payload={'message': message})
+
+        return data
+
+    def normalize_id(self, obj_id):
+        """Return ``obj_id`` converted to the type the Endpoint's objects are
+        identified by so ids sent as strings match their objects.
+
+        :param obj_id: An id sent in the request
+        :raises: ValueError when ``obj_id`` is not a valid id
+        :returns: The normalized id
+        """
+        if obj_id is None or isinstance(obj_id, (dict, list)):
+            raise ValueError('Invalid id')
+
+        return obj_id
+
+    def get_item_id(self, obj_id):
+        """Return the normalized id or None when ``obj_id`` is not a valid id.
+
+        .. seealso::
+            :meth:`BulkMixin.normalize_id`
+        """
+        try:
+            return self.normalize_id(obj_id)
+        except (ValueError, TypeError, AttributeError):
+            return None
+
+    def get_item_error(self, exc, **result):
+        """Return the result of an item whose processing was aborted by ``exc``, such
+        as the :class:`werkzeug.exceptions.HTTPException` raised by
+        :meth:`arrested.Endpoint.return_error` when an item fails validation.
+
+        :param exc: The HTTPException raised while processing the item.
+        :returns: A dictionary describing the failed item.
+        :rtype: dict
+        """
+        result['status'] = exc.code
+        if exc.response is not None:
+            try:
+                payload = self.get_json_backend().loads(exc.response.get_data())
+            except ValueError:
+                payload = None
+            if isinstance(payload, dict):
+                result.update(payload)
+
+        return result
+
+    def bulk_response(self, results, success_status=200):
+        """Return a response containing the status of each item in the request.
+
+        :param results: A list of dictionaries describing the result of each item.
+        :param success_status: The HTTP status returned when every item succeeded.
+        :returns: Response object
+        """
+        failed = any(result['status'] >= 400 for result in results)
+        data = ResponseHandler(self).process(results).get_response_data()
+
+        return self._response(data, status=207 if failed else success_status)
+
+    def serialize_objects(self, objs):
+        """Serialize each object using the Endpoint's response handler.
+
+        :param objs: A list of objects
+        :returns: A list of serialized objects
+        :rtype: list
+        """
+        return [self.get_response_handler().process(obj).data for obj in objs]
+
+
+class BulkCreateMixin(BulkMixin):
+    """Creates every object in a JSON array using the Endpoint's request handler and
+    saves them with a single call to :meth:`BulkCreateMixin.save_objects`.  Items are
+    marshaled one at a time so items that fail validation are reported with their
+    own status.
+    """
+
+    def save_objects(self, objs):
+        """Called by :meth:`BulkCreateMixin.handle_post_request` after the incoming
+        data has been marshalled by the RequestHandler.
+
+        :param objs: The list of marshaled objects from RequestHandler.
+        """
+        return objs
+
+    def bulk_create_response(self, results, status=201):
+        """Generate the response for a bulk POST request.  Each created object is
+        serialized by the Endpoint's ResponseHandler.
+
+        :param results: A list of dictionaries describing the result of each item.
+        :param status: The HTTP status returned when every item was created.
+        """
+        serialized = iter(self.serialize_objects(self.objs))
+        for result in results:
+            if result['status'] == 201:
+                result['data'] = next(serialized)
+
+        return self.bulk_response(results, success_status=status)
+
+    def handle_post_request(self):
+        """Handle incoming POST request containing a list of objects to create.  Items
+        that fail validation are reported with their own status without aborting the
+        rest of the request.
+
+        .. seealso::
+            :meth:`BulkCreateMixin.save_objects`
+        """
+        self.request = self.get_request_handler()
+        data = self.get_bulk_data()
+
+        results = []
+        self.objs = []
+        for item in data:
+            self.reset_handler_params()
+            self.request = self.get_request_handler()
+            try:
+                self.objs.append(self.request.process(item).data)
+            except HTTPException as exc:
+                results.append(self.get_item_error(exc))
+                continue
+
+            results.append({'status': 201})
+
+        self.save_objects(self.objs)
+        self.invalidate_response_cache()
+        return self.bulk_create_response(results)
+
+
+class BulkPatchMixin(BulkMixin):
+    """Applies partial updates to many existing objects.  Each item in the JSON array
+    must contain the :attr:`BulkMixin.bulk_id_key` of the object being updated.  Items
+    are marshaled onto their existing object one at a time using the Endpoint's
+    request handler, which is able to access the object via ``obj``, and every
+    updated object is saved with a single call to :meth:`BulkPatchMixin.patch_objects`.
+    """
+
+    def get_objects_by_id(self, ids):
+        """Return the existing objects for the ids sent in the request.
+
+        :param ids: A list of ids
+        :returns: A dictionary mapping each id found to its object
+        :rtype: dict
+        :raises: NotImplementedError
+        """
+        raise NotImplementedError()
+
+    def patch_objects(self, objs):
+        """Called by :meth:`BulkPatchMixin.handle_patch_request` after the incoming
+        data has been marshalled onto each object.
+
+        :param objs: The list of updated objects.
+        """
+        return objs
+
+    def discard_object(self, obj):
+        """Called when marshaling an item onto ``obj`` fails so that any changes made
+        to the object before the error was raised are not saved.
+
+        :param obj: The object the item was being marshaled onto.
+        """
+        pass
+
+    def handle_patch_request(self):
+        """Handle incoming PATCH request containing a list of partial updates.  Items
+        with an invalid id or that fail validation are reported with their own status
+        without aborting the rest of the request.
+        """
+        self.request = self.get_request_handler()
+        data = self.get_bulk_data()
+        key = self.bulk_id_key
+        ids = [self.get_item_id(item.get(key)) for item in data]
+        existing = self.get_objects_by_id([obj_id for obj_id in ids if obj_id is not None])
+
+        results = []
+        patched = []
+        for item, obj_id in zip(data, ids):
+            if obj_id is None:
+                results.append({'status': 422, key: item.get(key), 'message': 'Invalid id'})
+                continue
+
+            obj = existing.get(obj_id)
+            if obj is None:
+                results.append({'status': 404, key: item.get(key)})
+                continue
+
+            self.obj = obj
+            self.reset_handler_params()
+            self.request = self.get_request_handler()
+            try:
+                patched.append(self.request.process(item).data)
+            except HTTPException as exc:
+                self.discard_object(obj)
+                results.append(self.get_item_error(exc, **{key: item.get(key)}))
+                continue
+
+            results.append({'status': 200, key: item.get(key)})
+
+        self.patch_objects(patched)
+        self.invalidate_response_cache()
+
+        serialized = iter(self.serialize_objects(patched))
+        for result in results:
+            if result['status'] == 200:
+                result['data'] = next(serialized)
+
+        return self.bulk_response(results)
+
+
+class BulkDeleteMixin(BulkMixin):
+    """Deletes many objects identified by a JSON array of ids.
+    """
+
+    def delete_objects(self, ids):
+        """Called by :meth:`BulkDeleteMixin.handle_delete_request` with the ids sent
+        in the request.  Concrete classes should delete the objects and return the
+        ids of the objects that were deleted.
+
+        :param ids: A list of ids
+        :returns: The ids of the deleted objects
+        :raises: NotImplementedError
+        """
+        raise NotImplementedError()
+
+    def handle_delete_request(self):
+        """Handle incoming DELETE request containing a list of ids to delete.
+        """
+        self.request = self.get_request_handler()
+        data = self.get_bulk_data(objects=False)
+        ids = [self.get_item_id(obj_id) for obj_id in data]
+        valid = [obj_id for obj_id in ids if obj_id is not None]
+        deleted = set(self.delete_objects(valid)) if valid else set()
+        self.invalidate_response_cache()
+
+        key = self.bulk_id_key
+        results = []
+        for sent, obj_id in zip(data, ids):
+            if obj_id is None:
+                results.append({'status': 422, key: sent, 'message': 'Invalid id'})
+            else:
+                results.append({'status': 204 if obj_id in deleted else 404, key: sent})
+
+        return self.bulk_response(results)
@@ -1,17 +1,40 @@
+import inspect
+
 from flask import Blueprint
 
+from .hooks import HookListProperty, invalidate_hook_chains
+
 
 __all__ = ['Resource']
 
 
+def _accepts_resource(endpoint):
+    """Return True when ``endpoint`` can be instantiated with a ``resource`` keyword
+    argument.  Endpoints overriding ``__init__`` without accepting it look up their
+    Resource when a request is dispatched instead.
+    """
+    try:
+        params = inspect.signature(endpoint.__init__).parameters
+    except (AttributeError, TypeError, ValueError):  # pragma: no cover
+        return False
+
+    return 'resource' in params or any(
+        param.kind == param.VAR_KEYWORD for param in params.values()
+    )
+
+
 class Resource(Blueprint):
     """Resource extends Flasks existing Blueprint object and provides some utilty methods
     that make registering :class:`Endpoint` simpler.
     """
 
+    before_all_hooks = HookListProperty('before_all_hooks')
+    after_all_hooks = HookListProperty('after_all_hooks')
+
     def __init__(
             self, name, import_name, api=None, before_all_hooks=None,
-            after_all_hooks=None, *args, **kwargs):
+            after_all_hooks=None, json_backend=None, instrumentation=None,
+            *args, **kwargs):
         """Construct a new Reosurce blueprint.  In addition to the normal Blueprint
         options, Resource accepts kwargs to set request middleware.
 
@@ -20,6 +43,10 @@ class Resource(Blueprint):
             before every request.
         :param after_all_hooks: A list of middleware functions that will be applied
             after every request.
+        :param json_backend: The name of the JSON backend used to encode and decode
+            JSON for every Endpoint registered on this resource.
+        :param instrumentation: An :class:`arrested.instrumentation.Instrumentation`
+            timing the requests handled by every Endpoint registered on this resource.
 
         **Middleware**
 
@@ -62,8 +89,12 @@ class Resource(Blueprint):
 
         """
 
-        self.before_all_hooks = before_all_hooks or []
-        self.after_all_hooks = after_all_hooks or []
+        self.before_all_hooks = before_all_hooks
+        self.after_all_hooks = after_all_hooks
+        self.json_backend = json_backend
+        self.instrumentation = instrumentation
+        self.api = None
+        self.endpoints = []
 
         super(Resource, self).__init__(name, import_name, *args, **kwargs)
         if api is not None:
@@ -73,9 +104,35 @@ class Resource(Blueprint):
         """Registered the instance of :class:`.ArrestedAPI` the :class:`.Resource`
         is being registered against.
 
+        The hook chains of every :class:`.Endpoint` registered on this resource are
+        compiled once the API is known.
+
         :param api: API instance being the resource is being registered against.
         """
-        self.api = api
+        previous, self.api = self.api, api
+        if previous is not None and previous is not api:
+            invalidate_hook_chains()
+
+        self.compile_hooks()
+
+    def compile_hooks(self):
+        """Compile the hook chains for every :class:`.Endpoint` registered against
+        this resource.
+
+        .. seealso::
+            :meth:`arrested.Endpoint.compile_hooks`
+        """
+        for endpoint in self.endpoints:
+            endpoint.compile_hooks(self)
+
+    def warmup(self):
+        """Warm up every :class:`.Endpoint` registered against this resource.
+
+        .. seealso::
+            :meth:`arrested.Endpoint.warmup`
+        """
+        for endpoint in self.endpoints:
+            endpoint.warmup(self)
 
     def add_endpoint(self, endpoint):
         """Register an :class:`.Endpoint` aginst this resource.
@@ -98,7 +155,12 @@ class Resource(Blueprint):
         else:
             url = endpoint.url
 
-        self.add_url_rule(
-            url,
-            view_func=endpoint.as_view(endpoint.get_name()),
-        )
+        if _accepts_resource(endpoint):
+            view_func = endpoint.as_view(endpoint.get_name(), resource=self)
+        else:
+            view_func = endpoint.as_view(endpoint.get_name())
+
+        self.add_url_rule(url, view_func=view_func)
+        self.endpoints.append(endpoint)
+        if self.api is not None:
+            endpoint.compile_hooks(self)
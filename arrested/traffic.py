@@ -0,0 +1,370 @@
+import base64
+import gzip
+import io
+import json
+import random
+import socket
+import threading
+import time
+
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
+from flask import after_this_request, request
+
+try:
+    from http.client import HTTPException
+    from urllib.request import Request, urlopen
+    from urllib.error import HTTPError, URLError
+except ImportError:  # pragma: no cover
+    from httplib import HTTPException
+    from urllib2 import Request, urlopen, HTTPError, URLError
+
+
+__all__ = ['TrafficRecorder', 'TrafficReplayer', 'ReplayReport', 'load_traffic']
+
+
+try:
+    clock = time.perf_counter
+except AttributeError:  # pragma: no cover
+    clock = time.time
+
+
+def _open(path, mode):
+
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, mode + 'b'), encoding='utf-8')
+
+    return io.open(path, mode, encoding='utf-8')
+
+
+def _encode_body(record, body):
+
+    if not body:
+        return
+
+    try:
+        record['body'] = body.decode('utf-8')
+    except UnicodeDecodeError:
+        record['body_b64'] = base64.b64encode(body).decode('ascii')
+
+
+def _decode_body(record):
+
+    if 'body_b64' in record:
+        return base64.b64decode(record['body_b64'])
+
+    body = record.get('body')
+    return body.encode('utf-8') if body is not None else None
+
+
+def load_traffic(path):
+    """Load the requests recorded by a :class:`TrafficRecorder`.
+
+    :param path: The file traffic was recorded to.  Files ending in ``.gz`` are gzip
+        compressed.
+    :returns: A list of recorded requests ordered by the time they were received.
+    :rtype: list
+    """
+    with _open(path, 'r') as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+class TrafficRecorder(object):
+    """Records the requests handled by an :class:`arrested.ArrestedAPI` or
+    :class:`arrested.Resource` to a file, one JSON document per line, so the traffic
+    can later be replayed with :class:`TrafficReplayer`.  The method, path, query
+    string, headers, body, response status and duration of each request are recorded
+    along with the time it was received relative to the first recorded request.
+
+    Usage::
+
+        recorder = TrafficRecorder('/tmp/traffic.jsonl.gz', sample_rate=0.1)
+        recorder.install(api_v1)
+
+    :param path: The file requests are written to.  Paths ending in ``.gz`` are gzip
+        compressed.
+    :param sample_rate: The fraction of requests recorded.
+    :param exclude_headers: Request headers that are never recorded, such as
+        credentials.
+    :param max_body_size: Request bodies larger than this many bytes are not recorded.
+    """
+
+    #: Request headers that are never recorded by default
+    default_exclude_headers = ('Authorization', 'Cookie', 'Content-Length', 'Host')
+
+    def __init__(self, path, sample_rate=1.0, exclude_headers=None,
+                 max_body_size=1024 * 1024):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.exclude_headers = set(
+            header.lower()
+            for header in (exclude_headers or self.default_exclude_headers)
+        )
+        self.max_body_size = max_body_size
+        self.started = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def install(self, target):
+        """Record the requests handled by ``target`` by registering
+        :meth:`TrafficRecorder.before_request` as its first before hook.  The before
+        hook registers :meth:`TrafficRecorder.after_request` with
+        :func:`flask.after_this_request` so requests aborted with an error response,
+        by a hook or the handler, are recorded along with the duration of every other
+        hook.
+
+        :param target: An :class:`arrested.ArrestedAPI` or :class:`arrested.Resource`
+        """
+        target.before_all_hooks.insert(0, self.before_request)
+
+    def before_request(self, endpoint):
+        """Before hook noting the time the request was received.
+        """
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            started = clock()
+            after_this_request(
+                lambda response: self.after_request(started, response)
+            )
+
+    def after_request(self, started, response):
+        """Record the current request once its response, including error responses,
+        has been created.
+
+        :param started: The time the request was received
+        :returns: The response unchanged
+        """
+        self.record(started, clock() - started, response)
+        return response
+
+    def get_record(self, duration, response):
+        """Return the document recorded for the current request.
+
+        :param duration: The number of seconds taken to handle the request
+        :param response: The response returned for the request
+        :rtype: dict
+        """
+        record = OrderedDict([
+            ('endpoint', request.endpoint),
+            ('method', request.method),
+            ('path', request.path),
+            ('query', request.query_string.decode('latin-1')),
+            ('headers', [
+                [key, value] for key, value in request.headers.items()
+                if key.lower() not in self.exclude_headers
+            ]),
+            ('status', response.status_code),
+            ('duration', round(duration, 6)),
+        ])
+
+        length = request.content_length
+        if length is None or length <= self.max_body_size:
+            _encode_body(record, request.get_data(cache=True))
+
+        return record
+
+    def record(self, started, duration, response):
+        """Write the current request to the recording.
+        """
+        record = self.get_record(duration, response)
+
+        with self._lock:
+            if self.started is None:
+                self.started = started
+
+            record['offset'] = round(started - self.started, 6)
+            if self._file is None:
+                self._file = _open(self.path, 'a')
+
+            self._file.write(json.dumps(record, separators=(',', ':')) + u'\n')
+
+    def flush(self):
+        """Flush the recorded requests to the file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """Close the recording.  Requests recorded after it is closed are appended.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ReplayReport(object):
+    """The results of replaying recorded traffic with :class:`TrafficReplayer`.
+    """
+
+    def __init__(self, results, elapsed):
+        #: A list of ``(endpoint, status, latency)`` tuples for each request.  The
+        #: status is None when a response wasn't received.
+        self.results = results
+        #: The number of seconds taken to replay the traffic
+        self.elapsed = elapsed
+
+    @staticmethod
+    def percentile(latencies, q):
+
+        index = int(round((len(latencies) - 1) * q / 100.0))
+        return latencies[index]
+
+    def summarize(self, results):
+
+        latencies = sorted(latency for _, _, latency in results)
+        return OrderedDict([
+            ('requests', len(results)),
+            ('errors', sum(
+                1 for _, status, _ in results if status is None or status >= 500
+            )),
+            ('throughput', len(results) / self.elapsed if self.elapsed else 0),
+            ('p50', self.percentile(latencies, 50)),
+            ('p90', self.percentile(latencies, 90)),
+            ('p99', self.percentile(latencies, 99)),
+            ('max', latencies[-1]),
+        ])
+
+    def summary(self):
+        """Summarize the requests, errors, throughput (requests per second) and
+        latency percentiles (seconds) per endpoint name.  Server errors and requests that
+        didn't receive a response are counted as errors.  The ``'*'`` entry summarizes
+        every request.
+
+        :rtype: dict
+        """
+        endpoints = OrderedDict()
+        for result in self.results:
+            endpoints.setdefault(result[0] or '-', []).append(result)
+
+        summary = OrderedDict(
+            (name, self.summarize(results))
+            for name, results in sorted(endpoints.items())
+        )
+        if self.results:
+            summary['*'] = self.summarize(self.results)
+
+        return summary
+
+    def format(self):
+        """Return the summary as a table.
+
+        :rtype: str
+        """
+        lines = ['%-30s %8s %7s %9s %10s %10s %10s' % (
+            'endpoint', 'requests', 'errors', 'req/s', 'p50 ms', 'p90 ms', 'p99 ms'
+        )]
+        for name, stats in self.summary().items():
+            lines.append('%-30s %8d %7d %9.1f %10.2f %10.2f %10.2f' % (
+                name, stats['requests'], stats['errors'], stats['throughput'],
+                stats['p50'] * 1e3, stats['p90'] * 1e3, stats['p99'] * 1e3
+            ))
+
+        return '\n'.join(lines)
+
+
+class TrafficReplayer(object):
+    """Replays traffic recorded by a :class:`TrafficRecorder` concurrently using a pool
+    of threads, either against a Flask app through the Werkzeug test client or against
+    a running server.
+
+    Usage::
+
+        replayer = TrafficReplayer(app=create_app(), concurrency=16)
+        report = replayer.replay(load_traffic('/tmp/traffic.jsonl.gz'))
+        print(report.format())
+
+    :param app: The Flask app requests are sent to with its test client.
+    :param base_url: The url of a running server requests are sent to, ie
+        ``'http://127.0.0.1:5000'``.  Used when ``app`` isn't given.
+    :param concurrency: The number of threads sending requests.
+    :param speed: Send requests at the times they were recorded, sped up by this
+        factor, so the recorded load shape is reproduced.  Requests are sent as fast as
+        possible when None.
+    """
+
+    def __init__(self, app=None, base_url=None, concurrency=8, speed=None):
+        if app is None and base_url is None:
+            raise ValueError('TrafficReplayer requires an app or a base_url.')
+
+        self.app = app
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.concurrency = concurrency
+        self.speed = speed
+        self._local = threading.local()
+
+    def get_url(self, record):
+
+        url = record['path']
+        if record.get('query'):
+            url = '%s?%s' % (url, record['query'])
+
+        return url
+
+    def send(self, record):
+        """Send a recorded request and return the status of the response, or None
+        when a response wasn't received from the server, ie the connection was refused
+        or timed out.
+
+        :rtype: int
+        """
+        headers = dict(record.get('headers', []))
+        body = _decode_body(record)
+
+        if self.app is not None:
+            client = getattr(self._local, 'client', None)
+            if client is None:
+                client = self._local.client = self.app.test_client()
+
+            resp = client.open(
+                self.get_url(record), method=record['method'], headers=headers,
+                data=body
+            )
+            resp.get_data()
+            return resp.status_code
+
+        req = Request(self.base_url + self.get_url(record), data=body, headers=headers)
+        req.get_method = lambda: record['method']
+        try:
+            resp = urlopen(req)
+        except HTTPError as e:
+            resp = e
+        except (URLError, HTTPException, socket.error):
+            return None
+
+        try:
+            resp.read()
+        except (HTTPException, socket.error):
+            return None
+        finally:
+            resp.close()
+
+        return resp.getcode()
+
+    def replay(self, records):
+        """Replay ``records`` and return a :class:`ReplayReport`.
+
+        :param records: Requests loaded with :func:`load_traffic`
+        :rtype: :class:`ReplayReport`
+        """
+        started = clock()
+
+        def run(record):
+            if self.speed:
+                delay = record.get('offset', 0) / self.speed - (clock() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+            sent = clock()
+            status = self.send(record)
+            return record.get('endpoint'), status, clock() - sent
+
+        pool = ThreadPool(self.concurrency)
+        try:
+            results = pool.map(run, records, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+        return ReplayReport(results, clock() - started)
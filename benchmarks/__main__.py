@@ -0,0 +1,64 @@
+import argparse
+import importlib
+import os
+import pkgutil
+import sys
+
+from . import harness
+
+
+def load_benchmarks():
+    """Import every ``bench_*`` module in the benchmarks package so their benchmarks
+    are registered.
+    """
+    path = os.path.dirname(__file__)
+    for _, name, _ in pkgutil.iter_modules([path]):
+        if name.startswith('bench_'):
+            importlib.import_module('%s.%s' % (__package__, name))
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks', description='Run the Arrested benchmarks.'
+    )
+    parser.add_argument('-k', dest='pattern', help='only run benchmarks matching PATTERN')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1,
+                        help='minimum duration of each round in seconds')
+    parser.add_argument('--save', metavar='NAME',
+                        help='save the results as NAME, ie a baseline')
+    parser.add_argument('--compare', metavar='NAME',
+                        help='compare the results against the saved results NAME')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative change reported as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks')
+    args = parser.parse_args(argv)
+
+    load_benchmarks()
+    benchmarks = harness.get_benchmarks(args.pattern)
+
+    if args.list:
+        for bench in benchmarks:
+            sys.stdout.write(bench.name + '\n')
+        return 0
+
+    results = harness.run(benchmarks, rounds=args.rounds, min_time=args.min_time)
+
+    if args.save:
+        harness.save(results, harness.results_path(args.save))
+
+    if args.compare:
+        baseline = harness.load(harness.results_path(args.compare))
+        rows = harness.compare(baseline, results, threshold=args.threshold)
+        sys.stdout.write('\n')
+        harness.write_comparison(rows)
+        if args.fail_on_regression and any(row[-1] == 'slower' for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
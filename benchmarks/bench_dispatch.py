@@ -0,0 +1,64 @@
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+
+from arrested import ArrestedAPI, Endpoint, GetListMixin, Resource
+
+from .harness import benchmark
+
+
+def noop_hook(endpoint):
+    pass
+
+
+def build_app(endpoint):
+
+    app = Flask(__name__)
+    api = ArrestedAPI(app)
+    resource = Resource('characters', __name__, url_prefix='/characters')
+    resource.add_endpoint(endpoint)
+    api.register_resource(resource)
+
+    return app
+
+
+def in_request(app, path, func, **kwargs):
+    """Push a request context for ``path`` while ``func`` is timed.
+    """
+    ctx = app.test_request_context(path, **kwargs)
+    ctx.push()
+    return func, lambda: ctx.pop()
+
+
+@benchmark('dispatch', params=[0, 5, 20])
+def dispatch(hooks):
+    """Endpoint.dispatch_request with ``hooks`` before_all_hooks for a GET request
+    returning an empty list.
+    """
+    class CharactersEndpoint(Endpoint, GetListMixin):
+
+        name = 'list'
+        before_all_hooks = [noop_hook] * hooks
+
+        def get_objects(self):
+            return []
+
+    app = build_app(CharactersEndpoint)
+    return in_request(app, '/characters', app.view_functions['characters.list'])
+
+
+@benchmark('return_error', params=['abort', 'payload'])
+def return_error(kind):
+    """Endpoint.return_error aborting a request with a 404, optionally encoding a
+    JSON payload.
+    """
+    app = Flask(__name__)
+    endpoint = Endpoint()
+    payload = {'message': 'Not found'} if kind == 'payload' else None
+
+    def func():
+        try:
+            endpoint.return_error(404, payload=payload)
+        except HTTPException:
+            pass
+
+    return in_request(app, '/', func)
@@ -0,0 +1,85 @@
+import json
+
+from flask import Flask
+
+from arrested import Endpoint, RequestHandler, ResponseHandler
+
+from .harness import benchmark
+from .bench_dispatch import in_request
+
+
+SIZES = [1, 100, 10000]
+
+
+def make_characters(count):
+
+    return [
+        {'id': i, 'name': 'Character %s' % i, 'appears_in': [{'name': 'A New Hope'}]}
+        for i in range(count)
+    ]
+
+
+@benchmark('response_handler', params=SIZES)
+def response_handler(count):
+    """ResponseHandler processing and encoding ``count`` objects.
+    """
+    endpoint = Endpoint()
+    data = make_characters(count)
+
+    def func():
+        ResponseHandler(endpoint).process(data).get_response_data()
+
+    return func
+
+
+try:
+    from kim import Mapper, field
+except ImportError:  # pragma: no cover
+    Mapper = None
+
+if Mapper is not None:
+
+    from arrested.contrib.kim_arrested import KimResponseHandler
+
+    class FilmMapper(Mapper):
+
+        __type__ = dict
+
+        name = field.String()
+
+    class CharacterMapper(Mapper):
+
+        __type__ = dict
+
+        id = field.Integer(read_only=True)
+        name = field.String()
+        appears_in = field.Collection(field.Nested(FilmMapper))
+
+    @benchmark('kim_response_handler', params=SIZES)
+    def kim_response_handler(count):
+        """KimResponseHandler serializing and encoding ``count`` objects.
+        """
+        endpoint = Endpoint()
+        data = make_characters(count)
+
+        def func():
+            KimResponseHandler(endpoint, mapper_class=CharacterMapper, many=True) \
+                .process(data).get_response_data()
+
+        return func
+
+
+@benchmark('request_handler', params=[1, 1000, 10000])
+def request_handler(count):
+    """RequestHandler parsing a JSON request body containing ``count`` objects.
+    """
+    app = Flask(__name__)
+    endpoint = Endpoint()
+    body = json.dumps(make_characters(count))
+
+    def func():
+        RequestHandler(endpoint).process()
+
+    return in_request(
+        app, '/', func, method='POST', data=body, content_type='application/json'
+    )
@@ -0,0 +1,367 @@
+"""Benchmarks for the SQLAlchemy contrib mixins backed by a seeded SQLite database.
+
+Each row count is benchmarked in a fresh process so the reported peak RSS reflects
+that database size only.  Run ``python -m benchmarks.db --help`` for the options.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from flask import Flask
+from sqlalchemy import event
+
+from arrested import ArrestedAPI, Endpoint, RequestHandler, ResponseHandler, Resource
+from arrested.contrib.sql_alchemy import DBCreateMixin, DBListMixin, DBObjectMixin
+
+from example.fixtures import seed
+from example.models import Character, db
+
+from . import harness
+
+
+#: The operations benchmarked for each row count
+OPERATIONS = [
+    'list', 'list_offset', 'list_keyset', 'list_stream',
+    'create', 'get', 'put', 'patch', 'delete',
+]
+
+#: Operations that return every row and are skipped above ``--max-list-rows``
+FULL_LIST_OPERATIONS = ('list', 'list_stream')
+
+
+class CharacterResponseHandler(ResponseHandler):
+
+    def handle(self, data, **kwargs):
+
+        def serialize(obj):
+            return {
+                'id': obj.id,
+                'name': obj.name,
+                'created_at': obj.created_at.isoformat()
+            }
+
+        if isinstance(data, list):
+            return [serialize(obj) for obj in data]
+
+        return serialize(data)
+
+    def handle_iter(self, data, **kwargs):
+
+        return (self.handle(obj) for obj in data)
+
+
+class CharacterRequestHandler(RequestHandler):
+
+    def handle(self, data, **kwargs):
+
+        obj = getattr(self.endpoint, '_obj', None) or Character()
+        obj.name = data['name']
+        return obj
+
+
+class BenchmarkDBMixin(object):
+
+    model = Character
+    response_handler = CharacterResponseHandler
+    request_handler = CharacterRequestHandler
+
+    def get_db_session(self):
+        return db.session
+
+    def get_query(self):
+        return db.session.query(Character)
+
+
+class CharactersEndpoint(BenchmarkDBMixin, Endpoint, DBListMixin, DBCreateMixin):
+
+    name = 'list'
+
+    def get_query(self):
+        return db.session.query(Character).order_by(Character.id)
+
+
+class CharactersOffsetEndpoint(CharactersEndpoint):
+
+    name = 'list_offset'
+    url = '/offset'
+    paginate = 'offset'
+
+
+class CharactersKeysetEndpoint(CharactersEndpoint):
+
+    name = 'list_keyset'
+    url = '/keyset'
+    paginate = 'keyset'
+
+
+class CharactersStreamEndpoint(CharactersEndpoint):
+
+    name = 'list_stream'
+    url = '/stream'
+    stream = True
+    yield_per = 1000
+
+
+class CharacterEndpoint(BenchmarkDBMixin, Endpoint, DBObjectMixin):
+
+    name = 'object'
+    url = '/<int:obj_id>'
+
+
+def create_app(uri):
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    api = ArrestedAPI(app)
+    characters = Resource('characters', __name__, url_prefix='/characters')
+    for endpoint in (CharactersEndpoint, CharactersOffsetEndpoint,
+                     CharactersKeysetEndpoint, CharactersStreamEndpoint,
+                     CharacterEndpoint):
+        characters.add_endpoint(endpoint)
+
+    api.register_resource(characters)
+    return app
+
+
+def get_requests(operation, rows, count):
+    """Return ``count`` ``(method, url, body)`` requests for ``operation`` against a
+    database seeded with ``rows`` characters.  Object requests each target a different
+    row spread across the table so they aren't served from a warm page.
+    """
+    step = max(rows // count, 1)
+    ids = [1 + (i * step) % rows for i in range(count)]
+    body = json.dumps({'name': 'Renamed'})
+
+    if operation == 'list':
+        return [('GET', '/characters', None)] * count
+    if operation == 'list_stream':
+        return [('GET', '/characters/stream', None)] * count
+    if operation == 'list_offset':
+        offset = max(rows - CharactersOffsetEndpoint.page_size, 0)
+        return [('GET', '/characters/offset?offset=%s' % offset, None)] * count
+    if operation == 'list_keyset':
+        cursor = CharactersKeysetEndpoint().encode_cursor(
+            max(rows - CharactersKeysetEndpoint.page_size, 0)
+        )
+        return [('GET', '/characters/keyset?cursor=%s' % cursor, None)] * count
+    if operation == 'create':
+        return [('POST', '/characters', body)] * count
+    if operation == 'get':
+        return [('GET', '/characters/%s' % i, None) for i in ids]
+    if operation in ('put', 'patch'):
+        return [(operation.upper(), '/characters/%s' % i, body) for i in ids]
+    if operation == 'delete':
+        return [('DELETE', '/characters/%s' % i, None) for i in ids]
+
+    raise ValueError('Unknown operation %s' % operation)
+
+
+def _send(client, method, url, body):
+
+    resp = client.open(
+        url, method=method, data=body,
+        content_type='application/json' if body is not None else None
+    )
+    resp.get_data()
+    if resp.status_code >= 400:
+        raise RuntimeError('%s %s returned %s' % (method, url, resp.status_code))
+
+
+def measure(app, operation, rows, count):
+    """Send ``count`` requests for ``operation`` and return the latency of each request,
+    the queries issued per request and the peak memory allocated by a single request.
+    """
+    client = app.test_client()
+    queries = [0]
+
+    def count_queries(*args):
+        queries[0] += 1
+
+    with app.app_context():
+        engine = db.engine
+
+    event.listen(engine, 'before_cursor_execute', count_queries)
+    try:
+        requests = get_requests(operation, rows, count + 1)
+        latencies = []
+        for method, url, body in requests[:-1]:
+            started = harness.clock()
+            _send(client, method, url, body)
+            latencies.append(harness.clock() - started)
+
+        query_count = queries[0]
+
+        tracemalloc.start()
+        _send(client, *requests[-1])
+        peak_alloc = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_queries)
+
+    latencies.sort()
+    return {
+        'min': latencies[0],
+        'median': latencies[len(latencies) // 2],
+        'p95': latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+        'max': latencies[-1],
+        'requests': count,
+        'queries': float(query_count) / count,
+        'peak_alloc': peak_alloc,
+    }
+
+
+def get_peak_rss():
+    """Return the peak resident set size of this process in bytes or None.
+    """
+    if resource is None:  # pragma: no cover
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_worker(rows, operations, count, database):
+    """Seed a database with ``rows`` characters and benchmark each operation.  Each
+    operation is run against a freshly seeded database.
+
+    :returns: The results of each operation keyed by ``operation[rows]``
+    :rtype: dict
+    """
+    results = {}
+    for operation in operations:
+        path = None
+        if database == 'file':
+            fd, path = tempfile.mkstemp(suffix='.db')
+            os.close(fd)
+            uri = 'sqlite:///%s' % path
+        else:
+            uri = 'sqlite://'
+
+        app = create_app(uri)
+        try:
+            with app.app_context():
+                db.create_all()
+                seed(db.session, rows)
+
+            started = time.time()
+            result = measure(app, operation, rows, count)
+            result['elapsed'] = time.time() - started
+            result['peak_rss'] = get_peak_rss()
+            results['%s[%s]' % (operation, rows)] = result
+        finally:
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+            if path is not None:
+                os.remove(path)
+
+    return results
+
+
+def format_bytes(value):
+
+    if value is None:
+        return '-'
+
+    for unit in ('B', 'KB', 'MB'):
+        if value < 1024:
+            return '%.0f %s' % (value, unit)
+        value /= 1024.0
+
+    return '%.1f GB' % value
+
+
+def write_results(results, out=sys.stdout):
+
+    out.write('%-24s %11s %11s %8s %11s %11s\n' % (
+        'benchmark', 'median', 'p95', 'queries', 'peak alloc', 'peak rss'
+    ))
+    for name, result in results.items():
+        out.write('%-24s %11s %11s %8.1f %11s %11s\n' % (
+            name, harness.format_time(result['median']),
+            harness.format_time(result['p95']), result['queries'],
+            format_bytes(result['peak_alloc']), format_bytes(result['peak_rss'])
+        ))
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.db',
+        description='Benchmark the SQLAlchemy mixins against a seeded SQLite database.'
+    )
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS,
+                        default=OPERATIONS)
+    parser.add_argument('--requests', type=int, default=20,
+                        help='the number of requests sent for each operation')
+    parser.add_argument('--database', choices=['memory', 'file'], default='memory')
+    parser.add_argument('--max-list-rows', type=int, default=100000,
+                        help='skip unpaginated list operations above this many rows')
+    parser.add_argument('--save', metavar='NAME')
+    parser.add_argument('--compare', metavar='NAME')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        results = run_worker(args.rows[0], args.operations, args.requests, args.database)
+        sys.stdout.write(json.dumps(results))
+        return 0
+
+    results = {}
+    for rows in args.rows:
+        operations = [
+            operation for operation in args.operations
+            if rows <= args.max_list_rows or operation not in FULL_LIST_OPERATIONS
+        ]
+        output = subprocess.check_output([
+            sys.executable, '-m', 'benchmarks.db', '--worker', '--rows', str(rows),
+            '--requests', str(args.requests), '--database', args.database,
+            '--operations'] + operations
+        )
+        results.update(json.loads(output.decode('utf-8')))
+
+    ordered = dict(
+        (name, results[name]) for name in sorted(
+            results, key=lambda name: (int(name.split('[')[1][:-1]),
+                                       OPERATIONS.index(name.split('[')[0]))
+        )
+    )
+    write_results(ordered)
+
+    document = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': harness.get_machine_info(),
+        'database': args.database,
+        'benchmarks': ordered,
+    }
+
+    if args.save:
+        harness.save(document, harness.results_path(args.save))
+
+    if args.compare:
+        baseline = harness.load(harness.results_path(args.compare))
+        sys.stdout.write('\n')
+        harness.write_comparison(
+            harness.compare(baseline, document, threshold=args.threshold)
+        )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
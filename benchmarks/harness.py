@@ -0,0 +1,220 @@
+import json
+import os
+import platform
+import sys
+import time
+
+from collections import OrderedDict
+
+
+__all__ = ['Benchmark', 'benchmark', 'get_benchmarks', 'run', 'compare']
+
+
+try:
+    clock = time.perf_counter
+except AttributeError:  # pragma: no cover
+    clock = time.time
+
+
+#: The directory named results are saved to
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), '.results')
+
+#: Every benchmark registered with :func:`benchmark`, in registration order
+_registry = OrderedDict()
+
+
+class Benchmark(object):
+    """A function timed by the harness.  ``setup`` is called with the benchmark param,
+    if any, and returns the zero argument callable that is timed.  Work done by
+    ``setup``, such as building a Flask app or fixture data, isn't timed.  ``setup``
+    may instead return a ``(callable, teardown)`` tuple, in which case ``teardown`` is
+    called once the benchmark has been timed.
+    """
+
+    def __init__(self, name, setup, param=None, group=None):
+        self.name = name
+        self.setup = setup
+        self.param = param
+        self.group = group or name
+
+    def run(self, rounds=5, min_time=0.1):
+        """Time the benchmark.  The number of loops in each round is calibrated so a
+        round takes at least ``min_time`` seconds.
+
+        :returns: The per call timings, in seconds, of each round.
+        :rtype: dict
+        """
+        func = self.setup() if self.param is None else self.setup(self.param)
+        teardown = None
+        if isinstance(func, tuple):
+            func, teardown = func
+
+        try:
+            loops = 1
+            while True:
+                elapsed = _time_loops(func, loops)
+                if elapsed >= min_time or loops >= 10 ** 7:
+                    break
+                loops *= 10 if elapsed < min_time / 10 else 2
+
+            timings = sorted(_time_loops(func, loops) / loops for _ in range(rounds))
+        finally:
+            if teardown is not None:
+                teardown()
+
+        return {
+            'min': timings[0],
+            'median': timings[len(timings) // 2],
+            'max': timings[-1],
+            'rounds': rounds,
+            'loops': loops,
+        }
+
+
+def _time_loops(func, loops):
+
+    started = clock()
+    for _ in range(loops):
+        func()
+
+    return clock() - started
+
+
+def benchmark(name, params=None):
+    """Register the decorated setup function as one benchmark, or one benchmark per
+    value of ``params``.
+
+    Usage::
+
+        @benchmark('json_dumps', params=[1, 100])
+        def json_dumps(count):
+
+            data = [{'name': 'Obe Wan'}] * count
+            return lambda: json.dumps(data)
+    """
+    def decorator(setup):
+
+        if params is None:
+            _registry[name] = Benchmark(name, setup)
+        else:
+            for param in params:
+                full_name = '%s[%s]' % (name, param)
+                _registry[full_name] = Benchmark(full_name, setup, param, group=name)
+
+        return setup
+
+    return decorator
+
+
+def get_benchmarks(pattern=None):
+    """Return the registered benchmarks whose name contains ``pattern``.
+    """
+    return [
+        bench for name, bench in _registry.items()
+        if pattern is None or pattern in name
+    ]
+
+
+def get_machine_info():
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def run(benchmarks, rounds=5, min_time=0.1, out=sys.stdout):
+    """Run ``benchmarks`` and write a line for each to ``out``.
+
+    :returns: The results document saved by :func:`save`.
+    :rtype: dict
+    """
+    results = OrderedDict()
+    for bench in benchmarks:
+        result = results[bench.name] = bench.run(rounds=rounds, min_time=min_time)
+        out.write('%-45s %12s %12s  (%d x %d)\n' % (
+            bench.name, format_time(result['min']), format_time(result['median']),
+            result['rounds'], result['loops']
+        ))
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': get_machine_info(),
+        'benchmarks': results,
+    }
+
+
+def format_time(seconds):
+
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds >= 1 / scale:
+            return '%.2f %s' % (seconds * scale, unit)
+
+    return '%.0f ns' % (seconds * 1e9)
+
+
+def results_path(name):
+    """Return the path results saved as ``name`` are stored at.  Names ending in
+    ``.json`` are treated as paths.
+    """
+    if name.endswith('.json') or os.sep in name:
+        return name
+
+    return os.path.join(RESULTS_DIR, '%s.json' % name)
+
+
+def save(results, path):
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    with open(path, 'w') as fh:
+        json.dump(results, fh, indent=2)
+
+
+def load(path):
+
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def compare(baseline, current, threshold=0.1):
+    """Compare the median timings of two results documents.
+
+    :param baseline: The results document being compared against
+    :param current: The results document being evaluated
+    :param threshold: The relative change in the median reported as a regression or
+        an improvement
+    :returns: A list of ``(name, baseline median, current median, change, status)``
+        tuples for each benchmark in both documents
+    :rtype: list
+    """
+    rows = []
+    for name, result in current['benchmarks'].items():
+        previous = baseline['benchmarks'].get(name)
+        if previous is None:
+            continue
+
+        change = result['median'] / previous['median'] - 1
+        if change > threshold:
+            status = 'slower'
+        elif change < -threshold:
+            status = 'faster'
+        else:
+            status = ''
+
+        rows.append((name, previous['median'], result['median'], change, status))
+
+    return rows
+
+
+def write_comparison(rows, out=sys.stdout):
+
+    out.write('%-45s %12s %12s %9s\n' % ('benchmark', 'baseline', 'current', 'change'))
+    for name, previous, median, change, status in rows:
+        out.write('%-45s %12s %12s %+8.1f%% %s\n' % (
+            name, format_time(previous), format_time(median), change * 100, status
+        ))
@@ -0,0 +1,98 @@
+"""Replay traffic recorded by :class:`arrested.traffic.TrafficRecorder` against an app.
+Run ``python -m benchmarks.replay --help`` for the options.
+"""
+import argparse
+import importlib
+import sys
+import threading
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from arrested.traffic import TrafficReplayer, load_traffic
+
+
+def import_app(name):
+    """Import a Flask app given as ``module:attribute``.  A callable attribute, such as
+    an app factory, is called to create the app.
+    """
+    module, _, attr = name.partition(':')
+    app = getattr(importlib.import_module(module), attr or 'app')
+    if not hasattr(app, 'wsgi_app') and callable(app):
+        app = app()
+
+    return app
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def serve(app):
+    """Start a threaded local WSGI server for ``app`` and return it.
+    """
+    server = make_server(
+        '127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    return server
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.replay', description='Replay recorded traffic.'
+    )
+    parser.add_argument('path', help='the file traffic was recorded to')
+    parser.add_argument('--app', help='the Flask app to replay against, ie module:app')
+    parser.add_argument('--url', help='the url of a running server to replay against')
+    parser.add_argument('--serve', action='store_true',
+                        help='replay against a local WSGI server running --app')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--speed', type=float,
+                        help='reproduce the recorded timing sped up by this factor')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='replay the recorded traffic this many times')
+    args = parser.parse_args(argv)
+
+    if not args.app and not args.url:
+        parser.error('one of --app or --url is required')
+
+    records = load_traffic(args.path)
+    if args.repeat > 1:
+        duration = max([record.get('offset', 0) for record in records] or [0])
+        records = [
+            dict(record, offset=record.get('offset', 0) + i * duration)
+            for i in range(args.repeat) for record in records
+        ]
+
+    server = None
+    if args.url:
+        replayer = TrafficReplayer(base_url=args.url, concurrency=args.concurrency,
+                                   speed=args.speed)
+    elif args.serve:
+        server = serve(import_app(args.app))
+        replayer = TrafficReplayer(
+            base_url='http://127.0.0.1:%s' % server.server_port,
+            concurrency=args.concurrency, speed=args.speed
+        )
+    else:
+        replayer = TrafficReplayer(app=import_app(args.app),
+                                   concurrency=args.concurrency, speed=args.speed)
+
+    try:
+        report = replayer.replay(records)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    sys.stdout.write(report.format() + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,29 @@
 from datetime import datetime
 
 
+def seed(session, characters, planets=0, batch_size=10000):
+    """Insert ``characters`` Character rows and ``planets`` Planet rows with sequential
+    ids, ``batch_size`` rows at a time.  Used to seed large databases, for example by
+    the database benchmarks.
+    """
+    from example.models import Character, Planet
+    created_at = datetime.utcnow().replace(microsecond=0)
+
+    def insert(table, count, row):
+        for start in range(1, count + 1, batch_size):
+            stop = min(start + batch_size, count + 1)
+            session.execute(table.insert(), [row(i) for i in range(start, stop)])
+
+    insert(Character.__table__, characters, lambda i: {
+        'id': i, 'name': 'Character %s' % i, 'created_at': created_at
+    })
+    insert(Planet.__table__, planets, lambda i: {
+        'id': i, 'name': 'Planet %s' % i, 'description': 'Planet number %s' % i,
+        'created_at': created_at
+    })
+    session.commit()
+
+
 def run():
     from example.app import app
     from example.models import db, Character
@@ -0,0 +1,245 @@
+import asyncio
+import gc
+import json
+import threading
+import time
+
+import pytest
+
+from arrested import ArrestedAPI, Resource, GetListMixin
+from arrested.aio import (
+    AsyncEndpoint, AsyncGetListMixin, AsyncCreateMixin, AsyncGetObjectMixin,
+    AsyncPutObjectMixin, AsyncDeleteObjectMixin, close_event_loop, get_event_loop,
+    maybe_await, run_async
+)
+from arrested.exceptions import ArrestedException
+from arrested.instrumentation import Instrumentation, InMemorySink
+
+
+class AsyncCharactersEndpoint(AsyncEndpoint, AsyncGetListMixin, AsyncCreateMixin):
+
+    name = 'list'
+    saved = []
+
+    async def get_objects(self):
+
+        await asyncio.sleep(0)
+        return [{'name': 'Obe Wan'}]
+
+    async def save_object(self, obj):
+
+        await asyncio.sleep(0)
+        self.saved.append(obj)
+
+
+class AsyncCharacterEndpoint(AsyncEndpoint, AsyncGetObjectMixin,
+                             AsyncPutObjectMixin, AsyncDeleteObjectMixin):
+
+    name = 'object'
+    url = '/<string:obj_id>'
+    characters = {'1': {'name': 'Obe Wan'}}
+
+    async def get_object(self):
+
+        await asyncio.sleep(0)
+        return self.characters.get(self.kwargs['obj_id'])
+
+
+@pytest.fixture
+def async_client(app):
+
+    api = ArrestedAPI(app)
+    resource = Resource('characters', __name__, url_prefix='/characters')
+    resource.add_endpoint(AsyncCharactersEndpoint)
+    resource.add_endpoint(AsyncCharacterEndpoint)
+    api.register_resource(resource, defer=False)
+
+    return app.test_client()
+
+
+def test_run_async():
+
+    async def add(a, b):
+        return a + b
+
+    assert run_async(add(1, 2)) == 3
+
+
+def test_run_async_inside_running_loop(app):
+
+    from flask import request
+
+    async def path():
+        return request.path
+
+    async def nested():
+        return run_async(path())
+
+    with app.test_request_context('/characters'):
+        assert asyncio.run(nested()) == '/characters'
+
+
+def test_event_loop_reused_and_closed():
+
+    loops = []
+
+    def worker():
+        loops.append(get_event_loop())
+        loops.append(get_event_loop())
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    gc.collect()
+
+    assert loops[0] is loops[1]
+    assert loops[0].is_closed()
+
+
+def test_close_event_loop():
+
+    loop = get_event_loop()
+    close_event_loop()
+
+    assert loop.is_closed()
+    assert get_event_loop() is not loop
+
+
+def test_maybe_await():
+
+    async def value():
+        return 'async'
+
+    assert run_async(maybe_await('sync')) == 'sync'
+    assert run_async(maybe_await(value())) == 'async'
+
+
+def test_async_get_list_mixin(async_client):
+
+    resp = async_client.get('/characters')
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': [{'name': 'Obe Wan'}]}
+
+
+def test_async_create_mixin(async_client):
+
+    resp = async_client.post(
+        '/characters', data=json.dumps({'name': 'Yoda'}),
+        headers={'content-type': 'application/json'}
+    )
+
+    assert resp.status_code == 201
+    assert AsyncCharactersEndpoint.saved[-1] == {'name': 'Yoda'}
+
+
+def test_async_get_object_mixin(async_client):
+
+    resp = async_client.get('/characters/1')
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': {'name': 'Obe Wan'}}
+
+
+def test_async_get_object_mixin_not_found(async_client):
+
+    assert async_client.get('/characters/2').status_code == 404
+    assert async_client.delete('/characters/2').status_code == 404
+
+
+def test_async_delete_object_mixin(async_client):
+
+    assert async_client.delete('/characters/1').status_code == 204
+
+
+def test_async_endpoint_method_not_allowed(app):
+
+    class ReadOnlyEndpoint(AsyncEndpoint, AsyncGetListMixin):
+        methods = ['GET']
+
+    app.add_url_rule('/read-only', view_func=ReadOnlyEndpoint.as_view('read_only'),
+                     methods=['GET', 'POST'])
+
+    assert app.test_client().post('/read-only').status_code == 405
+
+
+def test_async_endpoint_hooks(app):
+
+    calls = []
+
+    async def before(endpoint):
+        await asyncio.sleep(0)
+        calls.append('before')
+
+    def after(endpoint, response):
+        calls.append('after')
+        response.headers['X-After'] = 'yes'
+        return response
+
+    class HookedEndpoint(AsyncEndpoint, GetListMixin):
+
+        before_all_hooks = [before]
+        after_all_hooks = [after]
+
+        def get_objects(self):
+            calls.append('get_objects')
+            return []
+
+    app.add_url_rule('/hooked', view_func=HookedEndpoint.as_view('hooked'))
+    resp = app.test_client().get('/hooked')
+
+    assert resp.headers['X-After'] == 'yes'
+    assert calls == ['before', 'get_objects', 'after']
+
+
+def test_async_endpoint_overlaps_io(app):
+
+    class DashboardEndpoint(AsyncEndpoint, AsyncGetListMixin):
+
+        async def get_objects(self):
+
+            async def fetch(name):
+                await asyncio.sleep(0.05)
+                return name
+
+            return await asyncio.gather(fetch('stats'), fetch('alerts'), fetch('news'))
+
+    app.add_url_rule('/dashboard', view_func=DashboardEndpoint.as_view('dashboard'))
+    started = time.time()
+    resp = app.test_client().get('/dashboard')
+
+    assert time.time() - started < 0.14
+    assert json.loads(resp.data.decode('utf-8')) == {
+        'payload': ['stats', 'alerts', 'news']
+    }
+
+
+def test_async_object_mixin_obj_requires_load(app):
+
+    endpoint = AsyncCharacterEndpoint()
+    endpoint.kwargs = {'obj_id': '1'}
+
+    with pytest.raises(ArrestedException):
+        endpoint.obj
+
+    assert run_async(endpoint.load_object()) == {'name': 'Obe Wan'}
+    assert endpoint.obj == {'name': 'Obe Wan'}
+    assert endpoint.object_lookups == 1
+
+
+def test_async_endpoint_instrumentation(app):
+
+    sink = InMemorySink()
+
+    class TimedEndpoint(AsyncEndpoint, AsyncGetListMixin):
+
+        instrumentation = Instrumentation([sink], server_timing=True)
+
+        async def get_objects(self):
+            return []
+
+    app.add_url_rule('/timed', view_func=TimedEndpoint.as_view('timed'))
+    resp = app.test_client().get('/timed')
+
+    assert 'get_objects;dur=' in resp.headers['Server-Timing']
+    assert sink.get_histogram('timed', 'get', 'total').count == 1
@@ -1,6 +1,10 @@
+import pytest
+
 from flask import url_for
+from mock import patch
 
-from arrested import ArrestedAPI, Resource, Endpoint
+from arrested import ArrestedAPI, Resource, Endpoint, StdlibJSONBackend, json_backends
+from arrested.exceptions import ArrestedException
 
 
 def initialise_app_via_constructor(app):
@@ -199,3 +203,132 @@ def test_api_request_middleware_limited_to_api(app, client):
 
     resp = client.get(url_for('example2.test'))
     assert resp.data == b'request'
+
+
+def test_warmup_on_init_app(app):
+    """Test that deferred resources are warmed up when the api is initialised without
+    instantiating their Endpoints.
+    """
+    calls = []
+
+    class WarmupMixin(object):
+
+        @classmethod
+        def warmup(cls, resource=None):
+            calls.append(resource)
+
+    class MyEndpoint(Endpoint, WarmupMixin):
+
+        name = 'test'
+        json_backend = 'json'
+
+        def __init__(self, *args, **kwargs):
+            raise AssertionError('Endpoints are not instantiated by warmup')
+
+    api_v1 = ArrestedAPI()
+    example_resource = Resource('example', __name__, url_prefix='/example')
+    example_resource.add_endpoint(MyEndpoint)
+    api_v1.register_resource(example_resource, defer=True)
+
+    with patch.dict(json_backends._instances, clear=True), \
+            patch.object(MyEndpoint, 'compile_hooks') as compile_mock, \
+            patch.object(app.url_map, 'update') as update_mock:
+        api_v1.init_app(app)
+        assert isinstance(json_backends._instances['json'], StdlibJSONBackend)
+
+    assert calls == [example_resource]
+    compile_mock.assert_called_with(example_resource)
+    assert update_mock.called
+    assert api_v1.resources == [example_resource]
+
+
+def test_warmup_requires_app():
+    """Test that warming up an api that hasn't been initialised raises a clear error.
+    """
+    with pytest.raises(ArrestedException):
+        ArrestedAPI().warmup()
+
+
+def test_warmup_on_register_resource(app):
+    """Test that resources registered after the api is initialised are warmed up.
+    """
+    api_v1 = ArrestedAPI(app)
+    example_resource = Resource('example', __name__, url_prefix='/example')
+
+    class MyEndpoint(Endpoint):
+
+        name = 'test'
+
+    example_resource.add_endpoint(MyEndpoint)
+
+    with patch.object(MyEndpoint, 'warmup') as warmup_mock:
+        api_v1.register_resource(example_resource)
+
+    assert warmup_mock.call_count == 1
+
+
+def test_warmup_disabled(app):
+    """Test that auto_warmup=False leaves warming up to the user.
+    """
+    api_v1 = ArrestedAPI(auto_warmup=False)
+    example_resource = Resource('example', __name__, url_prefix='/example')
+
+    class MyEndpoint(Endpoint):
+
+        name = 'test'
+
+    example_resource.add_endpoint(MyEndpoint)
+    api_v1.register_resource(example_resource, defer=True)
+
+    with patch.object(MyEndpoint, 'warmup') as warmup_mock:
+        api_v1.init_app(app)
+        assert warmup_mock.call_count == 0
+
+        api_v1.warmup()
+        assert warmup_mock.call_count == 1
+
+
+def test_warmup_freeze_gc(app):
+    """Test that the garbage collector is frozen only when warmup is asked to.
+    """
+    with patch('arrested.api.gc') as gc_mock:
+        api_v1 = ArrestedAPI(app)
+        assert not gc_mock.freeze.called
+
+        api_v1.warmup(freeze_gc=True)
+        assert gc_mock.collect.called
+        assert gc_mock.freeze.called
+
+
+def test_warmup_duck_typed_handlers(app):
+    """Test that handlers which don't subclass Handler or define warmup are accepted.
+    """
+
+    class MyResponseHandler(object):
+
+        def __init__(self, endpoint, **params):
+            self.data = None
+
+        def process(self, data=None, **kwargs):
+            self.data = data
+            return self
+
+        def get_response_data(self):
+            return self.data
+
+    class MyEndpoint(Endpoint):
+
+        name = 'test'
+        response_handler = MyResponseHandler
+
+        def get(self, *args, **kwargs):
+            handler = self.get_response_handler().process('request')
+            return self.make_response(handler.get_response_data())
+
+    api_v1 = ArrestedAPI(app)
+    example_resource = Resource('example', __name__, url_prefix='/example')
+    example_resource.add_endpoint(MyEndpoint)
+    api_v1.register_resource(example_resource)
+
+    resp = app.test_client().get('/example')
+    assert resp.data == b'request'
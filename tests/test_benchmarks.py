@@ -0,0 +1,77 @@
+import itertools
+
+from mock import patch
+
+from benchmarks.harness import Benchmark, compare, format_time, run
+
+
+class Output(list):
+
+    def write(self, line):
+        self.append(line)
+
+
+def _results(**medians):
+
+    return {'benchmarks': dict(
+        (name, {'median': median}) for name, median in medians.items()
+    )}
+
+
+def test_benchmark_run():
+
+    calls = []
+
+    def setup(param):
+        return lambda: calls.append(param), lambda: calls.append('teardown')
+
+    result = Benchmark('bench[1]', setup, param=1).run(rounds=3, min_time=0.001)
+
+    assert result['rounds'] == 3
+    assert result['min'] <= result['median'] <= result['max']
+    assert calls[-1] == 'teardown'
+    assert calls.count(1) >= result['loops'] * 3
+
+
+def test_run_writes_results():
+
+    out = Output()
+    results = run([Benchmark('noop', lambda: lambda: None)], rounds=1,
+                  min_time=0.001, out=out)
+
+    assert list(results['benchmarks']) == ['noop']
+    assert out[0].startswith('noop')
+
+
+def test_compare():
+
+    rows = compare(
+        _results(dispatch=1.0, encode=1.0, parse=1.0),
+        _results(dispatch=1.5, encode=0.5, parse=1.05, new=1.0),
+    )
+
+    assert sorted((row[0], row[-1]) for row in rows) == [
+        ('dispatch', 'slower'), ('encode', 'faster'), ('parse', '')
+    ]
+
+
+def test_format_time():
+
+    assert format_time(2.5) == '2.50 s'
+    assert format_time(0.0025) == '2.50 ms'
+    assert format_time(0.0000025) == '2.50 us'
+    assert format_time(0.0000000025) == '2 ns'
+
+
+def test_db_benchmarks_worker():
+
+    from benchmarks.db import run_worker
+
+    # A single request per operation with a stubbed clock, as a smoke test.
+    with patch('benchmarks.harness.clock', side_effect=itertools.count()):
+        results = run_worker(5, ['list_keyset', 'put', 'delete'], 1, 'memory')
+
+    assert sorted(results) == ['delete[5]', 'list_keyset[5]', 'put[5]']
+    assert results['put[5]']['median'] == 1
+    assert results['list_keyset[5]']['queries'] == 1
+    assert results['delete[5]']['peak_alloc'] > 0
@@ -0,0 +1,236 @@
+import json
+import time
+
+from mock import patch
+
+from arrested import ArrestedAPI, Resource
+from arrested.cache import CachedResponse, LRUResponseCache, RedisResponseCache
+
+from tests.endpoints import (
+    CharactersEndpoint, CharacterEndpoint, _get_character_objects
+)
+
+
+class FakeRedis(object):
+    """A local stand in for a redis client implementing get, set and incr.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires < time.time():
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        expires = time.time() + ex if ex is not None else None
+        self.data[key] = (value.encode('utf-8'), expires)
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.data[key] = (str(value).encode('utf-8'), None)
+        return value
+
+
+def test_lru_cache_get_set():
+
+    cache = LRUResponseCache()
+    response = CachedResponse(200, [('Content-Type', 'application/json')], b'{}')
+    assert cache.get('foo') is None
+
+    cache.set('foo', response, ttl=60)
+    assert cache.get('foo') == response
+
+
+def test_lru_cache_expires():
+
+    cache = LRUResponseCache()
+    cache.set('foo', CachedResponse(200, [], b''), ttl=-1)
+    assert cache.get('foo') is None
+
+
+def test_lru_cache_evicts_least_recently_used():
+
+    cache = LRUResponseCache(max_size=2)
+    cache.set('foo', CachedResponse(200, [], b'foo'), ttl=60)
+    cache.set('bar', CachedResponse(200, [], b'bar'), ttl=60)
+    cache.get('foo')
+    cache.set('baz', CachedResponse(200, [], b'baz'), ttl=60)
+
+    assert cache.get('bar') is None
+    assert cache.get('foo').body == b'foo'
+    assert cache.get('baz').body == b'baz'
+
+
+def test_lru_cache_invalidate_increments_version():
+
+    cache = LRUResponseCache()
+    assert cache.get_version('characters') == 0
+    cache.invalidate('characters')
+    assert cache.get_version('characters') == 1
+    assert cache.get_version('planets') == 0
+
+
+def test_redis_cache():
+
+    cache = RedisResponseCache(FakeRedis())
+    response = CachedResponse(200, [('Content-Type', 'application/json')], b'{"a": 1}')
+
+    cache.set('foo', response, ttl=60)
+    assert cache.get('foo') == response
+    assert cache.get('bar') is None
+
+    assert cache.get_version('characters') == 0
+    cache.invalidate('characters')
+    assert cache.get_version('characters') == 1
+
+
+def _register(api, *endpoints):
+
+    resource = Resource('characters', __name__, url_prefix='/characters')
+    for endpoint in endpoints:
+        resource.add_endpoint(endpoint)
+    api.register_resource(resource)
+
+
+def test_get_list_response_cached(api_v1, client):
+
+    class CachedCharactersEndpoint(CharactersEndpoint):
+        response_cache = LRUResponseCache()
+
+    _register(api_v1, CachedCharactersEndpoint)
+
+    with patch.object(
+            CachedCharactersEndpoint, 'get_objects',
+            return_value=_get_character_objects()) as mock_get_objects:
+
+        first = client.get('/v1/characters')
+        second = client.get('/v1/characters')
+
+    assert mock_get_objects.call_count == 1
+    assert first.data == second.data
+    assert second.content_type == 'application/json'
+    assert json.loads(second.data.decode('utf-8')) == \
+        {'payload': _get_character_objects()}
+
+
+def test_response_cache_key_varies(api_v1, client):
+
+    class CachedCharactersEndpoint(CharactersEndpoint):
+        response_cache = LRUResponseCache()
+        response_cache_vary = ['Authorization']
+
+    _register(api_v1, CachedCharactersEndpoint)
+
+    with patch.object(
+            CachedCharactersEndpoint, 'get_objects', return_value=[]) as mock_get_objects:
+
+        client.get('/v1/characters?a=1&b=2')
+        client.get('/v1/characters?b=2&a=1')
+        assert mock_get_objects.call_count == 1
+
+        client.get('/v1/characters?a=2')
+        assert mock_get_objects.call_count == 2
+
+        client.get('/v1/characters?a=2', headers={'Authorization': 'token'})
+        assert mock_get_objects.call_count == 3
+
+
+def test_response_cache_invalidated_by_writes(api_v1, client):
+
+    cache = LRUResponseCache()
+
+    class CachedCharactersEndpoint(CharactersEndpoint):
+        response_cache = cache
+
+    class CachedCharacterEndpoint(CharacterEndpoint):
+        response_cache = cache
+
+        def get_object(self):
+            return {'name': 'Hans Solo'}
+
+    _register(api_v1, CachedCharactersEndpoint, CachedCharacterEndpoint)
+
+    with patch.object(
+            CachedCharactersEndpoint, 'get_objects', return_value=[]) as mock_get_objects:
+
+        client.get('/v1/characters')
+        client.post(
+            '/v1/characters',
+            data=json.dumps({'name': 'Luke'}),
+            headers={'content-type': 'application/json'}
+        )
+        client.get('/v1/characters')
+        assert mock_get_objects.call_count == 2
+
+        client.delete('/v1/characters/1')
+        client.get('/v1/characters')
+        assert mock_get_objects.call_count == 3
+
+
+def test_response_cache_with_redis_backend(api_v1, client):
+
+    class CachedCharactersEndpoint(CharactersEndpoint):
+        response_cache = RedisResponseCache(FakeRedis())
+
+    _register(api_v1, CachedCharactersEndpoint)
+
+    with patch.object(
+            CachedCharactersEndpoint, 'get_objects', return_value=[]) as mock_get_objects:
+
+        first = client.get('/v1/characters')
+        second = client.get('/v1/characters')
+
+    assert mock_get_objects.call_count == 1
+    assert first.data == second.data == b'{"payload": []}'
+
+
+def test_cached_response_honours_etags(api_v1, client):
+
+    class CachedCharactersEndpoint(CharactersEndpoint):
+        response_cache = LRUResponseCache()
+        etags = True
+
+    _register(api_v1, CachedCharactersEndpoint)
+
+    etag = client.get('/v1/characters').headers['ETag']
+    resp = client.get('/v1/characters', headers={'If-None-Match': etag})
+    assert resp.status_code == 304
+
+
+def test_response_cache_skips_credentialed_requests(api_v1, client):
+
+    class CachedCharactersEndpoint(CharactersEndpoint):
+        response_cache = LRUResponseCache()
+
+    _register(api_v1, CachedCharactersEndpoint)
+
+    with patch.object(
+            CachedCharactersEndpoint, 'get_objects', return_value=[]) as mock_get_objects:
+
+        client.get('/v1/characters', headers={'Authorization': 'luke'})
+        client.get('/v1/characters', headers={'Authorization': 'vader'})
+        assert mock_get_objects.call_count == 2
+
+        client.set_cookie('session', 'luke')
+        client.get('/v1/characters')
+        client.get('/v1/characters')
+        assert mock_get_objects.call_count == 4
+
+
+def test_response_cache_credentialed_opt_in(api_v1, client):
+
+    class CachedCharactersEndpoint(CharactersEndpoint):
+        response_cache = LRUResponseCache()
+        response_cache_credentialed = True
+
+    _register(api_v1, CachedCharactersEndpoint)
+
+    with patch.object(
+            CachedCharactersEndpoint, 'get_objects', return_value=[]) as mock_get_objects:
+
+        client.get('/v1/characters', headers={'Authorization': 'luke'})
+        client.get('/v1/characters', headers={'Authorization': 'vader'})
+        assert mock_get_objects.call_count == 1
@@ -3,7 +3,7 @@ import pytest
 from kim import Mapper, field
 
 from werkzeug.exceptions import BadRequest, UnprocessableEntity
-from mock import MagicMock
+from mock import MagicMock, patch
 
 from arrested import PutObjectMixin, PatchObjectMixin
 from arrested.contrib.kim_arrested import (
@@ -42,6 +42,14 @@ class MyMapper(Mapper):
     }
 
 
+class OwnerMapper(Mapper):
+
+    __type__ = MyObject
+
+    id = field.Integer()
+    owner = field.Nested(MyMapper, role='name_only')
+
+
 def test_kim_invalid_mapper_class():
     with pytest.raises(Exception):
         endpoint = CharactersEndpoint()
@@ -327,3 +335,114 @@ def test_kim_endpoint_get_response_handler_params_sets_many_from_request_params(
             'role': '__default__'
         }
         assert params == exp
+
+
+def test_kim_response_handler_handle_iter():
+
+    endpoint = CharactersEndpoint()
+    handler = KimResponseHandler(
+        endpoint, mapper_class=MyMapper, many=True, role='name_only'
+    )
+    objs = iter([MyObject(id=1, name='foo'), MyObject(id=2, name='bar')])
+    data = handler.process_iter(objs).data
+
+    assert not isinstance(data, list)
+    assert list(data) == [{'name': 'foo'}, {'name': 'bar'}]
+
+
+def test_kim_response_handler_compiled_serializer_matches_kim():
+
+    objs = [MyObject(id=1), MyObject(id=2)]
+    objs[0].owner = MyObject(id=3, name='foo')
+    objs[1].owner = MyObject(id=4, name='bar')
+
+    handler = KimResponseHandler(
+        CharactersEndpoint(), mapper_class=OwnerMapper, many=True)
+
+    assert handler.handle(objs) == OwnerMapper.many().serialize(objs)
+    assert handler.handle(objs) == [
+        {'id': 1, 'owner': {'name': 'foo'}},
+        {'id': 2, 'owner': {'name': 'bar'}},
+    ]
+
+
+def test_kim_response_handler_serializer_cached():
+
+    KimResponseHandler._serializers.clear()
+    serializer = KimResponseHandler.get_serializer(MyMapper, 'name_only')
+
+    assert len(serializer) == 1
+    assert KimResponseHandler.get_serializer(MyMapper, 'name_only') is serializer
+    assert KimResponseHandler.get_serializer(MyMapper, 'missing') is None
+
+
+def test_kim_endpoint_warmup_compiles_serializer(app):
+
+    class MyEndpoint(KimEndpoint):
+        mapper_class = MyMapper
+        serialize_role = 'name_only'
+
+    KimResponseHandler._serializers.clear()
+    MyEndpoint.warmup()
+
+    assert (MyMapper, 'name_only', False) in KimResponseHandler._serializers
+
+
+def test_kim_response_handler_reuses_mapper_instance():
+
+    objs = [MyObject(id=i, name='test %s' % i) for i in range(10)]
+    handler = KimResponseHandler(CharactersEndpoint(), mapper_class=MyMapper, many=True)
+
+    with patch.object(MyMapper, '__init__', side_effect=MyMapper.__init__,
+                      autospec=True) as init_mock:
+        data = handler.handle(objs)
+
+    assert init_mock.call_count == 1
+    assert data[9] == {'id': 9, 'name': 'test 9'}
+
+
+def test_kim_response_handler_custom_serialize_not_compiled():
+
+    class CustomMapper(MyMapper):
+
+        def serialize(self, role='__default__', **kwargs):
+            return {'custom': True}
+
+    handler = KimResponseHandler(CharactersEndpoint(), mapper_class=CustomMapper)
+
+    assert KimResponseHandler.get_serializer(CustomMapper) is None
+    assert handler.handle(MyObject(id=1)) == {'custom': True}
+
+
+def test_kim_response_handler_serializer_not_compiled_cached():
+
+    KimResponseHandler._serializers.clear()
+    with patch('arrested.contrib.kim_arrested._is_compilable',
+               return_value=False) as compilable_mock:
+        assert KimResponseHandler.get_serializer(MyMapper) is None
+        assert KimResponseHandler.get_serializer(MyMapper) is None
+
+    assert compilable_mock.call_count == 1
+    assert KimResponseHandler._serializers[(MyMapper, '__default__', False)] is None
+    KimResponseHandler._serializers.clear()
+
+
+def test_kim_endpoint_request_handler_params_computed_once(app):
+
+    class MyEndpoint(KimEndpoint, PutObjectMixin):
+        mapper_class = MyMapper
+
+        def get_object(self):
+
+            return MyObject(id=1, name='foo')
+
+    with app.test_request_context('/test', method="PUT"):
+        endpoint = MyEndpoint()
+        with patch.object(MyEndpoint, 'get_request_handler_params',
+                          autospec=True,
+                          side_effect=KimEndpoint.get_request_handler_params) as mock:
+            endpoint.get_request_handler()
+            params = endpoint.get_response_handler_params()
+
+    assert mock.call_count == 1
+    assert params['many'] is False
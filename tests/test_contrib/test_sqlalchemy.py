@@ -1,6 +1,19 @@
+import json
 import pytest
 
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
 from mock import patch, Mock
+from sqlalchemy import (
+    create_engine, event, Column, DateTime, ForeignKey, Integer, String
+)
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker, declarative_base, relationship
+from werkzeug.exceptions import BadRequest, HTTPException
+from werkzeug.http import generate_etag
 from flask_sqlalchemy import SQLAlchemy
 
 from arrested import Endpoint
@@ -9,7 +22,12 @@ from arrested.contrib.sql_alchemy import (
     DBMixin,
     DBListMixin,
     DBCreateMixin,
-    DBObjectMixin
+    DBObjectMixin,
+    DBBulkCreateMixin,
+    DBBulkPatchMixin,
+    DBBulkDeleteMixin,
+    CountCache,
+    count_cache
 )
 
 
@@ -19,6 +37,58 @@ class Model(object):
     name = 'foo'
 
 
+Base = declarative_base()
+
+
+class Planet(Base):
+
+    __tablename__ = 'planet'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(150))
+    discovered_at = Column(DateTime)
+
+
+class SessionMixin(object):
+    """Queries the ``model`` of the session the Endpoint is created with.
+    """
+
+    def __init__(self, session, *args, **kwargs):
+        super(SessionMixin, self).__init__(*args, **kwargs)
+        self.session = session
+
+    def get_db_session(self):
+        return self.session
+
+    def get_query(self):
+        return self.session.query(self.model)
+
+
+class PaginatedPlanetsEndpoint(SessionMixin, Endpoint, DBListMixin):
+
+    paginate = 'offset'
+    model = Planet
+
+    def get_query(self):
+        return self.session.query(Planet).order_by(Planet.name)
+
+
+class KeysetPlanetsEndpoint(PaginatedPlanetsEndpoint):
+
+    paginate = 'keyset'
+
+
+class DescendingPlanetsEndpoint(KeysetPlanetsEndpoint):
+
+    keyset_column = Planet.id
+    keyset_order = 'desc'
+
+
+class DiscoveredPlanetsEndpoint(KeysetPlanetsEndpoint):
+
+    keyset_column = Planet.discovered_at
+
+
 def test_get_db_session(app):
 
     db = SQLAlchemy(app)
@@ -172,3 +242,1089 @@ def test_db_mixins_mro(app):
 
     class ObjectApi(Endpoint, DBObjectMixin):
         pass
+
+
+def test_db_list_mixin_get_result_stream(app):
+
+    query_mock = Mock()
+    streamed = query_mock.execution_options.return_value.yield_per.return_value
+    streamed.__iter__ = Mock(return_value=iter(['foo', 'bar']))
+
+    mixin = DBListMixin()
+    mixin.stream = True
+    mixin.yield_per = 50
+
+    res = mixin.get_result(query_mock)
+
+    query_mock.execution_options.assert_called_once_with(stream_results=True)
+    query_mock.execution_options.return_value.yield_per.assert_called_once_with(50)
+    assert not query_mock.all.called
+    assert list(res) == ['foo', 'bar']
+
+
+def test_db_list_mixin_get_result_stream_default_batch_size(app):
+
+    query_mock = Mock()
+    streamed = query_mock.execution_options.return_value.yield_per.return_value
+    streamed.__iter__ = Mock(return_value=iter([]))
+
+    mixin = DBListMixin()
+    mixin.stream = True
+    mixin.stream_chunk_size = 25
+
+    mixin.get_result(query_mock)
+    query_mock.execution_options.return_value.yield_per.assert_called_once_with(25)
+
+
+@pytest.fixture
+def db_session():
+
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Planet(id=i, name='planet %s' % i, discovered_at=datetime(2017, 1, i))
+        for i in range(1, 8)
+    ])
+    session.commit()
+    session.Planet = Planet
+
+    yield session
+
+    session.close()
+
+
+@contextmanager
+def _recorded_statements(session):
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    engine = session.get_bind()
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_db_list_mixin_not_paginated_by_default(app, db_session):
+
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    endpoint.paginate = None
+    assert len(endpoint.get_objects()) == 7
+    assert endpoint.get_list_meta() is None
+
+
+def test_db_list_mixin_offset_pagination(app, db_session):
+
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    with app.test_request_context('/?limit=3&offset=3'):
+        objs = endpoint.get_objects()
+
+    assert [obj.id for obj in objs] == [4, 5, 6]
+    assert endpoint.get_list_meta() == {'limit': 3, 'offset': 3, 'next_offset': 6}
+
+
+def test_db_list_mixin_offset_pagination_last_page(app, db_session):
+
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    with app.test_request_context('/?limit=3&offset=6'):
+        objs = endpoint.get_objects()
+
+    assert [obj.id for obj in objs] == [7]
+    assert endpoint.get_list_meta()['next_offset'] is None
+
+
+def test_db_list_mixin_page_size_capped(app, db_session):
+
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    endpoint.max_page_size = 2
+    endpoint.page_size = 1
+    with app.test_request_context('/'):
+        assert len(endpoint.get_objects()) == 1
+
+    with app.test_request_context('/?limit=1000'):
+        assert len(endpoint.get_objects()) == 2
+        assert endpoint.get_list_meta()['limit'] == 2
+
+
+@pytest.mark.parametrize('query_string', [
+    '/?limit=0', '/?limit=foo', '/?offset=-1', '/?cursor=not-a-cursor'
+])
+def test_db_list_mixin_invalid_pagination_params(app, db_session, query_string):
+
+    endpoint = KeysetPlanetsEndpoint(db_session) if 'cursor' in query_string \
+        else PaginatedPlanetsEndpoint(db_session)
+    with app.test_request_context(query_string):
+        with pytest.raises(BadRequest):
+            endpoint.get_objects()
+
+
+def test_db_list_mixin_keyset_pagination(app, db_session):
+
+    endpoint = KeysetPlanetsEndpoint(db_session)
+    with app.test_request_context('/?limit=3'):
+        objs = endpoint.get_objects()
+
+    assert [obj.id for obj in objs] == [1, 2, 3]
+    cursor = endpoint.get_list_meta()['next_cursor']
+    assert endpoint.decode_cursor(cursor) == 3
+
+    seen = [obj.id for obj in objs]
+    while cursor:
+        endpoint = KeysetPlanetsEndpoint(db_session)
+        with app.test_request_context('/?limit=3&cursor=%s' % cursor):
+            seen.extend(obj.id for obj in endpoint.get_objects())
+            cursor = endpoint.get_list_meta()['next_cursor']
+
+    assert seen == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_db_list_mixin_keyset_pagination_descending(app, db_session):
+
+    endpoint = DescendingPlanetsEndpoint(db_session)
+    cursor = endpoint.encode_cursor(5)
+    with app.test_request_context('/?limit=2&cursor=%s' % cursor):
+        objs = endpoint.get_objects()
+
+    assert [obj.id for obj in objs] == [4, 3]
+
+
+def test_db_list_mixin_keyset_pagination_datetime_column(app, db_session):
+
+    endpoint = DiscoveredPlanetsEndpoint(db_session)
+    with app.test_request_context('/?limit=3'):
+        assert [obj.id for obj in endpoint.get_objects()] == [1, 2, 3]
+
+    cursor = endpoint.get_list_meta()['next_cursor']
+    assert endpoint.decode_cursor(cursor) == datetime(2017, 1, 3)
+
+    endpoint = DiscoveredPlanetsEndpoint(db_session)
+    with app.test_request_context('/?limit=3&cursor=%s' % cursor):
+        assert [obj.id for obj in endpoint.get_objects()] == [4, 5, 6]
+
+
+@pytest.mark.parametrize('value', [
+    datetime(2017, 1, 1, 12, 30), datetime(2017, 1, 1, 12, 30, 15, 250),
+    datetime(2017, 1, 1, 12, 30, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+    date(2017, 1, 1), time(12, 30), time(12, 30, 0, 5, tzinfo=timezone.utc),
+    Decimal('1.50'),
+    UUID('12345678-1234-5678-1234-567812345678'), 'planet 1', 42, None
+])
+def test_db_list_mixin_cursor_round_trip(value):
+
+    endpoint = KeysetPlanetsEndpoint(None)
+    decoded = endpoint.decode_cursor(endpoint.encode_cursor(value))
+
+    assert decoded == value
+    assert type(decoded) is type(value)
+    assert getattr(decoded, 'tzinfo', None) == getattr(value, 'tzinfo', None)
+
+
+def test_db_list_mixin_cursor_unsupported_type():
+
+    with pytest.raises(ArrestedException):
+        KeysetPlanetsEndpoint(None).encode_cursor(object())
+
+
+def test_db_list_mixin_keyset_column_projected(app, db_session):
+
+    endpoint = KeysetPlanetsEndpoint(db_session)
+    endpoint.columns = ['name']
+    endpoint.return_rows = True
+    with app.test_request_context('/?limit=3'):
+        rows = endpoint.get_objects()
+
+    assert [row.name for row in rows] == ['planet 1', 'planet 2', 'planet 3']
+    assert endpoint.decode_cursor(endpoint.get_list_meta()['next_cursor']) == 3
+
+
+def test_db_list_mixin_keyset_column_requires_model(app, db_session):
+
+    endpoint = KeysetPlanetsEndpoint(db_session)
+    endpoint.model = None
+    with app.test_request_context('/'):
+        with pytest.raises(ArrestedException):
+            endpoint.get_objects()
+
+
+def test_db_list_mixin_pagination_meta_in_response(app, db_session):
+
+    class PlanetsEndpoint(Endpoint, DBListMixin):
+
+        paginate = 'offset'
+
+        def get_query(self):
+            return db_session.query(db_session.Planet.name).order_by(
+                db_session.Planet.id
+            )
+
+        def get_result(self, query):
+            return [row.name for row in query]
+
+    with app.test_request_context('/?limit=2'):
+        resp = PlanetsEndpoint().get()
+
+    assert json.loads(resp.data.decode('utf-8')) == {
+        'payload': ['planet 1', 'planet 2'],
+        'meta': {'limit': 2, 'offset': 0, 'next_offset': 2}
+    }
+
+
+def test_db_list_mixin_exact_count(app, db_session):
+
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    endpoint.count_strategy = 'exact'
+    with app.test_request_context('/?limit=2'):
+        endpoint.get_objects()
+
+    meta = endpoint.get_list_meta()
+    assert meta['count'] == 7
+    assert meta['count_strategy'] == 'exact'
+
+
+def test_db_list_mixin_keyset_count_ignores_cursor(app, db_session):
+
+    endpoint = KeysetPlanetsEndpoint(db_session)
+    endpoint.count_strategy = 'exact'
+    with app.test_request_context('/?limit=2&cursor=%s' % endpoint.encode_cursor(5)):
+        objs = endpoint.get_objects()
+
+    assert [obj.id for obj in objs] == [6, 7]
+    assert endpoint.get_list_meta()['count'] == 7
+
+
+def test_db_list_mixin_cached_count(app, db_session):
+
+    count_cache.clear()
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    endpoint.count_strategy = 'cached'
+
+    with patch.object(type(endpoint), 'get_exact_count', return_value=7) as count:
+        with app.test_request_context('/?limit=2'):
+            endpoint.get_objects()
+        with app.test_request_context('/?limit=2&offset=2'):
+            endpoint.get_objects()
+
+        assert count.call_count == 1
+        assert endpoint.get_list_meta()['count'] == 7
+        assert endpoint.get_list_meta()['count_strategy'] == 'cached'
+
+
+def test_count_cache_expires():
+
+    cache = CountCache(max_size=2)
+    cache.set('foo', 1, ttl=60)
+    cache.set('bar', 2, ttl=-1)
+    assert cache.get('foo') == 1
+    assert cache.get('bar') is None
+
+    cache.set('baz', 3, ttl=60)
+    cache.set('qux', 4, ttl=60)
+    assert cache.get('foo') is None
+    assert cache.get('qux') == 4
+
+
+def test_db_list_mixin_estimated_count_falls_back_to_exact(app, db_session):
+
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    endpoint.count_strategy = 'estimate'
+    with app.test_request_context('/?limit=2'):
+        endpoint.get_objects()
+
+    meta = endpoint.get_list_meta()
+    assert meta['count'] == 7
+    assert meta['count_strategy'] == 'exact'
+
+
+def test_db_list_mixin_estimated_count_postgresql(app):
+
+    query = Mock()
+    connection = query.session.connection.return_value
+    connection.dialect.name = 'postgresql'
+    compiled = query.statement.compile.return_value
+    compiled.positiontup = None
+    compiled.params = {'param_1': 1}
+    connection.exec_driver_sql.return_value.scalar.return_value = [
+        {'Plan': {'Plan Rows': 4200}}
+    ]
+
+    assert DBListMixin().get_estimated_count(query) == 4200
+    sql, params = connection.exec_driver_sql.call_args[0]
+    assert sql.startswith('EXPLAIN (FORMAT JSON) ')
+    assert params == {'param_1': 1}
+
+
+def test_db_list_mixin_unknown_count_strategy(app, db_session):
+
+    endpoint = PaginatedPlanetsEndpoint(db_session)
+    endpoint.count_strategy = 'guess'
+    with app.test_request_context('/'):
+        with pytest.raises(ArrestedException):
+            endpoint.get_objects()
+
+
+def test_db_object_mixin_etag_from_version_column(app):
+
+    mixin = DBObjectMixin()
+    mixin.obj = Mock(version=3, updated_at='2017-01-01')
+    assert mixin.get_etag() is None
+    assert mixin.get_last_modified() is None
+
+    mixin.version_column = 'version'
+    mixin.last_modified_column = 'updated_at'
+    assert mixin.get_etag() == generate_etag(b'3')
+    assert mixin.get_last_modified() == '2017-01-01'
+
+
+class PlanetsBulkEndpoint(
+        SessionMixin, Endpoint, DBBulkCreateMixin, DBBulkPatchMixin, DBBulkDeleteMixin):
+
+    model = Planet
+
+
+def test_db_bulk_create_mixin_save_objects(app, db_session):
+
+    endpoint = PlanetsBulkEndpoint(db_session)
+    planets = [db_session.Planet(name='planet %s' % i) for i in range(50)]
+    with _recorded_statements(db_session) as statements:
+        endpoint.save_objects(planets)
+
+    assert statements == ['INSERT']
+    assert db_session.query(db_session.Planet).count() == 57
+
+
+def test_db_bulk_create_mixin_return_defaults(app, db_session):
+
+    endpoint = PlanetsBulkEndpoint(db_session)
+    endpoint.bulk_return_defaults = True
+    planets = [db_session.Planet(name='Hoth'), db_session.Planet(name='Dagobah')]
+    endpoint.save_objects(planets)
+
+    assert [planet.id for planet in planets] == [8, 9]
+    assert db_session.query(db_session.Planet).count() == 9
+
+
+def test_db_bulk_patch_mixin_get_objects_by_id(app, db_session):
+
+    endpoint = PlanetsBulkEndpoint(db_session)
+    objs = endpoint.get_objects_by_id([2, 5, 42, None])
+
+    assert sorted(objs) == [2, 5]
+    assert objs[5].name == 'planet 5'
+
+
+def test_db_bulk_patch_mixin_patch_objects(app, db_session):
+
+    endpoint = PlanetsBulkEndpoint(db_session)
+    objs = endpoint.get_objects_by_id([1, 2])
+    for obj in objs.values():
+        obj.name = obj.name.upper()
+
+    endpoint.patch_objects(list(objs.values()))
+    db_session.expire_all()
+
+    assert db_session.get(db_session.Planet, 1).name == 'PLANET 1'
+
+
+def test_db_bulk_delete_mixin_delete_objects(app, db_session):
+
+    endpoint = PlanetsBulkEndpoint(db_session)
+    deleted = endpoint.delete_objects([1, 3, 42])
+
+    assert sorted(deleted) == [1, 3]
+    assert [planet.id for planet in db_session.query(db_session.Planet)] == [2, 4, 5, 6, 7]
+
+
+def test_db_bulk_delete_mixin_respects_query(app, db_session):
+
+    endpoint = PlanetsBulkEndpoint(db_session)
+    endpoint.get_query = lambda: db_session.query(db_session.Planet).filter(
+        db_session.Planet.id > 5
+    )
+
+    assert sorted(endpoint.delete_objects([1, 6])) == [6]
+    assert db_session.query(db_session.Planet).count() == 6
+
+
+def test_db_bulk_mixin_normalize_id(app, db_session):
+
+    endpoint = PlanetsBulkEndpoint(db_session)
+
+    assert endpoint.normalize_id('1') == 1
+    assert endpoint.normalize_id(2) == 2
+    for obj_id in ('planet', True, None, [1], {'id': 1}):
+        with pytest.raises((ValueError, TypeError)):
+            endpoint.normalize_id(obj_id)
+
+
+def _bulk_request(app, db_session, endpoint, method, data):
+
+    app.add_url_rule(
+        '/bulk', view_func=endpoint.as_view('bulk', db_session),
+        methods=['POST', 'PATCH', 'DELETE']
+    )
+    with app.test_client() as client:
+        resp = client.open(
+            '/bulk', method=method, data=json.dumps(data),
+            headers={'content-type': 'application/json'}
+        )
+
+    return resp.status_code, json.loads(resp.data.decode('utf-8'))
+
+
+def test_db_bulk_delete_mixin_string_ids(app, db_session):
+
+    status, data = _bulk_request(
+        app, db_session, PlanetsBulkEndpoint, 'DELETE', ['1', 2, 'planet', 42]
+    )
+
+    assert status == 207
+    assert data == {'payload': [
+        {'status': 204, 'id': '1'},
+        {'status': 204, 'id': 2},
+        {'status': 422, 'id': 'planet', 'message': 'Invalid id'},
+        {'status': 404, 'id': 42},
+    ]}
+    assert db_session.query(Planet).count() == 5
+
+
+def test_db_bulk_patch_mixin_invalid_items(app, db_session):
+
+    from kim import Mapper, field
+    from arrested.contrib.kim_arrested import KimEndpoint
+
+    class BulkPlanetMapper(Mapper):
+
+        __type__ = Planet
+
+        id = field.Integer(read_only=True)
+        name = field.String()
+        discovered_at = field.DateTime(required=False)
+
+    class KimPlanetsBulkEndpoint(SessionMixin, KimEndpoint, DBBulkPatchMixin):
+
+        model = Planet
+        mapper_class = BulkPlanetMapper
+
+    status, data = _bulk_request(app, db_session, KimPlanetsBulkEndpoint, 'PATCH', [
+        {'id': '1', 'name': 'Hoth'},
+        {'id': 2, 'name': 'Dagobah', 'discovered_at': 'yesterday'},
+        {'name': 'Endor'},
+    ])
+
+    assert status == 207
+    assert data['payload'][0] == {
+        'status': 200, 'id': '1', 'data': {
+            'id': 1, 'name': 'Hoth', 'discovered_at': '2017-01-01T00:00:00'
+        }
+    }
+    assert data['payload'][1]['status'] == 422
+    assert data['payload'][1]['id'] == 2
+    assert 'discovered_at' in data['payload'][1]['errors']
+    assert data['payload'][2] == {'status': 422, 'id': None, 'message': 'Invalid id'}
+
+    db_session.expire_all()
+    assert db_session.get(Planet, 1).name == 'Hoth'
+    assert db_session.get(Planet, 2).name == 'planet 2'
+
+
+def test_db_bulk_create_mixin_invalid_items(app, db_session):
+
+    from kim import Mapper, field
+    from arrested.contrib.kim_arrested import KimEndpoint
+
+    class BulkCreatePlanetMapper(Mapper):
+
+        __type__ = Planet
+
+        id = field.Integer(read_only=True)
+        name = field.String()
+
+    class KimPlanetsBulkCreateEndpoint(SessionMixin, KimEndpoint, DBBulkCreateMixin):
+
+        model = Planet
+        mapper_class = BulkCreatePlanetMapper
+
+    status, data = _bulk_request(app, db_session, KimPlanetsBulkCreateEndpoint, 'POST', [
+        {'name': 'Luke'}, {'nope': 1}, {'name': 'Leia'}
+    ])
+
+    assert status == 207
+    assert [item['status'] for item in data['payload']] == [201, 422, 201]
+    assert data['payload'][0]['data']['name'] == 'Luke'
+    assert 'name' in data['payload'][1]['errors']
+    assert db_session.query(Planet).count() == 9
+
+
+class PlanetEndpoint(SessionMixin, Endpoint, DBObjectMixin):
+
+    model = Planet
+
+
+class FastPlanetEndpoint(PlanetEndpoint):
+
+    fast_delete = True
+    fast_patch = True
+
+
+def test_db_object_mixin_fast_delete(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    with app.test_request_context('/planets/2', method='DELETE'):
+        with patch.object(DBObjectMixin, 'get_object') as get_object_mock:
+            resp = endpoint.delete()
+
+    assert resp.status_code == 204
+    assert not get_object_mock.called
+    assert db_session.get(db_session.Planet, 2) is None
+
+
+def test_db_object_mixin_fast_delete_not_found(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 42}
+    with app.test_request_context('/planets/42', method='DELETE'):
+        with pytest.raises(HTTPException) as exc:
+            endpoint.delete()
+
+    assert exc.value.code == 404
+
+
+def test_db_object_mixin_fast_patch(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    with app.test_request_context(
+            '/planets/2', method='PATCH', data=json.dumps({'name': 'Hoth'}),
+            headers={'Content-Type': 'application/json', 'Prefer': 'return=minimal'}):
+        with patch.object(DBObjectMixin, 'get_object') as get_object_mock:
+            resp = endpoint.patch()
+
+    assert resp.status_code == 204
+    assert resp.headers['Preference-Applied'] == 'return=minimal'
+    assert not get_object_mock.called
+    db_session.expire_all()
+    assert db_session.get(db_session.Planet, 2).name == 'Hoth'
+
+
+def test_db_object_mixin_fast_patch_not_found(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 42}
+    with app.test_request_context(
+            '/planets/42', method='PATCH', data=json.dumps({'name': 'Hoth'}),
+            headers={'Content-Type': 'application/json', 'Prefer': 'return=minimal'}):
+        with pytest.raises(HTTPException) as exc:
+            endpoint.patch()
+
+    assert exc.value.code == 404
+
+
+def test_db_object_mixin_fast_patch_requires_prefer_header(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    with app.test_request_context('/planets/2', method='PATCH'):
+        with patch.object(DBObjectMixin, 'handle_fast_patch_request') as fast_mock, \
+                patch.object(DBObjectMixin, 'patch_request_response') as response_mock:
+            endpoint.patch()
+
+    assert not fast_mock.called
+    assert response_mock.called
+
+
+def test_db_object_mixin_get_patch_values_from_model(app, db_session):
+
+    endpoint = PlanetEndpoint(db_session)
+    values = endpoint.get_patch_values(db_session.Planet(name='Hoth'))
+
+    assert values == {'name': 'Hoth'}
+
+
+def test_db_object_mixin_get_patch_values_from_dict(app, db_session):
+
+    endpoint = PlanetEndpoint(db_session)
+    values = endpoint.get_patch_values({'name': 'Hoth', 'moons': []})
+
+    assert values == {'name': 'Hoth'}
+
+
+def _fast_patch_request(app, endpoint, data):
+
+    with app.test_request_context(
+            '/planets/2', method='PATCH', data=json.dumps(data),
+            headers={'Content-Type': 'application/json', 'Prefer': 'return=minimal'}):
+        return endpoint.patch()
+
+
+def test_db_object_mixin_fast_patch_unknown_fields(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    with pytest.raises(HTTPException) as exc:
+        _fast_patch_request(app, endpoint, {'name': 'Hoth', 'rings': 3})
+
+    assert exc.value.code == 422
+    assert json.loads(exc.value.response.data.decode('utf-8')) == {
+        'message': 'Invalid or incomplete data provided.',
+        'errors': {'rings': 'Unknown field.'}
+    }
+    db_session.expire_all()
+    assert db_session.get(Planet, 2).name == 'planet 2'
+
+
+def test_db_object_mixin_fast_patch_single_statement(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    with _recorded_statements(db_session) as statements:
+        resp = _fast_patch_request(app, endpoint, {'name': 'Hoth'})
+
+    assert resp.status_code == 204
+    assert statements == ['UPDATE']
+
+
+def test_db_object_mixin_fast_patch_unchanged_row(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    resp = _fast_patch_request(app, endpoint, {'name': 'planet 2'})
+
+    assert resp.status_code == 204
+
+
+def test_db_object_mixin_fast_patch_without_values(app, db_session):
+
+    endpoint = FastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    with _recorded_statements(db_session) as statements:
+        resp = _fast_patch_request(app, endpoint, {})
+
+    assert resp.status_code == 204
+    assert statements == ['SELECT']
+
+    endpoint.kwargs = {'obj_id': 42}
+    with pytest.raises(HTTPException) as exc:
+        _fast_patch_request(app, endpoint, {})
+
+    assert exc.value.code == 404
+
+
+def test_db_object_mixin_fast_patch_kim_mapper(app, db_session):
+
+    from kim import Mapper, field
+    from arrested.contrib.kim_arrested import KimEndpoint
+
+    class FastPlanetMapper(Mapper):
+
+        __type__ = Planet
+
+        id = field.Integer(read_only=True)
+        title = field.String(source='name')
+        discovered_at = field.DateTime(required=False)
+
+    class KimFastPlanetEndpoint(SessionMixin, KimEndpoint, DBObjectMixin):
+
+        model = Planet
+        mapper_class = FastPlanetMapper
+        fast_patch = True
+
+    endpoint = KimFastPlanetEndpoint(db_session)
+    endpoint.kwargs = {'obj_id': 2}
+    resp = _fast_patch_request(app, endpoint, {'id': 5, 'title': 'Hoth'})
+    assert resp.status_code == 204
+
+    db_session.expire_all()
+    assert db_session.get(Planet, 2).name == 'Hoth'
+    assert db_session.get(Planet, 2).discovered_at == datetime(2017, 1, 2)
+
+    with pytest.raises(HTTPException) as exc:
+        _fast_patch_request(app, endpoint, {'name': 'Hoth'})
+    assert exc.value.code == 422
+
+    with pytest.raises(HTTPException) as exc:
+        _fast_patch_request(app, endpoint, {'discovered_at': 'yesterday'})
+    assert exc.value.code == 422
+
+
+MoonsBase = declarative_base()
+
+
+class MoonPlanet(MoonsBase):
+
+    __tablename__ = 'planet'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(150))
+    moons = relationship('Moon', back_populates='planet')
+
+
+class Moon(MoonsBase):
+
+    __tablename__ = 'moon'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(150))
+    planet_id = Column(Integer, ForeignKey('planet.id'))
+    planet = relationship(MoonPlanet, back_populates='moons')
+
+
+class MoonPlanetsEndpoint(SessionMixin, Endpoint, DBListMixin):
+
+    model = MoonPlanet
+
+
+@pytest.fixture
+def moons_session():
+
+    engine = create_engine('sqlite://')
+    MoonsBase.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for i in range(1, 6):
+        session.add(MoonPlanet(id=i, name='planet %s' % i, moons=[
+            Moon(name='moon %s.%s' % (i, j)) for j in range(3)
+        ]))
+    session.commit()
+    session.expunge_all()
+
+    session.statements = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def count_statements(conn, cursor, statement, *args):
+        session.statements.append(statement)
+
+    yield session
+
+    session.close()
+
+
+def _serialize_moons(planets):
+
+    return [[moon.name for moon in planet.moons] for planet in planets]
+
+
+def test_db_list_mixin_lazy_loads_relationships_by_default(app, moons_session):
+
+    endpoint = MoonPlanetsEndpoint(moons_session)
+    _serialize_moons(endpoint.get_objects())
+
+    assert len(moons_session.statements) == 6
+
+
+@pytest.mark.parametrize('eager_load', [
+    ['moons'],
+    [('moons', 'joined')],
+    [('moons', 'subquery')],
+])
+def test_db_list_mixin_eager_load(app, moons_session, eager_load):
+
+    endpoint = MoonPlanetsEndpoint(moons_session)
+    endpoint.eager_load = eager_load
+    moons = _serialize_moons(endpoint.get_objects())
+
+    assert moons[0] == ['moon 1.0', 'moon 1.1', 'moon 1.2']
+    assert len(moons_session.statements) <= 2
+
+
+def test_db_list_mixin_eager_load_loader_option(app, moons_session):
+
+    from sqlalchemy.orm import selectinload
+
+    endpoint = MoonPlanetsEndpoint(moons_session)
+    endpoint.eager_load = [selectinload(MoonPlanet.moons).load_only(Moon.name)]
+    _serialize_moons(endpoint.get_objects())
+
+    assert len(moons_session.statements) == 2
+
+
+def test_db_list_mixin_eager_load_nested_path(app, moons_session):
+
+    endpoint = MoonPlanetsEndpoint(moons_session)
+    endpoint.eager_load = ['moons.planet']
+    planets = endpoint.get_objects()
+    assert [moon.planet.name for moon in planets[0].moons][0] == 'planet 1'
+
+    assert len(moons_session.statements) == 3
+
+
+def test_db_list_mixin_eager_load_invalid(app, moons_session):
+
+    endpoint = MoonPlanetsEndpoint(moons_session)
+    endpoint.eager_load = ['name']
+    with pytest.raises(ArrestedException):
+        endpoint.get_objects()
+
+    endpoint.eager_load = [('moons', 'eager')]
+    with pytest.raises(ArrestedException):
+        endpoint.get_objects()
+
+
+def test_db_object_mixin_eager_load(app, moons_session):
+
+    class MoonPlanetEndpoint(SessionMixin, Endpoint, DBObjectMixin):
+
+        model = MoonPlanet
+        eager_load = ['moons']
+
+    endpoint = MoonPlanetEndpoint(moons_session)
+    endpoint.kwargs = {'obj_id': 2}
+
+    assert len(endpoint.get_object().moons) == 3
+    assert len(moons_session.statements) == 2
+
+
+def test_db_list_mixin_eager_load_from_mapper(app, moons_session):
+
+    from kim import Mapper, field
+
+    class EagerMoonMapper(Mapper):
+        __type__ = Moon
+        name = field.String()
+        planet = field.Nested('EagerPlanetMapper', role='name_only')
+
+    class EagerPlanetMapper(Mapper):
+        __type__ = MoonPlanet
+        name = field.String()
+        satellites = field.Collection(
+            field.Nested(EagerMoonMapper), source='moons'
+        )
+
+        __roles__ = {'name_only': ['name']}
+
+    endpoint = MoonPlanetsEndpoint(moons_session)
+    endpoint.eager_load = 'auto'
+    endpoint.mapper_class = EagerPlanetMapper
+    query = moons_session.query(MoonPlanet)
+
+    assert endpoint.get_eager_load(query) == ['moons', 'moons.planet']
+
+    endpoint.serialize_role = 'name_only'
+    assert endpoint.get_eager_load(query) == []
+
+
+class MoonsEndpoint(SessionMixin, Endpoint, DBListMixin):
+
+    model = Moon
+
+    def get_query(self):
+        return self.session.query(Moon).order_by(Moon.id)
+
+
+def test_db_list_mixin_columns_load_only(app, moons_session):
+
+    endpoint = MoonsEndpoint(moons_session)
+    endpoint.columns = ['name']
+    moons = endpoint.get_objects()
+
+    assert moons[0].name == 'moon 1.0'
+    assert 'planet_id' not in moons_session.statements[0]
+    assert 'planet_id' not in moons[0].__dict__
+
+
+def test_db_list_mixin_columns_from_mapper(app, moons_session):
+
+    from kim import Mapper, field
+
+    class ProjectedMoonMapper(Mapper):
+        __type__ = Moon
+        name = field.String()
+        planet = field.Nested('ProjectedPlanetMapper')
+
+    class ProjectedPlanetMapper(Mapper):
+        __type__ = MoonPlanet
+        name = field.String()
+
+        __roles__ = {'public': ['name']}
+
+    endpoint = MoonsEndpoint(moons_session)
+    endpoint.columns = 'auto'
+    endpoint.mapper_class = ProjectedMoonMapper
+    query = moons_session.query(Moon)
+    assert endpoint.get_columns(query) == ['id', 'name', 'planet_id']
+
+    endpoint.mapper_class = ProjectedPlanetMapper
+    endpoint.serialize_role = 'public'
+    assert endpoint.get_columns(moons_session.query(MoonPlanet)) == [
+        'id', 'name'
+    ]
+
+
+def test_db_mixin_warmup(app, moons_session):
+
+    from kim import Mapper, field
+    from arrested.contrib import sql_alchemy
+
+    class WarmMoonMapper(Mapper):
+        __type__ = Moon
+        name = field.String()
+
+    class WarmPlanetMapper(Mapper):
+        __type__ = MoonPlanet
+        name = field.String()
+        moons = field.Collection(field.Nested(WarmMoonMapper))
+
+    class WarmPlanetsEndpoint(MoonPlanetsEndpoint):
+
+        eager_load = 'auto'
+        columns = 'auto'
+        mapper_class = WarmPlanetMapper
+
+    WarmPlanetsEndpoint.warmup()
+
+    key = (WarmPlanetMapper, '__default__', MoonPlanet)
+    assert sql_alchemy._eager_load_paths[key] == ['moons']
+    assert sql_alchemy._projected_columns[key] == ['id', 'name']
+    assert (None, 'get') in WarmPlanetsEndpoint._hook_chains[1]
+    assert not moons_session.statements
+
+
+def test_db_list_mixin_columns_from_mapper_unknown_source(app, moons_session):
+
+    from kim import Mapper, field
+
+    class ComputedMoonMapper(Mapper):
+        __type__ = Moon
+        name = field.String()
+        title = field.String()
+
+    endpoint = MoonsEndpoint(moons_session)
+    endpoint.columns = 'auto'
+    endpoint.mapper_class = ComputedMoonMapper
+
+    assert endpoint.get_columns(moons_session.query(Moon)) is None
+
+
+def test_db_list_mixin_return_rows(app, moons_session):
+
+    from kim import Mapper, field
+    from arrested.contrib.kim_arrested import KimResponseHandler
+
+    class RowMoonMapper(Mapper):
+        __type__ = dict
+        id = field.Integer()
+        name = field.String()
+
+    endpoint = MoonsEndpoint(moons_session)
+    endpoint.columns = ['id', 'name']
+    endpoint.return_rows = True
+    rows = endpoint.get_objects()
+
+    assert not isinstance(rows[0], Moon)
+    handler = KimResponseHandler(endpoint, mapper_class=RowMoonMapper, many=True)
+    assert handler.handle(rows)[0] == {'id': 1, 'name': 'moon 1.0'}
+
+
+def test_db_object_mixin_columns_only_applied_to_get(app, moons_session):
+
+    class MoonPlanetEndpoint(SessionMixin, Endpoint, DBObjectMixin):
+
+        model = MoonPlanet
+        columns = ['id']
+
+    endpoint = MoonPlanetEndpoint(moons_session)
+    endpoint.kwargs = {'obj_id': 2}
+    with app.test_request_context('/planets/2'):
+        assert 'name' not in endpoint.get_object().__dict__
+
+    moons_session.expunge_all()
+    with app.test_request_context('/planets/2', method='PUT'):
+        assert endpoint.get_object().__dict__['name'] == 'planet 2'
+
+
+class CommittingPlanetsEndpoint(SessionMixin, Endpoint, DBCreateMixin):
+
+    model = Planet
+
+
+@pytest.mark.parametrize('status, saved', [(201, True), (422, False)])
+def test_db_mixin_flush_commit_policy(app, db_session, status, saved):
+
+    from flask import Response
+
+    endpoint = CommittingPlanetsEndpoint(db_session)
+    endpoint.commit_policy = 'flush'
+    with app.test_request_context('/planets', method='POST'):
+        with patch.object(db_session, 'commit', wraps=db_session.commit) as commit_mock:
+            endpoint.save(db_session.Planet(id=8, name='Hoth'))
+            endpoint.save(db_session.Planet(id=9, name='Dagobah'))
+            assert not commit_mock.called
+
+            app.process_response(Response(status=status))
+            assert commit_mock.call_count == (1 if saved else 0)
+
+    assert db_session.query(db_session.Planet).count() == (9 if saved else 7)
+
+
+@pytest.mark.parametrize('error, status', [
+    (IntegrityError('INSERT', {}, Exception('UNIQUE constraint failed')), 409),
+    (OperationalError('COMMIT', {}, Exception('database is locked')), 500),
+])
+def test_db_mixin_flush_commit_policy_commit_fails(app, db_session, error, status):
+
+    from flask import Response
+
+    endpoint = CommittingPlanetsEndpoint(db_session)
+    endpoint.commit_policy = 'flush'
+    with app.test_request_context('/planets', method='POST'):
+        endpoint.save(Planet(id=8, name='Hoth'))
+        with patch.object(db_session, 'commit', side_effect=error):
+            resp = app.process_response(Response(status=201))
+
+    assert resp.status_code == status
+    assert 'message' in json.loads(resp.data.decode('utf-8'))
+    assert db_session.query(Planet).count() == 7
+
+
+@pytest.mark.parametrize('status, invalidated', [(201, True), (422, False)])
+def test_db_mixin_flush_commit_policy_invalidates_after_commit(
+        app, db_session, status, invalidated):
+
+    from flask import Response
+
+    endpoint = CommittingPlanetsEndpoint(db_session)
+    endpoint.commit_policy = 'flush'
+    endpoint.response_cache = Mock()
+    with app.test_request_context('/planets', method='POST'):
+        endpoint.save(db_session.Planet(id=8, name='Hoth'))
+        endpoint.invalidate_response_cache()
+        assert not endpoint.response_cache.invalidate.called
+
+        app.process_response(Response(status=status))
+
+    assert endpoint.response_cache.invalidate.called is invalidated
+
+
+def test_db_mixin_commit_policy_invalidates_immediately(app, db_session):
+
+    endpoint = CommittingPlanetsEndpoint(db_session)
+    endpoint.response_cache = Mock()
+    with app.test_request_context('/planets', method='POST'):
+        endpoint.save(db_session.Planet(id=8, name='Hoth'))
+        endpoint.invalidate_response_cache()
+
+    assert endpoint.response_cache.invalidate.call_count == 1
+
+
+def test_db_mixin_no_refresh_commit_policy(app, db_session):
+
+    endpoint = CommittingPlanetsEndpoint(db_session)
+    endpoint.commit_policy = 'no_refresh'
+    planet = db_session.get(db_session.Planet, 1)
+    planet.name = 'Hoth'
+    endpoint.save(planet)
+
+    assert 'name' in planet.__dict__
+    assert db_session.expire_on_commit is True
+
+
+def test_db_mixin_unknown_commit_policy(app, db_session):
+
+    endpoint = CommittingPlanetsEndpoint(db_session)
+    endpoint.commit_policy = 'never'
+    with pytest.raises(ArrestedException):
+        endpoint.save(db_session.Planet(name='Hoth'))
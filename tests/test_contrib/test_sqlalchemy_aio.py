@@ -0,0 +1,257 @@
+import json
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+
+from sqlalchemy import Column, ForeignKey, Integer, String, select  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    async_sessionmaker, create_async_engine
+)
+from sqlalchemy.orm import declarative_base, relationship  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from arrested import ArrestedAPI, Resource  # noqa: E402
+from arrested.aio import AsyncEndpoint, run_async  # noqa: E402
+from arrested.exceptions import ArrestedException  # noqa: E402
+from arrested.handlers import RequestHandler, ResponseHandler  # noqa: E402
+from arrested.contrib.sql_alchemy_aio import (  # noqa: E402
+    AsyncDBListMixin, AsyncDBObjectMixin, AsyncDBCreateMixin
+)
+
+
+Base = declarative_base()
+
+
+class Star(Base):
+
+    __tablename__ = 'star'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(150))
+    planets = relationship('Planet', back_populates='star')
+
+
+class Planet(Base):
+
+    __tablename__ = 'planet'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(150))
+    star_id = Column(Integer, ForeignKey('star.id'))
+    star = relationship(Star, back_populates='planets')
+
+
+class PlanetResponseHandler(ResponseHandler):
+
+    def handle(self, data, **kwargs):
+
+        def serialize(planet):
+            return {'id': planet.id, 'name': planet.name}
+
+        if isinstance(data, list):
+            return [serialize(planet) for planet in data]
+
+        return serialize(data)
+
+
+class PlanetRequestHandler(RequestHandler):
+
+    def handle(self, data, **kwargs):
+
+        obj = getattr(self.endpoint, '_obj', None) or Planet()
+        obj.name = data['name']
+        return obj
+
+
+@pytest.fixture
+def session_factory():
+
+    engine = create_async_engine(
+        'sqlite+aiosqlite://', poolclass=StaticPool,
+        connect_args={'check_same_thread': False}
+    )
+    factory = async_sessionmaker(engine)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with factory() as session:
+            session.add(Star(id=1, name='Sun', planets=[
+                Planet(id=i, name='planet %s' % i) for i in range(1, 4)
+            ]))
+            await session.commit()
+
+    run_async(setup())
+    yield factory
+    run_async(engine.dispose())
+
+
+@pytest.fixture
+def async_db_client(app, session_factory):
+
+    class PlanetsEndpoint(AsyncEndpoint, AsyncDBListMixin, AsyncDBCreateMixin):
+
+        name = 'list'
+        response_handler = PlanetResponseHandler
+        request_handler = PlanetRequestHandler
+
+        def get_query(self):
+            return select(Planet).order_by(Planet.id)
+
+    class PlanetEndpoint(AsyncEndpoint, AsyncDBObjectMixin):
+
+        name = 'object'
+        url = '/<int:obj_id>'
+        model = Planet
+        response_handler = PlanetResponseHandler
+        request_handler = PlanetRequestHandler
+
+        def get_query(self):
+            return select(Planet)
+
+    PlanetsEndpoint.session_factory = session_factory
+    PlanetEndpoint.session_factory = session_factory
+
+    api = ArrestedAPI(app)
+    resource = Resource('planets', __name__, url_prefix='/planets')
+    resource.add_endpoint(PlanetsEndpoint)
+    resource.add_endpoint(PlanetEndpoint)
+    api.register_resource(resource, defer=False)
+
+    return app.test_client()
+
+
+def _payload(resp):
+
+    return json.loads(resp.data.decode('utf-8'))['payload']
+
+
+def _count_planets(session_factory):
+
+    async def count():
+        async with session_factory() as session:
+            return len((await session.execute(select(Planet))).scalars().all())
+
+    return run_async(count())
+
+
+def test_async_db_list_mixin(async_db_client):
+
+    resp = async_db_client.get('/planets')
+
+    assert resp.status_code == 200
+    assert [planet['name'] for planet in _payload(resp)] == [
+        'planet 1', 'planet 2', 'planet 3'
+    ]
+
+
+def test_async_db_create_mixin(async_db_client, session_factory):
+
+    resp = async_db_client.post(
+        '/planets', data=json.dumps({'name': 'Hoth'}),
+        headers={'content-type': 'application/json'}
+    )
+
+    assert resp.status_code == 201
+    assert _payload(resp) == {'id': 4, 'name': 'Hoth'}
+    assert _count_planets(session_factory) == 4
+
+
+def test_async_db_object_mixin_get(async_db_client):
+
+    resp = async_db_client.get('/planets/2')
+
+    assert resp.status_code == 200
+    assert _payload(resp) == {'id': 2, 'name': 'planet 2'}
+
+
+def test_async_db_object_mixin_not_found(async_db_client):
+
+    assert async_db_client.get('/planets/42').status_code == 404
+
+
+def test_async_db_object_mixin_put(async_db_client):
+
+    resp = async_db_client.put(
+        '/planets/2', data=json.dumps({'name': 'Dagobah'}),
+        headers={'content-type': 'application/json'}
+    )
+
+    assert resp.status_code == 200
+    assert _payload(resp) == {'id': 2, 'name': 'Dagobah'}
+    assert _payload(async_db_client.get('/planets/2'))['name'] == 'Dagobah'
+
+
+def test_async_db_object_mixin_delete(async_db_client, session_factory):
+
+    assert async_db_client.delete('/planets/3').status_code == 204
+    assert _count_planets(session_factory) == 2
+
+
+def test_async_db_mixin_eager_load(app, session_factory):
+
+    class StarEndpoint(AsyncEndpoint, AsyncDBObjectMixin):
+
+        model = Star
+        session_factory = None
+        eager_load = ['planets']
+
+        def get_query(self):
+            return select(Star)
+
+    StarEndpoint.session_factory = session_factory
+    endpoint = StarEndpoint()
+    endpoint.kwargs = {'obj_id': 1}
+
+    async def get_planet_names():
+        star = await endpoint.get_object()
+        await endpoint.close_db_session()
+        return [planet.name for planet in star.planets]
+
+    assert run_async(get_planet_names()) == ['planet 1', 'planet 2', 'planet 3']
+
+
+def test_async_db_list_mixin_stream_closes_session_after_body(app, session_factory):
+
+    events = []
+
+    class SessionCheckingResponseHandler(PlanetResponseHandler):
+
+        def handle(self, data, **kwargs):
+            events.append('_db_session' in self.endpoint.__dict__)
+            return super(SessionCheckingResponseHandler, self).handle(data, **kwargs)
+
+    class StreamedPlanetsEndpoint(AsyncEndpoint, AsyncDBListMixin):
+
+        name = 'stream'
+        stream = True
+        response_handler = SessionCheckingResponseHandler
+
+        def get_query(self):
+            return select(Planet).order_by(Planet.id)
+
+        async def close_db_session(self):
+            events.append('closed')
+            await super(StreamedPlanetsEndpoint, self).close_db_session()
+
+    StreamedPlanetsEndpoint.session_factory = session_factory
+    api = ArrestedAPI(app)
+    resource = Resource('planets', __name__, url_prefix='/planets')
+    resource.add_endpoint(StreamedPlanetsEndpoint)
+    api.register_resource(resource, defer=False)
+
+    resp = app.test_client().get('/planets')
+    assert [planet['name'] for planet in _payload(resp)] == [
+        'planet 1', 'planet 2', 'planet 3'
+    ]
+    resp.close()
+
+    assert events == [True, True, True, 'closed']
+
+
+def test_async_db_mixin_requires_session_factory(app):
+
+    with pytest.raises(ArrestedException):
+        AsyncDBListMixin().get_db_session()
@@ -116,6 +116,42 @@ def test_get_response_handler_with_custom_handler_params():
     assert handler.params == {'mapper_class': FakeMapper}
 
 
+def test_handler_params_computed_once_per_request(app):
+
+    calls = []
+
+    class MyEndpoint(Endpoint):
+
+        def get_request_handler_params(self, **params):
+
+            calls.append('request')
+            return super(MyEndpoint, self).get_request_handler_params(**params)
+
+    endpoint = MyEndpoint()
+    endpoint.get_request_handler()
+    endpoint.get_request_handler()
+    assert endpoint.request_handler_params == {}
+    assert calls == ['request']
+
+    endpoint.reset_handler_params()
+    endpoint.get_request_handler()
+    assert calls == ['request', 'request']
+
+
+def test_dispatch_request_resets_handler_params(app):
+
+    class MyEndpoint(Endpoint):
+
+        def get(self, *args, **kwargs):
+
+            return self.get_response_handler().params
+
+    endpoint = MyEndpoint()
+    endpoint._handler_params = {'response': {'stale': True}}
+    with patch.object(Endpoint, 'make_response', side_effect=lambda resp: resp):
+        assert endpoint.dispatch_request() == {}
+
+
 def test_get_response_handler_custom_handler():
 
     class MyResponseHandler(ResponseHandler):
@@ -163,6 +199,26 @@ def test_endpoint_dispatch_request_method_not_allowed_returns_error(app):
             mock_return_error.assert_called_once_with(405)
 
 
+def test_endpoint_dispatch_request_allowed_methods_case_insensitive(app):
+
+    class MyEndpoint(Endpoint, GetListMixin):
+
+        methods = ["get", "POST"]
+
+        def get_objects(self):
+            return []
+
+    with app.test_request_context('/test', method='GET'):
+        resp = MyEndpoint().dispatch_request()
+        assert resp.status_code == 200
+
+    with patch.object(MyEndpoint, 'return_error') as mock_return_error:
+        MyEndpoint.methods = ["POST"]
+        with app.test_request_context('/test', method='GET'):
+            MyEndpoint().dispatch_request()
+            mock_return_error.assert_called_once_with(405)
+
+
 def test_get_calls_handle_get_request():
     class MyEndpoint(Endpoint):
 
@@ -404,3 +460,86 @@ def test_restrict_methods():
 
 def test_endpoint_url():
     pass
+
+
+def test_hook_chain_compiled_when_endpoint_registered(app):
+
+    api_hook = MagicMock(return_value=None)
+    my_api = ArrestedAPI(before_all_hooks=[api_hook], url_prefix='/')
+    my_api.init_app(app)
+    my_resource = Resource('test', __name__)
+
+    class MyEndpoint(Endpoint):
+
+        url = ''
+
+    my_resource.add_endpoint(MyEndpoint)
+    my_api.register_resource(my_resource)
+
+    with patch.object(MyEndpoint, 'build_hook_chain') as mock_build:
+        before, after = MyEndpoint.get_hook_chain(my_resource, 'get')
+
+    assert not mock_build.called
+    assert before == (api_hook, )
+    assert after == ()
+
+
+def test_hook_chain_reused_between_requests(app):
+
+    class MyEndpoint(Endpoint):
+        before_get_hooks = [MagicMock(return_value=None)]
+
+    chain = MyEndpoint.get_hook_chain(None, 'get')
+    assert MyEndpoint.get_hook_chain(None, 'get') is chain
+
+
+def test_hook_chain_invalidated_when_hooks_mutated(app):
+
+    first_hook = MagicMock(return_value=None)
+    second_hook = MagicMock(return_value=None)
+    my_resource = Resource('test', __name__, before_all_hooks=[first_hook])
+
+    class MyEndpoint(Endpoint):
+        before_get_hooks = []
+
+    MyEndpoint.compile_hooks(my_resource)
+
+    my_resource.before_all_hooks.append(second_hook)
+    assert MyEndpoint.get_hook_chain(my_resource, 'get')[0] == (first_hook, second_hook)
+
+    MyEndpoint.before_get_hooks.append(first_hook)
+    assert MyEndpoint.get_hook_chain(my_resource, 'get')[0] == \
+        (first_hook, second_hook, first_hook)
+
+    MyEndpoint.before_get_hooks = [second_hook]
+    assert MyEndpoint.get_hook_chain(my_resource, 'get')[0] == \
+        (first_hook, second_hook, second_hook)
+
+    my_resource.before_all_hooks = []
+    assert MyEndpoint.get_hook_chain(my_resource, 'get')[0] == (second_hook, )
+
+
+def test_hooks_assigned_on_instance_are_processed(app):
+
+    class_hook = MagicMock(return_value=None)
+    instance_hook = MagicMock(return_value=None)
+    after_hook = MagicMock(side_effect=lambda endpoint, resp: resp)
+
+    class MyEndpoint(Endpoint):
+        before_get_hooks = [class_hook]
+
+        def __init__(self, *args, **kwargs):
+            super(MyEndpoint, self).__init__(*args, **kwargs)
+            self.before_get_hooks = [instance_hook]
+            self.after_all_hooks = [after_hook]
+
+        def get(self, *args, **kwargs):
+            return 'foo'
+
+    with app.test_request_context('/', method='GET'):
+        MyEndpoint().dispatch_request()
+
+    assert not class_hook.called
+    assert instance_hook.called
+    assert after_hook.called
+    assert MyEndpoint.get_hook_chain(None, 'get')[0] == (class_hook, )
@@ -3,10 +3,11 @@ import json
 
 from mock import patch
 
-from werkzeug.exceptions import BadRequest
+from werkzeug.exceptions import BadRequest, HTTPException
 from arrested import (
     Handler, Endpoint, ResponseHandler,
     RequestHandler, JSONRequestMixin, JSONResponseMixin)
+from arrested.json_backends import get_json_backend
 
 
 def test_handler_params_set():
@@ -125,4 +126,37 @@ def test_json_response_mixin(app):
     mixin = JSONResponseMixin()
     mixin.payload_key = 'data'
     mixin.data = {'foo': 'bar'}
-    assert mixin.get_response_data() == json.dumps({"data": {"foo": "bar"}})
+    assert mixin.get_response_data() == b'{"data": {"foo": "bar"}}'
+
+
+def test_json_response_mixin_uses_endpoint_json_backend(app):
+
+    class MyEndpoint(Endpoint):
+        json_backend = 'orjson'
+
+    handler = ResponseHandler(MyEndpoint())
+    handler.process({'foo': 'bar'})
+    assert handler.get_json_backend() is get_json_backend('orjson')
+    assert json.loads(handler.get_response_data().decode('utf-8')) == \
+        {'payload': {'foo': 'bar'}}
+
+
+def test_json_request_mixin_non_json_request(app):
+
+    mixin = JSONRequestMixin()
+    mixin.endpoint = Endpoint()
+    with app.test_request_context('/test', data=b'foo=bar', method='POST'):
+        with pytest.raises(HTTPException) as exc_info:
+            mixin.get_request_data()
+
+    assert exc_info.value.code == 400
+    assert json.loads(exc_info.value.response.get_data()) == {
+        'message': 'Invalid JSON data provided'
+    }
+
+
+def test_json_request_mixin_empty_request(app):
+
+    mixin = JSONRequestMixin()
+    with app.test_request_context('/test', method='POST'):
+        assert mixin.get_request_data() == {}
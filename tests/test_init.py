@@ -0,0 +1,76 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+import arrested
+
+
+#: Third party and standard library packages that are slow to import and must not be
+#: loaded by ``import arrested``
+HEAVY_MODULES = (
+    'asyncio', 'flask', 'jinja2', 'kim', 'orjson', 'rapidjson', 'redis', 'sqlalchemy',
+    'ujson', 'werkzeug'
+)
+
+
+def _run(code):
+
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return output.decode('utf-8').strip()
+
+
+def test_import_skips_heavy_modules():
+
+    packages = _run(
+        'import sys\n'
+        'import arrested\n'
+        'print(",".join(sorted(set(m.split(".")[0] for m in sys.modules))))'
+    ).split(',')
+
+    assert 'arrested' in packages
+    assert [name for name in HEAVY_MODULES if name in packages] == []
+
+
+def test_import_is_lazy():
+
+    modules = _run(
+        'import sys\n'
+        'import arrested\n'
+        'print(",".join(sorted(m for m in sys.modules '
+        'if m.split(".")[0] in ("arrested", "flask", "werkzeug"))))'
+    )
+
+    assert modules == 'arrested'
+
+
+def test_kim_contrib_defers_kim_import():
+
+    assert _run(
+        'import sys\n'
+        'import arrested.contrib.kim_arrested\n'
+        'print("kim" in sys.modules)'
+    ) == 'False'
+
+
+def test_exports_match_submodules():
+
+    names = {}
+    for module in set(arrested._exports.values()):
+        for name in importlib.import_module('arrested.' + module).__all__:
+            names[name] = module
+
+    assert names == arrested._exports
+
+
+def test_lazy_attributes():
+
+    from arrested.endpoint import Endpoint
+
+    assert arrested.Endpoint is Endpoint
+    assert 'Endpoint' in dir(arrested)
+    assert 'Endpoint' in arrested.__all__
+
+    with pytest.raises(AttributeError):
+        arrested.NotAnExport
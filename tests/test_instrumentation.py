@@ -0,0 +1,195 @@
+import json
+import socket
+
+import pytest
+
+from arrested import ArrestedAPI, Resource, Endpoint, GetListMixin, GetObjectMixin
+from arrested.instrumentation import (
+    Instrumentation, InMemorySink, PrometheusSink, StatsDSink, Histogram, timed
+)
+
+from tests.endpoints import CharactersEndpoint, _get_character_objects
+
+
+class FakeTimings(object):
+
+    def __init__(self, endpoint, method, phases):
+        self.endpoint = endpoint
+        self.method = method
+        self.phases = phases
+
+
+class CharacterEndpoint(Endpoint, GetObjectMixin):
+
+    name = 'object'
+    url = '/<int:obj_id>'
+
+    def get_object(self):
+
+        objects = _get_character_objects()
+        if self.kwargs['obj_id'] < len(objects):
+            return objects[self.kwargs['obj_id']]
+
+
+def _register(app, **params):
+
+    api = ArrestedAPI(app, **params)
+    resource = Resource('characters', __name__, url_prefix='/characters')
+    resource.add_endpoint(CharactersEndpoint)
+    resource.add_endpoint(CharacterEndpoint)
+    api.register_resource(resource)
+
+    return api, app.test_client()
+
+
+def test_timed_without_instrumentation(app):
+
+    endpoint = Endpoint()
+    with timed(endpoint, 'search'):
+        pass
+
+    assert endpoint.timings is None
+
+
+def test_instrumentation_records_phases(app):
+
+    sink = InMemorySink()
+    _, client = _register(app, instrumentation=Instrumentation([sink]))
+
+    resp = client.get('/characters')
+
+    assert resp.status_code == 200
+    assert 'Server-Timing' not in resp.headers
+
+    phases = [key[2] for key in sink.histograms]
+    assert [key[:2] for key in sink.histograms][0] == ('characters.list', 'get')
+    assert phases == [
+        'before_hooks', 'get_objects', 'response_handler', 'json_encode',
+        'dispatch', 'after_hooks', 'total'
+    ]
+    assert sink.get_histogram('characters.list', 'get', 'total').count == 1
+
+
+def test_instrumentation_records_request_phases(app):
+
+    sink = InMemorySink()
+    _, client = _register(app, instrumentation=Instrumentation([sink]))
+
+    client.post(
+        '/characters', data=json.dumps({'name': 'Yoda'}),
+        headers={'content-type': 'application/json'}
+    )
+
+    assert sink.get_histogram('characters.list', 'post', 'json_decode').count == 1
+    assert sink.get_histogram('characters.list', 'post', 'request_handler').count == 1
+
+
+def test_instrumentation_server_timing_header(app):
+
+    _, client = _register(app, instrumentation=Instrumentation(server_timing=True))
+
+    resp = client.get('/characters/1')
+
+    metrics = [metric.split(';')[0] for metric in
+               resp.headers['Server-Timing'].split(', ')]
+    assert metrics[0] == 'before_hooks'
+    assert 'get_object' in metrics
+    assert metrics[-1] == 'total'
+
+
+def test_instrumentation_records_errors(app):
+
+    sink = InMemorySink()
+    _, client = _register(app, instrumentation=Instrumentation([sink]))
+
+    assert client.get('/characters/100').status_code == 404
+    assert sink.get_histogram('characters.object', 'get', 'total').count == 1
+
+
+def test_endpoint_instrumentation_overrides_api(app):
+
+    api_sink = InMemorySink()
+    endpoint_sink = InMemorySink()
+
+    class TimedEndpoint(Endpoint, GetListMixin):
+
+        instrumentation = Instrumentation([endpoint_sink])
+
+        def get_objects(self):
+
+            with timed(self, 'search'):
+                return []
+
+    api = ArrestedAPI(app, instrumentation=Instrumentation([api_sink]))
+    resource = Resource('timed', __name__, url_prefix='/timed')
+    resource.add_endpoint(TimedEndpoint)
+    api.register_resource(resource)
+
+    app.test_client().get('/timed')
+
+    assert not api_sink.histograms
+    assert endpoint_sink.get_histogram('timed.timedendpoint', 'get', 'search').count == 1
+
+
+def test_histogram_percentile():
+
+    histogram = Histogram(buckets=(0.1, 1.0))
+    assert histogram.percentile(50) is None
+
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.count == 4
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(75) == 1.0
+    assert histogram.percentile(100) == float('inf')
+
+
+def test_in_memory_sink_snapshot():
+
+    sink = InMemorySink()
+    sink.record(FakeTimings('characters.list', 'get', {'total': 2000000}))
+    sink.record(FakeTimings('characters.list', 'get', {'total': 4000000}))
+
+    summary = sink.snapshot()[('characters.list', 'get', 'total')]
+    assert summary['count'] == 2
+    assert summary['sum'] == pytest.approx(0.006)
+    assert summary['p99'] == 0.005
+
+
+def test_prometheus_sink_render(app):
+
+    sink = PrometheusSink(buckets=(0.001, 0.01))
+    sink.record(FakeTimings('characters.list', 'get', {'total': 2000000}))
+
+    labels = 'endpoint="characters.list",method="get",phase="total"'
+    assert sink.render().splitlines() == [
+        '# HELP arrested_request_phase_seconds '
+        'Time spent in each phase of handling a request.',
+        '# TYPE arrested_request_phase_seconds histogram',
+        'arrested_request_phase_seconds_bucket{%s,le="0.001"} 0' % labels,
+        'arrested_request_phase_seconds_bucket{%s,le="0.01"} 1' % labels,
+        'arrested_request_phase_seconds_bucket{%s,le="+Inf"} 1' % labels,
+        'arrested_request_phase_seconds_sum{%s} 0.002' % labels,
+        'arrested_request_phase_seconds_count{%s} 1' % labels,
+    ]
+
+    app.add_url_rule('/metrics', view_func=sink.view)
+    resp = app.test_client().get('/metrics')
+    assert resp.mimetype == 'text/plain'
+    assert b'arrested_request_phase_seconds_count' in resp.data
+
+
+def test_statsd_sink_sends_packet():
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(1)
+
+    sink = StatsDSink('127.0.0.1', server.getsockname()[1], prefix='starwars')
+    sink.record(FakeTimings('characters.list', 'get', {'dispatch': 1500000}))
+
+    try:
+        assert server.recv(1024) == b'starwars.characters.list.get.dispatch:1.500|ms'
+    finally:
+        server.close()
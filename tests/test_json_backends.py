@@ -0,0 +1,124 @@
+import json
+import pytest
+
+from mock import patch
+
+from arrested import ArrestedAPI, Resource, Endpoint, json_backends
+from arrested.exceptions import ArrestedException
+from arrested.json_backends import (
+    JSONBackend, StdlibJSONBackend, get_json_backend, register_json_backend
+)
+
+
+class UpperJSONBackend(JSONBackend):
+
+    name = 'upper'
+
+    def dumps(self, data):
+        return json.dumps(data).upper().encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data.decode('utf-8'))
+
+
+class MissingJSONBackend(JSONBackend):
+
+    name = 'missing'
+
+    def __init__(self):
+        import a_json_library_that_is_not_installed  # noqa
+
+
+@pytest.fixture(autouse=True)
+def test_backends():
+    """Register the test backends for the duration of each test only.
+    """
+    with patch.dict(json_backends._registry), patch.dict(json_backends._instances):
+        register_json_backend(UpperJSONBackend)
+        register_json_backend(MissingJSONBackend)
+        yield
+
+
+def test_stdlib_backend_is_default():
+
+    backend = get_json_backend()
+    assert isinstance(backend, StdlibJSONBackend)
+    assert backend.dumps({'foo': 'bar'}) == b'{"foo": "bar"}'
+    assert backend.loads(b'{"foo": "bar"}') == {'foo': 'bar'}
+
+
+def test_backend_instances_are_reused():
+
+    assert get_json_backend('upper') is get_json_backend('upper')
+
+
+def test_backend_instance_passed_through():
+
+    backend = UpperJSONBackend()
+    assert get_json_backend(backend) is backend
+
+
+def test_missing_library_falls_back_to_stdlib():
+
+    assert isinstance(get_json_backend('missing'), StdlibJSONBackend)
+
+
+def test_unknown_backend_raises():
+
+    with pytest.raises(ArrestedException):
+        get_json_backend('not-a-backend')
+
+
+def test_auto_backend_returns_installed_backend():
+
+    backend = get_json_backend('auto')
+    assert backend.loads(backend.dumps({'foo': [1, 2]})) == {'foo': [1, 2]}
+
+
+@pytest.mark.parametrize('name', ['orjson', 'ujson', 'rapidjson'])
+def test_fast_backends_round_trip(name):
+
+    pytest.importorskip(name)
+    backend = get_json_backend(name)
+    assert backend.name == name
+    data = backend.dumps({'foo': 'bar', 'baz': [1, None, True]})
+    assert isinstance(data, bytes)
+    assert backend.loads(data) == {'foo': 'bar', 'baz': [1, None, True]}
+
+
+def test_endpoint_json_backend_precedence(app):
+
+    api = ArrestedAPI(app, json_backend='upper')
+    resource = Resource('test', __name__, api=api)
+
+    class MyEndpoint(Endpoint):
+        pass
+
+    endpoint = MyEndpoint(resource=resource)
+    assert isinstance(endpoint.get_json_backend(), UpperJSONBackend)
+
+    resource.json_backend = 'json'
+    assert isinstance(endpoint.get_json_backend(), StdlibJSONBackend)
+
+    MyEndpoint.json_backend = 'upper'
+    assert isinstance(endpoint.get_json_backend(), UpperJSONBackend)
+
+
+def test_endpoint_dispatch_uses_json_backend(api_v1, client):
+
+    class MyEndpoint(Endpoint):
+
+        url = '/test'
+        json_backend = 'upper'
+
+        def get(self, *args, **kwargs):
+            self.return_error(400, payload={'error': 'bad'})
+
+    resource = Resource('test', __name__)
+    resource.add_endpoint(MyEndpoint)
+    api_v1.register_resource(resource)
+
+    resp = client.get('/v1/test')
+    assert resp.status_code == 400
+    assert resp.data == b'{"ERROR": "BAD"}'
+
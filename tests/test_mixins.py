@@ -1,10 +1,13 @@
+import datetime
 import json
 import pytest
 
 from werkzeug.exceptions import NotFound
+from werkzeug.http import generate_etag
 from arrested import (
     Endpoint, GetListMixin, GetObjectMixin,
-    ResponseHandler, RequestHandler, ObjectMixin
+    ResponseHandler, RequestHandler, ObjectMixin,
+    BulkCreateMixin, BulkPatchMixin, BulkDeleteMixin
 )
 
 from mock import patch
@@ -85,6 +88,148 @@ def test_get_list_mixin_list_response(app):
         assert resp.data == b'{"payload": [{"foo": "bar"}]}'
 
 
+def test_get_list_mixin_stream_response(app):
+    """assert the list_response method streams the objects when stream is enabled.
+    """
+
+    class StreamingEndpoint(GetListEndpoint):
+
+        stream = True
+        stream_chunk_size = 2
+
+    processed = []
+
+    def get_objects():
+        for i in range(5):
+            processed.append(i)
+            yield {'id': i}
+
+    endpoint = StreamingEndpoint()
+    with patch.object(StreamingEndpoint, 'get_objects', side_effect=get_objects):
+
+        resp = endpoint.get()
+        assert resp.is_streamed
+        assert resp.status_code == 200
+        assert processed == []
+
+        chunks = list(resp.response)
+        assert len(chunks) == 4
+        assert b''.join(chunks) == json.dumps(
+            {'payload': [{'id': i} for i in range(5)]}
+        ).encode('utf-8')
+
+
+@pytest.mark.parametrize('objects, expected', [
+    (None, b'{"payload": null}'),
+    ([], b'{"payload": []}'),
+])
+def test_get_list_mixin_stream_response_no_objects(app, objects, expected):
+
+    class StreamingEndpoint(GetListEndpoint):
+
+        stream = True
+
+    with patch.object(StreamingEndpoint, 'get_objects', return_value=objects):
+        resp = StreamingEndpoint().get()
+        assert resp.get_data() == expected
+
+
+def test_get_list_mixin_etag(app):
+    """assert an ETag generated from the response body is added when etags are enabled
+    """
+
+    class ETagEndpoint(GetListEndpoint):
+
+        etags = True
+
+    with app.test_request_context('/characters', method='GET'):
+        resp = ETagEndpoint().get()
+
+    etag, weak = resp.get_etag()
+    assert resp.status_code == 200
+    assert etag == generate_etag(resp.data)
+    assert not weak
+
+    headers = {'If-None-Match': '"%s"' % etag}
+    with app.test_request_context('/characters', method='GET', headers=headers):
+        resp = ETagEndpoint().get()
+
+    assert resp.status_code == 304
+    assert resp.get_etag() == (etag, False)
+
+
+def test_get_list_mixin_no_etag_by_default(app):
+
+    with app.test_request_context('/characters', method='GET'):
+        resp = GetListEndpoint().get()
+
+    assert resp.get_etag() == (None, None)
+
+
+def test_get_object_mixin_etag_short_circuits_serialization(app):
+    """assert a cheap ETag is used to answer conditional requests before the
+    response is serialized.
+    """
+
+    class ETagEndpoint(CharacterEndpoint):
+
+        etags = True
+        weak_etags = True
+
+        def get_object(self):
+            return {'foo': 'bar'}
+
+        def get_etag(self):
+            return 'v2'
+
+    with app.test_request_context('/characters/1', method='GET'):
+        resp = ETagEndpoint().get()
+
+    assert resp.status_code == 200
+    assert resp.get_etag() == ('v2', True)
+
+    headers = {'If-None-Match': 'W/"v2"'}
+    with app.test_request_context('/characters/1', method='GET', headers=headers):
+        with patch.object(ETagEndpoint, 'get_response_handler') as mock_handler:
+            resp = ETagEndpoint().get()
+
+    assert not mock_handler.called
+    assert resp.status_code == 304
+    assert resp.get_etag() == ('v2', True)
+
+    headers = {'If-None-Match': 'W/"v1"'}
+    with app.test_request_context('/characters/1', method='GET', headers=headers):
+        resp = ETagEndpoint().get()
+
+    assert resp.status_code == 200
+
+
+def test_get_object_mixin_if_modified_since(app):
+
+    class ModifiedEndpoint(CharacterEndpoint):
+
+        etags = True
+
+        def get_object(self):
+            return {'foo': 'bar'}
+
+        def get_last_modified(self):
+            return datetime.datetime(2017, 1, 1, 12, 0, 0)
+
+    headers = {'If-Modified-Since': 'Sun, 01 Jan 2017 12:00:00 GMT'}
+    with app.test_request_context('/characters/1', method='GET', headers=headers):
+        resp = ModifiedEndpoint().get()
+
+    assert resp.status_code == 304
+
+    headers = {'If-Modified-Since': 'Sat, 31 Dec 2016 12:00:00 GMT'}
+    with app.test_request_context('/characters/1', method='GET', headers=headers):
+        resp = ModifiedEndpoint().get()
+
+    assert resp.status_code == 200
+    assert resp.last_modified is not None
+
+
 def test_get_object_mixin_handle_get_request_none_not_allowed(app):
     """assert the GetObjectMixin handles raises a 404 when get_object returns none and
     allow none is false.
@@ -271,6 +416,49 @@ def test_object_mixin_obj_property_sets_obj():
         assert endpoint._obj == {'foo': 'bar'}
 
 
+@pytest.mark.parametrize('value', [None, {}, []])
+def test_object_mixin_obj_property_caches_falsy_obj(app, value):
+
+    class MyEndpoint(Endpoint, ObjectMixin):
+        allow_none = True
+
+    with patch.object(MyEndpoint, 'get_object', return_value=value) as mocked:
+        endpoint = MyEndpoint()
+        assert endpoint.obj == value
+        assert endpoint.obj == value
+        mocked.assert_called_once()
+        assert endpoint.object_lookups == 1
+
+
+def test_PUT_request_looks_up_object_once(app):
+
+    class MyEndpoint(CharacterEndpoint):
+        allow_none = True
+
+        def get_object(self):
+            return {}
+
+    endpoint = MyEndpoint()
+    with app.test_request_context('/characters/1', method='PUT'):
+        endpoint.put()
+
+    assert endpoint.object_lookups == 1
+
+
+def test_object_mixin_reset_object():
+
+    class MyEndpoint(Endpoint, ObjectMixin):
+        pass
+
+    with patch.object(MyEndpoint, 'get_object', return_value={'foo': 'bar'}) as mocked:
+        endpoint = MyEndpoint()
+        endpoint.obj
+        endpoint.reset_object()
+        endpoint.obj
+        assert mocked.call_count == 2
+        assert endpoint.object_lookups == 2
+
+
 @PUT
 def test_PUT_calls_handle_put_request(app):
 
@@ -420,3 +608,154 @@ def test_handle_DELETE_request_response(app):
     resp = endpoint.delete()
     assert resp.status_code == 204
     assert resp.data == b''
+
+
+class BulkCharactersEndpoint(Endpoint, BulkCreateMixin, BulkPatchMixin, BulkDeleteMixin):
+
+    name = 'bulk'
+    url = '/bulk'
+    characters = {1: {'id': 1, 'name': 'Obe Wan'}, 2: {'id': 2, 'name': 'Yoda'}}
+
+    def get_objects_by_id(self, ids):
+        return dict((i, dict(self.characters[i])) for i in ids if i in self.characters)
+
+    def delete_objects(self, ids):
+        return [i for i in ids if i in self.characters]
+
+
+def _bulk_request(app, method, data):
+
+    app.add_url_rule(
+        '/bulk', view_func=BulkCharactersEndpoint.as_view('bulk'),
+        methods=['POST', 'PATCH', 'DELETE']
+    )
+    with app.test_client() as client:
+        return client.open(
+            '/bulk', method=method, data=json.dumps(data),
+            headers={'content-type': 'application/json'}
+        )
+
+
+def test_bulk_create_mixin_response(app):
+
+    with patch.object(BulkCharactersEndpoint, 'save_objects') as save_mock:
+        resp = _bulk_request(app, 'POST', [{'name': 'Luke'}, {'name': 'Leia'}])
+
+    save_mock.assert_called_once_with([{'name': 'Luke'}, {'name': 'Leia'}])
+    assert resp.status_code == 201
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': [
+        {'status': 201, 'data': {'name': 'Luke'}},
+        {'status': 201, 'data': {'name': 'Leia'}},
+    ]}
+
+
+def test_bulk_create_mixin_invalid_items(app):
+
+    class ValidatingRequestHandler(RequestHandler):
+
+        def handle(self, data, **kwargs):
+            if not data.get('name'):
+                self.endpoint.return_error(422, payload={'message': 'Name required'})
+            return data
+
+    with patch.object(BulkCharactersEndpoint, 'request_handler', ValidatingRequestHandler), \
+            patch.object(BulkCharactersEndpoint, 'save_objects') as save_mock:
+        resp = _bulk_request(app, 'POST', [{'name': 'Luke'}, {'nope': 1}, {'name': 'Leia'}])
+
+    save_mock.assert_called_once_with([{'name': 'Luke'}, {'name': 'Leia'}])
+    assert resp.status_code == 207
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': [
+        {'status': 201, 'data': {'name': 'Luke'}},
+        {'status': 422, 'message': 'Name required'},
+        {'status': 201, 'data': {'name': 'Leia'}},
+    ]}
+
+
+def test_bulk_mixin_requires_list(app):
+
+    resp = _bulk_request(app, 'POST', {'name': 'Luke'})
+
+    assert resp.status_code == 422
+    assert json.loads(resp.data.decode('utf-8')) == {
+        'message': 'Bulk requests require a list of objects'
+    }
+
+
+def test_bulk_patch_mixin_requires_objects(app):
+
+    resp = _bulk_request(app, 'PATCH', [{'id': 1}, 2])
+
+    assert resp.status_code == 422
+    assert json.loads(resp.data.decode('utf-8')) == {
+        'message': 'Bulk requests require a list of objects'
+    }
+
+
+def test_bulk_delete_mixin_requires_ids(app):
+
+    resp = _bulk_request(app, 'DELETE', [1, {'id': 2}])
+
+    assert resp.status_code == 422
+    assert json.loads(resp.data.decode('utf-8')) == {
+        'message': 'Bulk requests require a list of ids'
+    }
+
+
+def test_bulk_patch_mixin_partial_failure(app):
+
+    with patch.object(BulkCharactersEndpoint, 'patch_objects') as patch_mock:
+        resp = _bulk_request(app, 'PATCH', [{'id': 1, 'name': 'Ben'}, {'id': 3}])
+
+    patch_mock.assert_called_once_with([{'id': 1, 'name': 'Ben'}])
+    assert resp.status_code == 207
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': [
+        {'status': 200, 'id': 1, 'data': {'id': 1, 'name': 'Ben'}},
+        {'status': 404, 'id': 3},
+    ]}
+
+
+def test_bulk_patch_mixin_invalid_items(app):
+
+    class ValidatingRequestHandler(RequestHandler):
+
+        def handle(self, data, **kwargs):
+            if not data.get('name'):
+                self.endpoint.return_error(422, payload={'message': 'Name required'})
+            return data
+
+    with patch.object(BulkCharactersEndpoint, 'request_handler', ValidatingRequestHandler), \
+            patch.object(BulkCharactersEndpoint, 'patch_objects') as patch_mock:
+        resp = _bulk_request(
+            app, 'PATCH', [{'id': 1, 'name': ''}, {'name': 'Ben'}, {'id': 2, 'name': 'Yo'}]
+        )
+
+    patch_mock.assert_called_once_with([{'id': 2, 'name': 'Yo'}])
+    assert resp.status_code == 207
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': [
+        {'status': 422, 'id': 1, 'message': 'Name required'},
+        {'status': 422, 'id': None, 'message': 'Invalid id'},
+        {'status': 200, 'id': 2, 'data': {'id': 2, 'name': 'Yo'}},
+    ]}
+
+
+def test_bulk_delete_mixin_response(app):
+
+    resp = _bulk_request(app, 'DELETE', [1, 2])
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': [
+        {'status': 204, 'id': 1},
+        {'status': 204, 'id': 2},
+    ]}
+
+
+def test_bulk_delete_mixin_invalid_ids(app):
+
+    resp = _bulk_request(app, 'DELETE', [1, None, 3])
+
+    assert resp.status_code == 207
+    assert json.loads(resp.data.decode('utf-8')) == {'payload': [
+        {'status': 204, 'id': 1},
+        {'status': 422, 'id': None, 'message': 'Invalid id'},
+        {'status': 404, 'id': 3},
+    ]}
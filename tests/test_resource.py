@@ -196,3 +196,57 @@ def test_middleware_only_applied_to_resources_endpoints(app, client):
     assert log_request.call_count == 1
     client.get('/planets')
     assert log_request.call_count == 1
+
+
+def test_add_endpoint_binds_resource_to_view(app, client):
+
+    api = ArrestedAPI(app)
+    characters_resource = Resource('characters', __name__, url_prefix='/characters')
+    characters_resource.add_endpoint(CharactersEndpoint)
+    api.register_resource(characters_resource)
+
+    dispatched = []
+
+    def record_resource(endpoint):
+        dispatched.append(endpoint.resource)
+
+    characters_resource.before_all_hooks.append(record_resource)
+    app.blueprints.pop('characters')
+
+    resp = client.get('/characters')
+    assert resp.status_code == 200
+    assert dispatched == [characters_resource]
+
+
+def test_add_endpoint_with_custom_init(app, client):
+
+    class CustomInitEndpoint(CharactersEndpoint):
+
+        def __init__(self):
+            self.custom = True
+
+    class ForwardingInitEndpoint(CharactersEndpoint):
+
+        url = '/forwarding'
+        name = 'forwarding'
+
+        def __init__(self, *args, **kwargs):
+            super(ForwardingInitEndpoint, self).__init__(*args, **kwargs)
+            self.custom = True
+
+    api = ArrestedAPI(app)
+    characters_resource = Resource('characters', __name__, url_prefix='/characters')
+    characters_resource.add_endpoint(CustomInitEndpoint)
+    characters_resource.add_endpoint(ForwardingInitEndpoint)
+    api.register_resource(characters_resource)
+
+    dispatched = []
+
+    def record_resource(endpoint):
+        dispatched.append((endpoint.custom, endpoint.resource))
+
+    characters_resource.before_all_hooks.append(record_resource)
+
+    assert client.get('/characters').status_code == 200
+    assert client.get('/characters/forwarding').status_code == 200
+    assert dispatched == [(True, characters_resource), (True, characters_resource)]
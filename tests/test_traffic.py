@@ -0,0 +1,163 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from flask import request
+from werkzeug.serving import make_server
+
+from arrested import ArrestedAPI, Resource
+from arrested.traffic import TrafficRecorder, TrafficReplayer, load_traffic
+
+from tests.endpoints import CharactersEndpoint
+
+
+@pytest.fixture
+def api(app):
+
+    api = ArrestedAPI(app)
+    resource = Resource('characters', __name__, url_prefix='/characters')
+    resource.add_endpoint(CharactersEndpoint)
+    api.register_resource(resource)
+
+    return api
+
+
+def _record(app, api, path, **params):
+
+    recorder = TrafficRecorder(str(path), **params)
+    recorder.install(api)
+
+    client = app.test_client()
+    client.get('/characters?name=obe', headers={'Authorization': 'secret'})
+    client.post(
+        '/characters', data=json.dumps({'name': 'Yoda'}),
+        headers={'content-type': 'application/json'}
+    )
+    recorder.close()
+
+    return recorder
+
+
+def test_traffic_recorder(app, api, tmpdir):
+
+    path = tmpdir.join('traffic.jsonl')
+    _record(app, api, path)
+
+    get, post = load_traffic(str(path))
+
+    assert get['endpoint'] == 'characters.list'
+    assert get['method'] == 'GET'
+    assert get['path'] == '/characters'
+    assert get['query'] == 'name=obe'
+    assert get['status'] == 200
+    assert get['offset'] == 0
+    assert 'Authorization' not in dict(get['headers'])
+    assert 'body' not in get
+
+    assert post['status'] == 201
+    assert json.loads(post['body']) == {'name': 'Yoda'}
+    assert post['offset'] >= 0
+    assert post['duration'] > 0
+
+
+def test_traffic_recorder_records_error_responses(app, api, tmpdir):
+
+    def api_key_required(endpoint):
+        if 'api_key' not in request.args:
+            endpoint.return_error(401)
+
+    path = tmpdir.join('traffic.jsonl')
+    recorder = TrafficRecorder(str(path))
+    recorder.install(api)
+    api.before_all_hooks.append(api_key_required)
+
+    client = app.test_client()
+    client.get('/characters')
+    client.get('/characters?api_key=1')
+    recorder.close()
+
+    aborted, ok = load_traffic(str(path))
+    assert aborted['status'] == 401
+    assert aborted['duration'] > 0
+    assert ok['status'] == 200
+
+
+def test_traffic_recorder_gzip(app, api, tmpdir):
+
+    path = tmpdir.join('traffic.jsonl.gz')
+    _record(app, api, path)
+
+    assert len(load_traffic(str(path))) == 2
+
+
+def test_traffic_recorder_sample_rate(app, api, tmpdir):
+
+    path = tmpdir.join('traffic.jsonl')
+    _record(app, api, path, sample_rate=0)
+
+    assert not path.check()
+
+
+def test_traffic_replayer(app, api, tmpdir):
+
+    path = tmpdir.join('traffic.jsonl')
+    _record(app, api, path)
+    records = load_traffic(str(path)) * 10
+
+    report = TrafficReplayer(app=app, concurrency=4).replay(records)
+    summary = report.summary()
+
+    assert summary['characters.list']['requests'] == 20
+    assert summary['characters.list']['errors'] == 0
+    assert summary['*']['throughput'] > 0
+    assert summary['*']['p50'] <= summary['*']['p99']
+    assert report.format().splitlines()[1].startswith('characters.list')
+
+
+def test_traffic_replayer_requires_target():
+
+    with pytest.raises(ValueError):
+        TrafficReplayer()
+
+
+def test_traffic_replayer_base_url(app, api, tmpdir):
+
+    path = tmpdir.join('traffic.jsonl')
+    _record(app, api, path)
+    records = load_traffic(str(path)) * 2
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        base_url = 'http://127.0.0.1:%d/' % server.server_port
+        report = TrafficReplayer(base_url=base_url, concurrency=2).replay(records)
+    finally:
+        server.shutdown()
+        thread.join()
+
+    summary = report.summary()
+    assert sorted(status for _, status, _ in report.results) == [200, 200, 201, 201]
+    assert summary['characters.list']['requests'] == 4
+    assert summary['characters.list']['errors'] == 0
+
+
+def test_traffic_replayer_base_url_connection_errors(app, api, tmpdir):
+
+    path = tmpdir.join('traffic.jsonl')
+    _record(app, api, path)
+    records = load_traffic(str(path))
+
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    base_url = 'http://127.0.0.1:%d' % port
+    report = TrafficReplayer(base_url=base_url).replay(records)
+
+    assert [status for _, status, _ in report.results] == [None, None]
+    assert report.summary()['*']['errors'] == 2
+    assert report.format()